@@ -0,0 +1,50 @@
+"""Add composite indexes for hot filters
+
+Revision ID: 8c1f3a2d9b47
+Revises: 419257f72da0
+Create Date: 2026-10-18 10:12:03.118240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f3a2d9b47'
+down_revision: Union[str, None] = '419257f72da0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ✅ unique 제약 추가 전에 중복 신청 정리 (가장 먼저 생성된 행만 남김)
+    op.execute(
+        "DELETE s1 FROM subscriptions s1 "
+        "JOIN subscriptions s2 "
+        "ON s1.user_id = s2.user_id AND s1.activity_id = s2.activity_id AND s1.id > s2.id"
+    )
+    op.create_unique_constraint('uq_subscriptions_user_activity', 'subscriptions', ['user_id', 'activity_id'])
+    op.create_index('ix_subscriptions_activity_id_user_id', 'subscriptions', ['activity_id', 'user_id'], unique=False)
+    op.create_index('ix_subscriptions_user_id_created_at', 'subscriptions', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_notifications_user_id_created_at', 'notifications', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_notifications_provider_id_created_at', 'notifications', ['provider_id', 'created_at'], unique=False)
+    op.create_index('ix_activities_provider_id_created_at', 'activities', ['provider_id', 'created_at'], unique=False)
+    op.create_index('ix_activities_status_deadline', 'activities', ['status', 'deadline'], unique=False)
+    op.create_index('ix_payments_user_id_created_at', 'payments', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_providers_is_approved_created_at', 'providers', ['is_approved', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_providers_is_approved_created_at', table_name='providers')
+    op.drop_index('ix_payments_user_id_created_at', table_name='payments')
+    op.drop_index('ix_activities_status_deadline', table_name='activities')
+    op.drop_index('ix_activities_provider_id_created_at', table_name='activities')
+    op.drop_index('ix_notifications_provider_id_created_at', table_name='notifications')
+    op.drop_index('ix_notifications_user_id_created_at', table_name='notifications')
+    op.drop_index('ix_subscriptions_user_id_created_at', table_name='subscriptions')
+    op.drop_index('ix_subscriptions_activity_id_user_id', table_name='subscriptions')
+    op.drop_constraint('uq_subscriptions_user_activity', 'subscriptions', type_='unique')
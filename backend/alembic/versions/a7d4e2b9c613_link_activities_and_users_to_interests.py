@@ -0,0 +1,103 @@
+"""Link activities and users to interests
+
+Revision ID: a7d4e2b9c613
+Revises: f3c9a1d27b54
+Create Date: 2026-10-18 17:58:43.092615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from interests import interest_rows, split_interests, match_interest_ids
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d4e2b9c613'
+down_revision: Union[str, None] = 'f3c9a1d27b54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+interests_table = sa.table(
+    'interests',
+    sa.column('id', sa.Integer),
+    sa.column('category', sa.String),
+    sa.column('subcategory', sa.String),
+)
+
+
+# ✅ users.interests 문자열 → user_interests 행
+def backfill_user_interests(user_interests):
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(interests_table.c.id, interests_table.c.category, interests_table.c.subcategory)).all()
+
+    links = []
+    for user_id, text in bind.execute(sa.text("SELECT id, interests FROM users WHERE interests IS NOT NULL")):
+        links.extend(
+            {'user_id': user_id, 'interest_id': interest_id}
+            for interest_id in match_interest_ids(split_interests(text), rows)
+        )
+    for start in range(0, len(links), BACKFILL_BATCH_SIZE):
+        op.bulk_insert(user_interests, links[start:start + BACKFILL_BATCH_SIZE])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ✅ unique 제약 추가 전에 중복 관심사 정리 (가장 먼저 생성된 행만 남김)
+    op.execute(
+        "DELETE i1 FROM interests i1 "
+        "JOIN interests i2 "
+        "ON i1.category = i2.category AND i1.subcategory = i2.subcategory AND i1.id > i2.id"
+    )
+    op.create_unique_constraint('uq_interests_category_subcategory', 'interests', ['category', 'subcategory'])
+    op.create_index('ix_interests_subcategory', 'interests', ['subcategory'], unique=False)
+
+    # ✅ 기본 분류/세부 관심사 중 없는 것만 추가
+    bind = op.get_bind()
+    existing = set(bind.execute(sa.select(interests_table.c.category, interests_table.c.subcategory)).all())
+    missing = [row for row in interest_rows() if (row['category'], row['subcategory']) not in existing]
+    if missing:
+        op.bulk_insert(interests_table, missing)
+
+    # ✅ 활동 → 관심사 id (분류/세부 관심사 문자열이 같은 행)
+    op.add_column('activities', sa.Column('interest_id', sa.Integer(), nullable=True))
+    op.create_index('ix_activities_interest_id_created_at', 'activities', ['interest_id', 'created_at'], unique=False)
+    op.create_foreign_key('fk_activities_interest_id', 'activities', 'interests', ['interest_id'], ['id'])
+    op.execute(
+        "UPDATE activities SET interest_id = ("
+        "SELECT interests.id FROM interests "
+        "WHERE interests.category = TRIM(activities.interest_category) "
+        "AND interests.subcategory = TRIM(activities.interest_subcategory)"
+        ") WHERE interest_category IS NOT NULL AND interest_subcategory IS NOT NULL"
+    )
+    op.drop_index('ix_activities_interest_subcategory_created_at', table_name='activities')
+
+    # ✅ 사용자 → 관심사 id
+    user_interests = op.create_table(
+        'user_interests',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('interest_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['interest_id'], ['interests.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'interest_id')
+    )
+    op.create_index('ix_user_interests_interest_id_user_id', 'user_interests', ['interest_id', 'user_id'], unique=False)
+    backfill_user_interests(user_interests)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_interests_interest_id_user_id', table_name='user_interests')
+    op.drop_table('user_interests')
+    op.create_index(
+        'ix_activities_interest_subcategory_created_at', 'activities',
+        ['interest_subcategory', 'created_at'], unique=False
+    )
+    op.drop_constraint('fk_activities_interest_id', 'activities', type_='foreignkey')
+    op.drop_index('ix_activities_interest_id_created_at', table_name='activities')
+    op.drop_column('activities', 'interest_id')
+    op.drop_index('ix_interests_subcategory', table_name='interests')
+    op.drop_constraint('uq_interests_category_subcategory', 'interests', type_='unique')
@@ -0,0 +1,38 @@
+"""Add coordinates to providers and activities with geo_cell index
+
+Revision ID: b2e8f4c1d705
+Revises: a7d4e2b9c613
+Create Date: 2026-10-18 19:21:36.480127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e8f4c1d705'
+down_revision: Union[str, None] = 'a7d4e2b9c613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('providers', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('providers', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('activities', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('activities', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('activities', sa.Column('geo_cell', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_activities_geo_cell'), 'activities', ['geo_cell'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_activities_geo_cell'), table_name='activities')
+    op.drop_column('activities', 'geo_cell')
+    op.drop_column('activities', 'longitude')
+    op.drop_column('activities', 'latitude')
+    op.drop_column('providers', 'longitude')
+    op.drop_column('providers', 'latitude')
@@ -0,0 +1,45 @@
+"""Add refresh_tokens table for rotating hashed refresh tokens
+
+Revision ID: c4f1a9e3d826
+Revises: b2e8f4c1d705
+Create Date: 2026-10-18 21:05:12.318604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f1a9e3d826'
+down_revision: Union[str, None] = 'b2e8f4c1d705'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'refresh_tokens',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('family_id', sa.String(length=32), nullable=False),
+        sa.Column('subject_type', sa.String(length=20), nullable=False),
+        sa.Column('subject', sa.String(length=100), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('session_expires_at', sa.DateTime(), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('token_hash')
+    )
+    op.create_index(op.f('ix_refresh_tokens_family_id'), 'refresh_tokens', ['family_id'], unique=False)
+    op.create_index('ix_refresh_tokens_subject_type_subject', 'refresh_tokens', ['subject_type', 'subject'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_refresh_tokens_subject_type_subject', table_name='refresh_tokens')
+    op.drop_index(op.f('ix_refresh_tokens_family_id'), table_name='refresh_tokens')
+    op.drop_table('refresh_tokens')
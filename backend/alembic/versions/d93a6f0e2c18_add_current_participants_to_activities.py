@@ -0,0 +1,33 @@
+"""Add current_participants to activities
+
+Revision ID: d93a6f0e2c18
+Revises: b4e7d2c91a05
+Create Date: 2026-10-18 13:05:51.274430
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd93a6f0e2c18'
+down_revision: Union[str, None] = 'b4e7d2c91a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('activities', sa.Column('current_participants', sa.Integer(), server_default='0', nullable=False))
+    # ✅ 기존 신청 내역으로 카운터 채우기
+    op.execute(
+        "UPDATE activities SET current_participants = "
+        "(SELECT COUNT(*) FROM subscriptions WHERE subscriptions.activity_id = activities.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('activities', 'current_participants')
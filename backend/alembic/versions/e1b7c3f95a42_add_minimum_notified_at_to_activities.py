@@ -0,0 +1,33 @@
+"""Add minimum_notified_at to activities
+
+Revision ID: e1b7c3f95a42
+Revises: d8a3c5f07e19
+Create Date: 2026-10-18 23:41:07.518264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b7c3f95a42'
+down_revision: Union[str, None] = 'd8a3c5f07e19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('activities', sa.Column('minimum_notified_at', sa.DateTime(), nullable=True))
+    # ✅ 이미 최소 인원에 도달한 활동은 알림을 보낸 것으로 간주
+    op.execute(
+        "UPDATE activities SET minimum_notified_at = CURRENT_TIMESTAMP "
+        "WHERE current_participants >= min_participants"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('activities', 'minimum_notified_at')
@@ -0,0 +1,31 @@
+"""Index activities interest_subcategory for recommendations
+
+Revision ID: e5b81c4a7f20
+Revises: d93a6f0e2c18
+Create Date: 2026-10-18 15:12:09.318274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b81c4a7f20'
+down_revision: Union[str, None] = 'd93a6f0e2c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_activities_interest_subcategory_created_at', 'activities',
+        ['interest_subcategory', 'created_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activities_interest_subcategory_created_at', table_name='activities')
@@ -0,0 +1,233 @@
+"""Add regions table and region_code columns
+
+Revision ID: f3c9a1d27b54
+Revises: e5b81c4a7f20
+Create Date: 2026-10-18 16:40:27.551902
+
+"""
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9a1d27b54'
+down_revision: Union[str, None] = 'e5b81c4a7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# ✅ 이 마이그레이션 시점의 지역 목록/줄임말 사본 (regions.py 가 나중에 바뀌어도 이 마이그레이션의 결과는 그대로)
+#    (시/도, 시/도 코드, 시/군/구 목록), 시/군/구 코드 = 시/도 코드 + 목록 순번 3자리
+REGIONS = [
+    ('강원특별자치도', '51', (
+        '고성군', '동해시', '삼척시', '속초시', '양구군', '양양군', '영월군', '원주시', '인제군', '정선군', '철원군', '춘천시', '태백시',
+        '평창군', '홍천군', '화천군',
+    )),
+    ('경기도', '41', (
+        '가평군', '고양시', '과천시', '광명시', '광주시', '구리시', '군포시', '김포시', '남양주시', '동두천시', '부천시', '성남시', '수원시',
+        '시흥시', '안산시', '안성시', '안양시', '양주시', '양평군', '여주시', '연천군', '오산시', '용인시', '의왕시', '의정부시', '이천시',
+        '파주시', '평택시', '포천시', '하남시', '화성시',
+    )),
+    ('경상남도', '48', (
+        '거제시', '거창군', '고성군', '김해시', '남해군', '밀양시', '사천시', '산청군', '양산시', '의령군', '진주시', '창녕군', '창원시',
+        '통영시', '하동군', '함안군', '함양군', '합천군',
+    )),
+    ('경상북도', '47', (
+        '경산시', '경주시', '고령군', '구미시', '김천시', '문경시', '봉화군', '상주시', '성주군', '안동시', '영덕군', '영양군', '영주시',
+        '영천시', '예천군', '울릉군', '울진군', '의성군', '청도군', '청송군', '칠곡군', '포항시',
+    )),
+    ('광주광역시', '29', (
+        '광산구', '남구', '동구', '북구', '서구',
+    )),
+    ('대구광역시', '27', (
+        '남구', '달서구', '달성군', '동구', '북구', '서구', '수성구', '중구',
+    )),
+    ('대전광역시', '30', (
+        '대덕구', '동구', '서구', '유성구', '중구',
+    )),
+    ('부산광역시', '26', (
+        '강서구', '금정구', '기장군', '남구', '동구', '동래구', '부산진구', '북구', '사상구', '사하구', '서구', '수영구', '연제구', '영도구',
+        '중구', '해운대구',
+    )),
+    ('세종특별자치시', '36', (
+        '고운동', '금남면', '나성동', '다정동', '대평동', '도담동', '반곡동', '보람동', '부강면', '새롬동', '소담동', '소정면', '아름동',
+        '연기면', '연동면', '연서면', '전동면', '전의면', '조치원읍', '종촌동', '한솔동',
+    )),
+    ('울산광역시', '31', (
+        '남구', '동구', '북구', '울주군', '중구',
+    )),
+    ('인천광역시', '28', (
+        '강화군', '계양구', '남동구', '동구', '미추홀구', '부평구', '서구', '연수구', '옹진군', '중구',
+    )),
+    ('전라남도', '46', (
+        '강진군', '고흥군', '곡성군', '광양시', '구례군', '나주시', '담양군', '목포시', '무안군', '보성군', '순천시', '신안군', '여수시',
+        '영광군', '영암군', '완도군', '장성군', '장흥군', '진도군', '함평군', '해남군', '화순군',
+    )),
+    ('전북특별자치도', '52', (
+        '고창군', '군산시', '김제시', '남원시', '무주군', '부안군', '순창군', '완주군', '익산시', '임실군', '장수군', '전주시', '정읍시', '진안군',
+    )),
+    ('제주특별자치도', '50', (
+        '서귀포시', '제주시',
+    )),
+    ('충청남도', '44', (
+        '계룡시', '공주시', '금산군', '논산시', '당진시', '보령시', '부여군', '서산시', '서천군', '아산시', '예산군', '천안시', '청양군',
+        '태안군', '홍성군',
+    )),
+    ('충청북도', '43', (
+        '괴산군', '단양군', '보은군', '옥천군', '음성군', '영동군', '제천시', '증평군', '진천군', '청주시', '충주시',
+    )),
+    ('서울특별시', '11', (
+        '강남구', '강동구', '강북구', '강서구', '관악구', '광진구', '구로구', '금천구', '노원구', '도봉구', '동대문구', '동작구', '마포구',
+        '서대문구', '서초구', '성동구', '성북구', '송파구', '양천구', '영등포구', '용산구', '은평구', '종로구', '중구', '중랑구',
+    )),
+]
+
+PROVINCE_ALIASES = {
+    '강원특별자치도': ('강원도', '강원'),
+    '경기도': ('경기',),
+    '경상남도': ('경남',),
+    '경상북도': ('경북',),
+    '광주광역시': ('광주',),
+    '대구광역시': ('대구',),
+    '대전광역시': ('대전',),
+    '부산광역시': ('부산',),
+    '세종특별자치시': ('세종시', '세종'),
+    '울산광역시': ('울산',),
+    '인천광역시': ('인천',),
+    '전라남도': ('전남',),
+    '전북특별자치도': ('전라북도', '전북'),
+    '제주특별자치도': ('제주도', '제주'),
+    '충청남도': ('충남',),
+    '충청북도': ('충북',),
+    '서울특별시': ('서울시', '서울'),
+}
+
+SIDO_CODES = {province: code for province, code, _ in REGIONS}
+REGION_CODES = {
+    (province, city): f"{code}{index + 1:03d}"
+    for province, code, cities in REGIONS for index, city in enumerate(cities)
+}
+
+
+def region_rows() -> list:
+    rows = []
+    for province, code, cities in REGIONS:
+        rows.append({'code': code, 'name': province, 'full_name': province, 'parent_code': None})
+        for city in cities:
+            rows.append({
+                'code': REGION_CODES[(province, city)],
+                'name': city,
+                'full_name': f"{province} {city}",
+                'parent_code': code,
+            })
+    return rows
+
+
+# ✅ 정식 시/도 이름은 어디에 있어도, 줄임말은 맨 앞 단어일 때만
+def find_province(text: str):
+    for province, _, _ in REGIONS:
+        if province in text:
+            return province
+    tokens = text.split()
+    if not tokens:
+        return None
+    for province, aliases in PROVINCE_ALIASES.items():
+        if tokens[0] in aliases:
+            return province
+    return None
+
+
+# ✅ 지역 문자열 → 코드 (시/군/구 5자리, 시/도만 찾으면 2자리, 못 찾으면 None)
+#    시/도가 없으면 가장 긴 일치 시/군/구 이름이 한 곳에만 있을 때만 사용
+def region_code(text: str):
+    if not text:
+        return None
+    province = find_province(text)
+    matches = [
+        (p, city)
+        for p, _, cities in REGIONS if province is None or p == province
+        for city in cities if city in text
+    ]
+    if province is not None:
+        if not matches:
+            return SIDO_CODES[province]
+        return REGION_CODES[(province, max(matches, key=lambda m: len(m[1]))[1])]
+    longest = max((len(city) for _, city in matches), default=0)
+    matches = [m for m in matches if len(m[1]) == longest]
+    return REGION_CODES[matches[0]] if len(matches) == 1 else None
+
+# ✅ (테이블, 지역 문자열 컬럼)
+REGION_TEXT_COLUMNS = (
+    ('users', 'location'),
+    ('providers', 'service_area'),
+    ('activities', 'region'),
+)
+
+
+# ✅ 지역 문자열 → 코드 변환은 파이썬(위 region_code)에서, UPDATE 는 코드별로 묶어서
+def backfill_region_codes(table: str, column: str):
+    bind = op.get_bind()
+    ids_by_code = defaultdict(list)
+    for row_id, text in bind.execute(sa.text(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL")):
+        code = region_code(text)
+        if code is not None:
+            ids_by_code[code].append(row_id)
+
+    for code, ids in ids_by_code.items():
+        for start in range(0, len(ids), BACKFILL_BATCH_SIZE):
+            bind.execute(
+                sa.text(f"UPDATE {table} SET region_code = :code WHERE id IN :ids")
+                .bindparams(sa.bindparam('ids', expanding=True)),
+                {'code': code, 'ids': ids[start:start + BACKFILL_BATCH_SIZE]}
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    regions = op.create_table(
+        'regions',
+        sa.Column('code', sa.String(length=5), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('full_name', sa.String(length=100), nullable=False),
+        sa.Column('parent_code', sa.String(length=5), nullable=True),
+        sa.ForeignKeyConstraint(['parent_code'], ['regions.code']),
+        sa.PrimaryKeyConstraint('code'),
+        sa.UniqueConstraint('full_name')
+    )
+    op.create_index(op.f('ix_regions_parent_code'), 'regions', ['parent_code'], unique=False)
+    op.bulk_insert(regions, region_rows())
+
+    # ✅ 인덱스를 FK 보다 먼저 만들어 MySQL 이 FK 용 인덱스를 따로 만들지 않게 함
+    for table, _ in REGION_TEXT_COLUMNS:
+        op.add_column(table, sa.Column('region_code', sa.String(length=5), nullable=True))
+    op.create_index(op.f('ix_users_region_code'), 'users', ['region_code'], unique=False)
+    op.create_index(op.f('ix_providers_region_code'), 'providers', ['region_code'], unique=False)
+    op.create_index('ix_activities_region_code_created_at', 'activities', ['region_code', 'created_at'], unique=False)
+    for table, _ in REGION_TEXT_COLUMNS:
+        op.create_foreign_key(f'fk_{table}_region_code', table, 'regions', ['region_code'], ['code'])
+
+    # ✅ 기존 문자열로 코드 채우기 (활동 region 이 비었거나 못 찾으면 업체 service_area 코드)
+    for table, column in REGION_TEXT_COLUMNS:
+        backfill_region_codes(table, column)
+    op.execute(
+        "UPDATE activities SET region_code = "
+        "(SELECT providers.region_code FROM providers WHERE providers.id = activities.provider_id) "
+        "WHERE region_code IS NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, _ in REGION_TEXT_COLUMNS:
+        op.drop_constraint(f'fk_{table}_region_code', table, type_='foreignkey')
+    op.drop_index('ix_activities_region_code_created_at', table_name='activities')
+    op.drop_index(op.f('ix_providers_region_code'), table_name='providers')
+    op.drop_index(op.f('ix_users_region_code'), table_name='users')
+    for table, _ in REGION_TEXT_COLUMNS:
+        op.drop_column(table, 'region_code')
+    op.drop_index(op.f('ix_regions_parent_code'), table_name='regions')
+    op.drop_table('regions')
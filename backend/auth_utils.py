@@ -1,15 +1,21 @@
 import os
+import hashlib
+import secrets
+import uuid
 from datetime import datetime, timedelta
 
 from dotenv import load_dotenv
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
-from database import get_db
-from models.models import User, Provider, Admin
+from cache_backends import MemoryCacheBackend
+import password_hashing
+from database import get_db, get_async_db
+from models.models import User, Provider, Admin, RevokedToken
+from revocation import revocation_index
 
 # ✅ .env 파일 로딩
 load_dotenv()
@@ -19,8 +25,21 @@ JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY") or os.getenv("SECRET_KEY")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "120"))
 
-# ✅ 비밀번호 해시 설정
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# ✅ 리프레시 토큰: 쓸 때마다 REFRESH_TOKEN_EXPIRE_DAYS 만큼 연장(슬라이딩),
+#    로그인 후 REFRESH_TOKEN_MAX_AGE_DAYS 가 지나면 다시 로그인
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+REFRESH_TOKEN_MAX_AGE_DAYS = int(os.getenv("REFRESH_TOKEN_MAX_AGE_DAYS", "90"))
+
+# ✅ 인증 주체(사용자/업체/관리자) 캐시: 토큰 sub → 행 컬럼 값 (인스턴스별 LRU + TTL)
+#    이 인스턴스의 수정/삭제/승인은 invalidate_* 로 바로 지우고, 다른 인스턴스의 변경은 TTL 안에 반영
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+principal_cache = MemoryCacheBackend(PRINCIPAL_CACHE_MAX_ENTRIES)
+
+# ✅ jose 도 첫 토큰 처리 때 로드 (cryptography 백엔드 import 비용)
+def load_jose():
+    from jose import JWTError, jwt
+    return JWTError, jwt
 
 # ✅ 사용자용 토큰 스키마
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
@@ -31,28 +50,88 @@ oauth2_scheme_provider = OAuth2PasswordBearer(tokenUrl="/providers/login")
 # ✅ 관리자용 토큰 스키마
 oauth2_scheme_admin = OAuth2PasswordBearer(tokenUrl="/admin/login")
 
-# ✅ 비밀번호 해시 함수
+# ✅ 비밀번호 해시 함수 (bcrypt 는 password_hashing 의 전용 풀에서 실행, 풀이 가득 차면 503)
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hashing.hash_password(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hashing.verify_password(plain_password, hashed_password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hashing.verify_password_async(plain_password, hashed_password)
 
 # ✅ 토큰 발급 함수
 def create_access_token(data: dict) -> str:
+    _, jwt = load_jose()
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
 
 def create_admin_access_token(data: dict, expires_delta: timedelta = timedelta(minutes=60)) -> str:
+    _, jwt = load_jose()
     to_encode = data.copy()
     expire = datetime.utcnow() + expires_delta
-    to_encode.update({"exp": expire, "sub": data.get("sub")})
+    to_encode.update({"exp": expire, "sub": data.get("sub"), "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
 
-# ✅ 현재 사용자 인증
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+# ✅ 리프레시 토큰 원문 생성 / DB 저장용 해시
+#    원문이 256비트 난수라 bcrypt 같은 느린 해시가 필요 없음 → 재발급은 해시 인덱스 조회 한 번
+def new_refresh_token() -> str:
+    return secrets.token_urlsafe(32)
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+# ✅ 리프레시 토큰의 주체 → 로그인 때와 같은 액세스 토큰
+def issue_access_token(subject_type: str, subject: str) -> str:
+    if subject_type == "admin":
+        return create_admin_access_token({"sub": subject})
+    return create_access_token(data={"sub": subject})
+
+# ✅ 인증 주체 캐시 키/값
+def principal_key(model, subject) -> str:
+    return f"{model.__tablename__}:{subject}"
+
+def principal_snapshot(principal) -> dict:
+    return {attr.key: getattr(principal, attr.key) for attr in inspect(principal).mapper.column_attrs}
+
+# ✅ 캐시 값 → 조회한 것과 같은 상태의 인스턴스 (session.merge(load=False) 로 SELECT 없이 세션에 연결)
+def restore_principal(model, snapshot: dict):
+    principal = model(**snapshot)
+    make_transient_to_detached(principal)
+    return principal
+
+def cached_principal(db: Session, model, subject):
+    snapshot = principal_cache.get(principal_key(model, subject))
+    if snapshot is None:
+        return None
+    return db.merge(restore_principal(model, snapshot), load=False)
+
+async def cached_principal_async(db: AsyncSession, model, subject):
+    snapshot = principal_cache.get(principal_key(model, subject))
+    if snapshot is None:
+        return None
+    return await db.merge(restore_principal(model, snapshot), load=False)
+
+def cache_principal(model, subject, principal):
+    if principal is not None:
+        principal_cache.set(principal_key(model, subject), principal_snapshot(principal), PRINCIPAL_CACHE_TTL)
+    return principal
+
+# ✅ 사용자/업체/관리자 정보가 바뀌거나 삭제되면 호출
+def invalidate_user(email: str):
+    principal_cache.delete(principal_key(User, email))
+
+def invalidate_provider(provider_id: int):
+    principal_cache.delete(principal_key(Provider, provider_id))
+
+def invalidate_admin(admin_id: int):
+    principal_cache.delete(principal_key(Admin, admin_id))
+
+# ✅ 토큰 → (사용자 이메일(sub), jti)
+def decode_user_email(token: str) -> tuple:
+    JWTError, jwt = load_jose()
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
         email: str = payload.get("sub")
@@ -60,44 +139,126 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="토큰에 사용자 정보가 없습니다.")
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="유효하지 않은 토큰입니다.")
+    return email, payload.get("jti")
 
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="사용자를 찾을 수 없습니다.")
-    return user
-
-# ✅ 현재 공급자 인증
-def get_current_provider(token: str = Depends(oauth2_scheme_provider), db: Session = Depends(get_db)) -> Provider:
-    credentials_exception = HTTPException(
+def provider_credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="업체 인증 정보가 유효하지 않습니다.",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def admin_credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="관리자 인증 정보가 유효하지 않습니다.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+# ✅ 토큰 → (정수 id(sub), jti), 업체/관리자 공용
+def decode_subject_id(token: str, credentials_exception: HTTPException) -> tuple:
+    JWTError, jwt = load_jose()
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        provider_id = int(payload.get("sub"))
-    except (JWTError, ValueError):
+        return int(payload.get("sub")), payload.get("jti")
+    except (JWTError, ValueError, TypeError):
         raise credentials_exception
 
-    provider = db.query(Provider).filter(Provider.id == provider_id).first()
+# ✅ 로그아웃할 토큰 → (jti, 만료 시각), 사용자/업체/관리자 공용
+def decode_revocable_token(token: str) -> tuple:
+    JWTError, jwt = load_jose()
+    try:
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="유효하지 않은 토큰입니다.")
+    if not payload.get("jti") or not payload.get("exp"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="폐기할 수 없는 토큰입니다.")
+    return payload["jti"], datetime.utcfromtimestamp(payload["exp"])
+
+# ✅ 폐기(로그아웃)된 토큰 거절
+#    평소에는 메모리의 Bloom filter 만 확인하고, 필터가 "있음" 일 때만 revoked_tokens 를 정확히 조회
+#    (jti 가 없는 예전 토큰은 폐기 대상이 아니므로 만료될 때까지 통과)
+def ensure_not_revoked(db: Session, jti, credentials_exception: HTTPException):
+    revocation_index.ensure_fresh(db)
+    if jti and revocation_index.might_contain(jti):
+        if db.query(RevokedToken.id).filter(RevokedToken.jti == jti).first() is not None:
+            raise credentials_exception
+
+async def ensure_not_revoked_async(db: AsyncSession, jti, credentials_exception: HTTPException):
+    await revocation_index.aensure_fresh(db)
+    if jti and revocation_index.might_contain(jti):
+        result = await db.execute(select(RevokedToken.id).where(RevokedToken.jti == jti))
+        if result.first() is not None:
+            raise credentials_exception
+
+def revoked_token_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="로그아웃된 토큰입니다.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+# ✅ 현재 사용자 인증
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    email, jti = decode_user_email(token)
+    ensure_not_revoked(db, jti, revoked_token_exception())
+
+    user = cached_principal(db, User, email)
+    if user is None:
+        user = cache_principal(User, email, db.query(User).filter(User.email == email).first())
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="사용자를 찾을 수 없습니다.")
+    return user
+
+# ✅ 현재 공급자 인증
+def get_current_provider(token: str = Depends(oauth2_scheme_provider), db: Session = Depends(get_db)) -> Provider:
+    credentials_exception = provider_credentials_exception()
+    provider_id, jti = decode_subject_id(token, credentials_exception)
+    ensure_not_revoked(db, jti, credentials_exception)
+
+    provider = cached_principal(db, Provider, provider_id)
+    if provider is None:
+        provider = cache_principal(Provider, provider_id, db.query(Provider).filter(Provider.id == provider_id).first())
     if provider is None:
         raise credentials_exception
     return provider
 
 # ✅ 현재 관리자 인증
 def get_current_admin(token: str = Depends(oauth2_scheme_admin), db: Session = Depends(get_db)) -> Admin:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="관리자 인증 정보가 유효하지 않습니다.",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        admin_id = int(payload.get("sub"))
-    except (JWTError, ValueError):
-        raise credentials_exception
+    credentials_exception = admin_credentials_exception()
+    admin_id, jti = decode_subject_id(token, credentials_exception)
+    ensure_not_revoked(db, jti, credentials_exception)
 
-    admin = db.query(Admin).filter(Admin.id == admin_id).first()
+    admin = cached_principal(db, Admin, admin_id)
+    if admin is None:
+        admin = cache_principal(Admin, admin_id, db.query(Admin).filter(Admin.id == admin_id).first())
     if admin is None:
         raise credentials_exception
     return admin
+
+# ✅ 현재 사용자 인증 (async def 라우터용)
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> User:
+    email, jti = decode_user_email(token)
+    await ensure_not_revoked_async(db, jti, revoked_token_exception())
+
+    user = await cached_principal_async(db, User, email)
+    if user is None:
+        result = await db.execute(select(User).where(User.email == email))
+        user = cache_principal(User, email, result.scalars().first())
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="사용자를 찾을 수 없습니다.")
+    return user
+
+# ✅ 현재 공급자 인증 (async def 라우터용)
+async def get_current_provider_async(token: str = Depends(oauth2_scheme_provider), db: AsyncSession = Depends(get_async_db)) -> Provider:
+    credentials_exception = provider_credentials_exception()
+    provider_id, jti = decode_subject_id(token, credentials_exception)
+    await ensure_not_revoked_async(db, jti, credentials_exception)
+
+    provider = await cached_principal_async(db, Provider, provider_id)
+    if provider is None:
+        result = await db.execute(select(Provider).where(Provider.id == provider_id))
+        provider = cache_principal(Provider, provider_id, result.scalars().first())
+    if provider is None:
+        raise credentials_exception
+    return provider
@@ -0,0 +1,150 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+
+# ✅ 캐시 저장소 공통 인터페이스 (값은 JSON 직렬화 가능한 객체)
+class CacheBackend(ABC):
+    shared = True  # 다른 프로세스/Lambda 컨테이너와 값을 공유하는지
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """키에 해당하는 값 (없거나 만료되었으면 None)"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """값 저장 (ttl 초 후 만료, None 이면 만료 없음)"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """값 삭제"""
+
+
+# ✅ 프로세스 메모리 캐시 (기본값, Lambda 컨테이너가 바뀌면 사라짐)
+#    max_entries 를 넘으면 가장 오래 안 쓴 키부터 제거 (LRU)
+class MemoryCacheBackend(CacheBackend):
+    shared = False
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = {}  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries[key] = self._entries.pop(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, expires_at)
+            while len(self._entries) > self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+# ✅ SQLite 파일 캐시 (같은 파일을 보는 프로세스끼리 공유, 예: EFS 마운트 / 로컬 개발 서버)
+#    기본 경로 /tmp 는 Lambda 컨테이너마다 따로이므로 shared 는 명시적으로 켠 경우에만 True
+class SQLiteCacheBackend(CacheBackend):
+    def __init__(self, path: str, shared: bool = False):
+        self.path = path
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        encoded = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, encoded, expires_at)
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            )
+            return cursor.rowcount
+
+
+# ✅ Redis 호환 캐시 (ElastiCache 등, 모든 Lambda 인스턴스가 공유)
+#    redis 패키지는 이 백엔드를 쓸 때만 필요
+class RedisCacheBackend(CacheBackend):
+    def __init__(self, url: str, prefix: str = "senior:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("redis 캐시 백엔드를 쓰려면 `pip install redis` 가 필요합니다.")
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self._client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        self._client.set(self.prefix + key, json.dumps(value, ensure_ascii=False), ex=ttl)
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+
+# ✅ 환경 변수로 백엔드 선택
+#    CACHE_BACKEND=memory | sqlite | redis
+#    CACHE_MEMORY_MAX_ENTRIES, CACHE_SQLITE_PATH (기본 /tmp/senior-cache.sqlite3), CACHE_REDIS_URL
+#    CACHE_SQLITE_SHARED=true : CACHE_SQLITE_PATH 가 EFS 등 여러 프로세스/컨테이너가 함께 보는 경로일 때
+def create_cache_backend() -> CacheBackend:
+    kind = os.getenv("CACHE_BACKEND", "memory").lower()
+    if kind == "memory":
+        return MemoryCacheBackend(int(os.getenv("CACHE_MEMORY_MAX_ENTRIES", "1024")))
+    if kind == "sqlite":
+        return SQLiteCacheBackend(
+            os.getenv("CACHE_SQLITE_PATH", "/tmp/senior-cache.sqlite3"),
+            shared=os.getenv("CACHE_SQLITE_SHARED", "false").lower() == "true",
+        )
+    if kind == "redis":
+        url = os.getenv("CACHE_REDIS_URL")
+        if not url:
+            raise ValueError("CACHE_REDIS_URL is not set.")
+        return RedisCacheBackend(url)
+    raise ValueError(f"Unknown CACHE_BACKEND: {kind}")
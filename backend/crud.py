@@ -1,11 +1,30 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from auth_utils import get_password_hash  # ✅ 외부 모듈에서 가져오기
-from models.models import User, Provider, Activity, Payment, Subscription, Notification, CustomInterest
+from sqlalchemy import func, select, update, insert, delete, literal, or_, type_coerce, DateTime
+from sqlalchemy.types import TypeDecorator
+from auth_utils import get_password_hash, invalidate_user, invalidate_provider  # ✅ 외부 모듈에서 가져오기
+from models.models import User, Provider, Activity, Payment, Subscription, Notification, CustomInterest, Interest, UserInterest, RefreshToken, RevokedToken
+from pagination import paginate, paginate_ranked, row_select, paginate_rows, DEFAULT_PAGE_LIMIT
+from memory_index import load_numpy
+import geo
+import ranking
+import regions
+import search
+import suggest
 import schemas
-from datetime import datetime, timezone
+from interests import split_interests, match_interest_ids
+from datetime import datetime, timezone, date
 from typing import Optional, List  # ✅ 선택형 타입 사용을 위한 필수 import
 
+# ✅ 사용자 interests 문자열 → user_interests 행 (분류는 그 분류의 모든 세부 관심사)
+def user_interest_links(db: Session, interests: Optional[str]) -> List[UserInterest]:
+    tokens = split_interests(interests)
+    if not tokens:
+        return []
+    rows = db.query(Interest.id, Interest.category, Interest.subcategory).filter(
+        or_(Interest.category.in_(tokens), Interest.subcategory.in_(tokens))
+    ).all()
+    return [UserInterest(interest_id=interest_id) for interest_id in match_interest_ids(tokens, rows)]
+
 def create_user(db: Session, user: schemas.UserCreate):
     hashed_password = get_password_hash(user.password)
     db_user = User(
@@ -14,8 +33,10 @@ def create_user(db: Session, user: schemas.UserCreate):
         phone=user.phone,
         password_hash=hashed_password,
         location=user.location,
+        region_code=regions.region_code(user.location),
         interests=user.interests
     )
+    db_user.interest_links = user_interest_links(db, user.interests)
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
@@ -29,9 +50,11 @@ def create_admin(db: Session, user: schemas.UserCreate):
         phone=user.phone,
         password_hash=hashed_password,
         location=user.location,
+        region_code=regions.region_code(user.location),
         interests=user.interests,
         is_admin=True
     )
+    db_admin.interest_links = user_interest_links(db, user.interests)
     db.add(db_admin)
     db.commit()
     db.refresh(db_admin)
@@ -50,9 +73,15 @@ def update_user(db: Session, user_id: int, user_update: schemas.UserUpdate):
     db_user = db.query(User).filter(User.id == user_id).first()
     if not db_user:
         return None
-    for key, value in user_update.dict(exclude_unset=True).items():
+    updates = user_update.dict(exclude_unset=True)
+    for key, value in updates.items():
         setattr(db_user, key, value)
+    if "location" in updates:
+        db_user.region_code = regions.region_code(db_user.location)
+    if "interests" in updates:
+        db_user.interest_links = user_interest_links(db, db_user.interests)
     db.commit()
+    invalidate_user(db_user.email)
     db.refresh(db_user)
     return db_user
 
@@ -61,15 +90,42 @@ def delete_user(db: Session, user_id: int):
     if not db_user:
         return None
     db.delete(db_user)
+    revoke_subject_refresh_tokens(db, "user", db_user.email)
     db.commit()
+    invalidate_user(db_user.email)
     return db_user
 
+# ✅ 사용자/업체/관리자의 리프레시 토큰 전부 폐기 (삭제 시, 커밋은 호출한 쪽에서)
+def revoke_subject_refresh_tokens(db: Session, subject_type: str, subject: str):
+    db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.subject_type == subject_type,
+            RefreshToken.subject == str(subject),
+            RefreshToken.revoked_at.is_(None)
+        )
+        .values(revoked_at=datetime.utcnow())
+    )
+
+# ✅ 만료된 리프레시 토큰 정리 (재발급마다 행이 하나씩 늘어남, scripts/purge_expired_tokens.py)
+def purge_expired_refresh_tokens(db: Session) -> int:
+    result = db.execute(delete(RefreshToken).where(RefreshToken.expires_at < datetime.utcnow()))
+    db.commit()
+    return result.rowcount
+
+# ✅ 만료된 폐기 토큰 정리 (토큰 자체가 만료돼 더 막을 필요가 없음)
+def purge_expired_revoked_tokens(db: Session) -> int:
+    result = db.execute(delete(RevokedToken).where(RevokedToken.expires_at < datetime.utcnow()))
+    db.commit()
+    return result.rowcount
+
 def approve_provider(db: Session, provider_id: int):
     provider = db.query(Provider).filter(Provider.id == provider_id).first()
     if not provider:
         return None
     provider.is_approved = True
     db.commit()
+    invalidate_provider(provider.id)
     return provider
 
 def get_admin_stats(db: Session):
@@ -80,8 +136,14 @@ def get_admin_stats(db: Session):
         "total_payments": db.query(Payment).count()
     }
 
-def get_activities(db: Session, skip: int = 0, limit: int = 10):
-    return db.query(Activity).offset(skip).limit(limit).all()
+# ✅ 활동이 생성/수정된 뒤 메모리 인덱스(개인화 랭킹, 검색, 자동완성) 갱신
+def on_activity_changed(activity: Activity):
+    ranking.on_activity_changed(activity)
+    search.on_activity_changed(activity)
+    suggest.on_activity_changed(activity)
+
+def get_activities(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_LIMIT):
+    return paginate(db.query(Activity), Activity.created_at, Activity.id, cursor, limit)
 
 def get_activity_by_id(db: Session, activity_id: int):
     return db.query(Activity).filter(Activity.id == activity_id).first()
@@ -90,10 +152,20 @@ def update_activity(db: Session, activity_id: int, activity_update: schemas.Acti
     db_activity = db.query(Activity).filter(Activity.id == activity_id).first()
     if not db_activity:
         return None
-    for key, value in activity_update.dict(exclude_unset=True).items():
+    updates = activity_update.dict(exclude_unset=True)
+    for key, value in updates.items():
         setattr(db_activity, key, value)
+    if updates.keys() & {"region", "provider_id"}:
+        db_activity.region_code = activity_region_code(db, db_activity.region, db_activity.provider_id)
+    if updates.keys() & {"latitude", "longitude"}:
+        db_activity.geo_cell = geo.geo_cell(db_activity.latitude, db_activity.longitude)
+    if updates.keys() & {"interest_category", "interest_subcategory"}:
+        db_activity.interest_id = activity_interest_id(
+            db, db_activity.interest_category, db_activity.interest_subcategory
+        )
     db.commit()
     db.refresh(db_activity)
+    on_activity_changed(db_activity)
     return db_activity
 
 def delete_activity(db: Session, activity_id: int):
@@ -103,16 +175,20 @@ def delete_activity(db: Session, activity_id: int):
     db_activity.status = "inactive"
     db.commit()
     db.refresh(db_activity)
+    on_activity_changed(db_activity)
     return db_activity
 
 def create_provider(db: Session, provider: schemas.ProviderCreate):
-    hashed_pw = pwd_context.hash(provider.password)
+    hashed_pw = get_password_hash(provider.password)
     db_provider = Provider(
         name=provider.name,
         email=provider.email,
         phone=provider.phone,
         password_hash=hashed_pw,
         service_area=provider.service_area,
+        region_code=regions.region_code(provider.service_area),
+        latitude=provider.latitude,
+        longitude=provider.longitude,
         service_name=provider.service_name,
         is_business=provider.is_business,
         business_registration_number=provider.business_registration_number,
@@ -124,41 +200,101 @@ def create_provider(db: Session, provider: schemas.ProviderCreate):
     return db_provider
 
 
-# ✅ 최소 인원 도달 시 provider에게 알림 전송
-def notify_provider_when_minimum_reached(db: Session, activity_id: int):
-    activity = db.query(Activity).filter(Activity.id == activity_id).first()
-    if not activity or activity.status == "confirmed":
-        return
-
-    participant_count = db.query(Subscription).filter(Subscription.activity_id == activity_id).count()
-    if participant_count >= activity.min_participants:
-        provider_id = activity.provider_id
-        message = f"'{activity.title}' 활동에 최소 인원이 모집되었습니다. 확정해주세요!"
-        notification = Notification(
-            provider_id=provider_id,
-            message=message,
-            is_read=False
-        )
-        db.add(notification)
-        db.commit()
+# ✅ 신청자 수 카운터 증감 UPDATE 문 (0 아래로 내려가지 않음)
+def participant_count_update(activity_id: int, delta: int):
+    stmt = (
+        update(Activity)
+        .where(Activity.id == activity_id)
+        .values(current_participants=Activity.current_participants + delta)
+    )
+    if delta < 0:
+        stmt = stmt.where(Activity.current_participants >= -delta)
+    return stmt
+
+# ✅ 신청자 수 카운터 증감 (호출한 쪽의 트랜잭션 안에서 SQL 로 원자적으로 갱신)
+def adjust_participant_count(db: Session, activity_id: int, delta: int):
+    db.execute(participant_count_update(activity_id, delta))
+
+# ✅ 신청 가능한 활동 상태
+SUBSCRIBABLE_STATUSES = ("pending", "confirmed")
+
+# ✅ 신청 마감 여부 (취소/비활성 상태이거나 마감일이 지난 경우)
+def is_subscription_closed(activity: Activity) -> bool:
+    if activity.status not in SUBSCRIBABLE_STATUSES:
+        return True
+    return activity.deadline is not None and activity.deadline < datetime.utcnow()
+
+# ✅ 방금 증가한 카운터가 최소 인원에 처음 도달했으면 업체 알림 생성 + minimum_notified_at 기록 (아니면 None)
+#    취소로 최소 인원 아래로 내려갔다가 다시 도달해도 알림은 다시 보내지 않음
+def minimum_reached_notification(activity: Activity) -> Optional[Notification]:
+    if (
+        activity.status == "confirmed"
+        or activity.minimum_notified_at is not None
+        or activity.current_participants < activity.min_participants
+    ):
+        return None
+    activity.minimum_notified_at = datetime.utcnow()
+    return Notification(
+        provider_id=activity.provider_id,
+        message=f"'{activity.title}' 활동이 최소 인원에 도달했습니다. 확정해주세요!",
+        is_read=False
+    )
 
-# ✅ 구독 생성 + 최소 인원 도달 시 알림 전송
+# ✅ 구독 생성 + 최소 인원 도달 시 알림 전송 (한 트랜잭션, 커밋 1회)
+#    활동 행을 FOR UPDATE 로 잠가 동시 신청이 순서대로 카운터를 올리고,
+#    카운터가 최소 인원에 처음 "도달하는" 신청 한 건만 업체 알림을 만든다.
+#    중복 신청은 uq_subscriptions_user_activity 에 걸려 IntegrityError 로 올라간다.
 def create_subscription(db: Session, user_id: int, activity_id: int):
+    activity = db.query(Activity).filter(Activity.id == activity_id).with_for_update().first()
+    if not activity:
+        db.rollback()
+        return None
+
+    if is_subscription_closed(activity):
+        db.rollback()
+        return "closed"
+
     new_subscription = Subscription(
         user_id=user_id,
         activity_id=activity_id,
         status="pending"
     )
     db.add(new_subscription)
+    db.flush()
+
+    activity.current_participants += 1
+
+    notification = minimum_reached_notification(activity)
+    if notification is not None:
+        db.add(notification)
+
     db.commit()
     db.refresh(new_subscription)
+    return new_subscription
 
-    notify_provider_when_minimum_reached(db, activity_id=activity_id)
+def get_user_subscriptions(db: Session, user_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_LIMIT):
+    query = db.query(Subscription).filter(Subscription.user_id == user_id)
+    return paginate(query, Subscription.created_at, Subscription.id, cursor, limit)
 
-    return new_subscription
+# ✅ 사용자 알림 목록 (최신순)
+def get_user_notifications(db: Session, user_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_LIMIT):
+    query = db.query(Notification).filter(Notification.user_id == user_id)
+    return paginate(query, Notification.created_at, Notification.id, cursor, limit)
+
+# ✅ 업체 알림 목록 (최신순)
+def get_provider_notifications(db: Session, provider_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_LIMIT):
+    query = db.query(Notification).filter(Notification.provider_id == provider_id)
+    return paginate(query, Notification.created_at, Notification.id, cursor, limit)
 
-def get_user_subscriptions(db: Session, user_id: int):
-    return db.query(Subscription).filter(Subscription.user_id == user_id).all()
+# ✅ 사용자 결제 목록 (최신순)
+def get_user_payments(db: Session, user_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_LIMIT):
+    query = db.query(Payment).filter(Payment.user_id == user_id)
+    return paginate(query, Payment.created_at, Payment.id, cursor, limit)
+
+# ✅ 승인 대기 업체 목록 (최신순)
+def get_pending_providers(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_LIMIT):
+    query = db.query(Provider).filter(Provider.is_approved == False)
+    return paginate(query, Provider.created_at, Provider.id, cursor, limit)
 
 def get_provider_activities_with_counts(db: Session, provider_id: int):
     results = (
@@ -168,11 +304,9 @@ def get_provider_activities_with_counts(db: Session, provider_id: int):
             Activity.status,
             Activity.min_participants, 
             Activity.deadline,  # ✅ 이 줄 추가!
-            func.count(Subscription.id).label("current_participants")
+            Activity.current_participants
         )
-        .outerjoin(Subscription, Activity.id == Subscription.activity_id)
         .filter(Activity.provider_id == provider_id)
-        .group_by(Activity.id)
         .all()
     )
 
@@ -191,13 +325,11 @@ def get_provider_activities_with_counts(db: Session, provider_id: int):
 def get_activity_participants_for_provider(db: Session, provider_id: int):
     return (
         db.query(
-            models.Activity.id.label("activity_id"),
-            models.Activity.title,
-            func.count(models.Subscription.id).label("participants_count")
+            Activity.id.label("activity_id"),
+            Activity.title,
+            Activity.current_participants.label("participants_count")
         )
-        .join(models.Subscription, models.Activity.id == models.Subscription.activity_id)
-        .filter(models.Activity.provider_id == provider_id)
-        .group_by(models.Activity.id)
+        .filter(Activity.provider_id == provider_id, Activity.current_participants > 0)
         .all()
     )
 
@@ -208,7 +340,7 @@ def get_activities_by_provider(db: Session, provider_id: int):
 from fastapi import HTTPException  # 이미 되어 있을 가능 있음
 
 def confirm_activity(db: Session, activity_id: int, provider_id: int):
-    activity = db.query(Activity).filter(Activity.id == activity_id).first()
+    activity = db.query(Activity).filter(Activity.id == activity_id).with_for_update().first()
     if not activity:
         raise HTTPException(status_code=404, detail="Activity not found")
 
@@ -218,38 +350,55 @@ def confirm_activity(db: Session, activity_id: int, provider_id: int):
     if activity.status == "confirmed":
         raise HTTPException(status_code=400, detail="Activity already confirmed")
 
-    current_subs = db.query(Subscription).filter(Subscription.activity_id == activity_id).count()
-    if current_subs < activity.min_participants:
+    if activity.current_participants < activity.min_participants:
         raise HTTPException(status_code=400, detail="Not enough participants to confirm")
 
     activity.status = "confirmed"
-    db.commit()
-    db.refresh(activity)
 
-    # ✅ 사용자에게 알림 전송
+    # ✅ 사용자에게 알림 전송 (상태 변경과 같은 트랜잭션)
     notify_users_of_confirmed_activity(
         db,
         activity_id,
         f"활동 '{activity.title}'이(가) 확정되었습니다. 결제할 수 있습니다."
     )
 
+    db.commit()
+    db.refresh(activity)
+    on_activity_changed(activity)
     return activity
 
 
 
 # ✅ 사용자들에게 활동 확정 알림 전송
+#    신청자 수만큼 ORM 객체를 만들지 않고 INSERT ... SELECT 한 번으로 처리 (사용자별 1건)
+#    커밋은 호출한 쪽에서 한다.
 def notify_users_of_confirmed_activity(db: Session, activity_id: int, message: str):
-    user_ids = db.query(Subscription.user_id).filter(Subscription.activity_id == activity_id).all()
-    for (user_id,) in user_ids:
-        notification = Notification(
-            user_id=user_id,
-            message=message,
-            is_read=False
+    recipients = (
+        select(
+            Subscription.user_id,
+            literal(message),
+            literal(False),
+            literal(datetime.utcnow())
         )
-        db.add(notification)
-    db.commit()
+        .where(Subscription.activity_id == activity_id)
+        .distinct()
+    )
+    db.execute(
+        insert(Notification).from_select(
+            ["user_id", "message", "is_read", "created_at"],
+            recipients
+        )
+    )
+
+# ✅ 활동 장소: 위도/경도를 받지 않았으면 업체 위치 (둘 다 없으면 (None, None))
+def activity_location(db: Session, latitude: Optional[float], longitude: Optional[float], provider_id: int):
+    if latitude is not None and longitude is not None:
+        return latitude, longitude
+    row = db.query(Provider.latitude, Provider.longitude).filter(Provider.id == provider_id).first()
+    return (row.latitude, row.longitude) if row else (None, None)
 
 def create_activity(db: Session, activity: schemas.ActivityCreate):
+    latitude, longitude = activity_location(db, activity.latitude, activity.longitude, activity.provider_id)
     db_activity = Activity(
         title=activity.title,
         description=activity.description,
@@ -260,26 +409,173 @@ def create_activity(db: Session, activity: schemas.ActivityCreate):
         interest_subcategory=activity.interest_subcategory,  # ✅
         deadline=activity.deadline,  # ✅ 이 줄 추가!
         region=activity.region,  # ✅ 이 줄이 꼭 있어야 함!
+        region_code=activity_region_code(db, activity.region, activity.provider_id),
+        interest_id=activity_interest_id(db, activity.interest_category, activity.interest_subcategory),
+        latitude=latitude,
+        longitude=longitude,
+        geo_cell=geo.geo_cell(latitude, longitude),
         status=activity.status
     )
     db.add(db_activity)
     db.commit()
     db.refresh(db_activity)
+    on_activity_changed(db_activity)
     return db_activity
 
 
-def get_activities_with_filter(db: Session, region: Optional[str] = None, interest: Optional[str] = None):
-    query = db.query(Activity)
-
+# ✅ 활동 지역 코드: 활동 region, 없으면 업체 service_area 의 코드
+def activity_region_code(db: Session, region: Optional[str], provider_id: int) -> Optional[str]:
+    code = regions.region_code(region)
+    if code is None:
+        code = db.query(Provider.region_code).filter(Provider.id == provider_id).scalar()
+    return code
+
+# ✅ 지역 필터: 시/군/구는 코드 일치, 시/도는 코드 접두어 (ix_activities_region_code_created_at 사용)
+#    목록에 없는 지역 문자열만 예전처럼 업체 service_area 부분 일치
+def filter_region(query, region: str):
+    code = regions.region_code(region)
+    if code is None:
+        return query.join(Provider, Activity.provider_id == Provider.id).filter(Provider.service_area.contains(region))
+    if regions.is_sido_code(code):
+        return query.filter(Activity.region_code.like(f"{code}%"))
+    return query.filter(Activity.region_code == code)
+
+# ✅ 활동 관심사 id: (분류, 세부 관심사) 가 interests 테이블에 있으면 그 행 (없으면 None)
+def activity_interest_id(db: Session, category: Optional[str], subcategory: Optional[str]) -> Optional[int]:
+    if not category or not subcategory:
+        return None
+    return db.query(Interest.id).filter(
+        Interest.category == category.strip(),
+        Interest.subcategory == subcategory.strip()
+    ).scalar()
+
+# ✅ 관심사 이름(분류 또는 세부 관심사) → interests.id 서브쿼리
+def interest_ids_statement(interest: str):
+    interest = interest.strip()
+    return select(Interest.id).where(or_(Interest.category == interest, Interest.subcategory == interest))
+
+# ✅ 활동 목록 지역/관심사 필터 (Query, select() 공용)
+#    관심사는 interests 테이블에서 찾은 id 로 ix_activities_interest_id_created_at 조건
+def filter_activities(query, region: Optional[str] = None, interest: Optional[str] = None):
     if region:
-        query = query.join(Provider).filter(Provider.service_area.contains(region))
+        query = filter_region(query, region)
     if interest:
-        query = query.filter(
-            (Activity.interest_category.contains(interest)) |
-            (Activity.interest_subcategory.contains(interest))
+        query = query.filter(Activity.interest_id.in_(interest_ids_statement(interest)))
+    return query
+
+def get_activities_with_filter(
+    db: Session,
+    region: Optional[str] = None,
+    interest: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    q: Optional[str] = None
+):
+    if q:
+        return search_activities(db, q, region, interest, cursor, limit)
+    query = filter_activities(db.query(Activity), region, interest)
+    return paginate(query, Activity.created_at, Activity.id, cursor, limit)
+
+# ✅ 검색 결과 중 지역/관심사 필터를 통과한 것만 (필터가 없으면 그대로)
+def filter_search_results(results, allowed_ids):
+    if allowed_ids is None:
+        return results
+    return [(activity_id, score) for activity_id, score in results if activity_id in allowed_ids]
+
+def search_filter_statement(results, region: Optional[str], interest: Optional[str]):
+    if not (region or interest) or not results:
+        return None
+    candidate_ids = [activity_id for activity_id, _ in results]
+    return filter_activities(select(Activity.id).where(Activity.id.in_(candidate_ids)), region, interest)
+
+def order_by_ids(activities, ids):
+    by_id = {a.id: a for a in activities}
+    return [by_id[i] for i in ids if i in by_id]
+
+# ✅ 검색어(q) 활동 목록: 메모리 색인에서 BM25 순위 → 필터 → (score, id) 커서 페이지
+def search_activities(
+    db: Session,
+    q: str,
+    region: Optional[str] = None,
+    interest: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_LIMIT
+):
+    search.activity_search_index.ensure_fresh(db)
+    results = search.activity_search_index.search(q)
+
+    stmt = search_filter_statement(results, region, interest)
+    allowed_ids = set(db.execute(stmt).scalars()) if stmt is not None else None
+    page_ids, next_cursor = paginate_ranked(filter_search_results(results, allowed_ids), cursor, limit)
+
+    activities = db.query(Activity).filter(Activity.id.in_(page_ids)).all() if page_ids else []
+    return order_by_ids(activities, page_ids), next_cursor
+
+# ✅ 주변 모집 중 활동 (가까운 순, 같은 거리는 id 내림차순) → ([(활동, 거리 km)], 다음 커서)
+#    격자 셀 범위(ix_activities_geo_cell)로 후보만 읽고, 정확한 거리는 numpy 로 한 번에 계산
+#    커서는 paginate_ranked 의 (score, id) 형식으로 score = -거리
+def get_nearby_activities(
+    db: Session,
+    latitude: float,
+    longitude: float,
+    radius_km: float = geo.NEARBY_DEFAULT_RADIUS_KM,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_LIMIT
+):
+    cells = or_(*(Activity.geo_cell.between(first, last) for first, last in geo.cell_ranges(latitude, longitude, radius_km)))
+    candidates = db.execute(
+        select(Activity.id, Activity.latitude, Activity.longitude).where(
+            cells,
+            Activity.status.in_(SUBSCRIBABLE_STATUSES),
+            (Activity.deadline.is_(None)) | (Activity.deadline >= datetime.utcnow())
         )
+    ).all()
+    if not candidates:
+        return [], None
+
+    np = load_numpy()
+    ids = np.fromiter((row.id for row in candidates), dtype=np.int64, count=len(candidates))
+    lats = np.fromiter((row.latitude for row in candidates), dtype=np.float64, count=len(candidates))
+    lons = np.fromiter((row.longitude for row in candidates), dtype=np.float64, count=len(candidates))
+    distances = geo.haversine_km(latitude, longitude, lats, lons)
+
+    within = distances <= radius_km
+    ids, distances = ids[within], distances[within]
+    order = np.lexsort((-ids, distances))
+    results = list(zip(ids[order].tolist(), (-distances[order]).tolist()))
+
+    page_ids, next_cursor = paginate_ranked(results, cursor, limit)
+    if not page_ids:
+        return [], next_cursor
+    distance_by_id = {activity_id: -score for activity_id, score in results}
+    activities = order_by_ids(db.query(Activity).filter(Activity.id.in_(page_ids)).all(), page_ids)
+    return [(activity, distance_by_id[activity.id]) for activity in activities], next_cursor
+
+# ✅ 세부 관심사 목록에 해당하는 모집 중 활동 (ix_activities_interest_id_created_at 사용)
+def get_open_activities_by_subcategories(db: Session, subcategories: List[str], limit: int, exclude_ids: List[int] = ()):
+    if not subcategories:
+        return []
+    query = db.query(Activity).filter(
+        Activity.interest_id.in_(select(Interest.id).where(Interest.subcategory.in_(subcategories))),
+        Activity.status.in_(SUBSCRIBABLE_STATUSES),
+        (Activity.deadline.is_(None)) | (Activity.deadline >= datetime.utcnow())
+    )
+    if exclude_ids:
+        query = query.filter(Activity.id.notin_(exclude_ids))
+    return query.order_by(Activity.created_at.desc(), Activity.id.desc()).limit(limit).all()
+
+# ✅ 사용자 관심사/지역 기반 추천 순위 (이미 신청한 활동 제외)
+def get_activities_for_user(db: Session, user: User, limit: int):
+    ranker = ranking.get_activity_ranker()
+    ranker.ensure_fresh(db)
+
+    subscribed = [row[0] for row in db.query(Subscription.activity_id).filter(Subscription.user_id == user.id)]
+    ranked_ids = ranker.rank(ranking.user_features(user.interests, user.location), limit, exclude_ids=subscribed)
+    if not ranked_ids:
+        return []
 
-    return query.all()
+    activities = {a.id: a for a in db.query(Activity).filter(Activity.id.in_(ranked_ids))}
+    return [activities[i] for i in ranked_ids if i in activities]
 
 # ✅ 모집 마감일 수정 함수
 def update_activity_deadline(db: Session, activity_id: int, provider_id: int, new_deadline: datetime):
@@ -301,6 +597,7 @@ def update_activity_deadline(db: Session, activity_id: int, provider_id: int, ne
     activity.deadline = new_deadline
     db.commit()
     db.refresh(activity)
+    on_activity_changed(activity)
     return activity
 
 # ✅ 사용자 입력 관심사 저장
@@ -318,6 +615,18 @@ def create_custom_interest(db: Session, interest: schemas.CustomInterestCreate):
 def get_all_custom_interests(db: Session):
     return db.query(CustomInterest).all()
 
+# ✅ 새 공식 관심사와 분류/세부 관심사 문자열이 같은 기존 활동 연결 (커밋은 호출한 쪽에서)
+def link_activities_to_interest(db: Session, interest: Interest):
+    db.execute(
+        update(Activity)
+        .where(
+            Activity.interest_id.is_(None),
+            Activity.interest_subcategory == interest.subcategory,
+            Activity.interest_category == interest.category
+        )
+        .values(interest_id=interest.id)
+    )
+
 # ✅ 유사 관심사들을 그룹으로 통합
 def group_and_approve_interests(db: Session, interest_ids: List[int], group_id: int):
     interests = db.query(CustomInterest).filter(CustomInterest.id.in_(interest_ids)).all()
@@ -325,29 +634,57 @@ def group_and_approve_interests(db: Session, interest_ids: List[int], group_id:
         interest.status = "approved"
         interest.group_id = group_id
     db.commit()
+    for interest in interests:
+        suggest.suggest_index.upsert_custom_interest(interest)
     return interests
 
 # ✅ 처리되지 않은 주관식 관심사 조회
 def get_unprocessed_custom_interests(db: Session):
-    return db.query(models.CustomInterest).filter(
-        models.CustomInterest.status == "pending"
+    return db.query(CustomInterest).filter(
+        CustomInterest.status == "pending"
     ).all()
 
 # crud.py 파일 맨 아래쯤에 추가해줘
 
 def delete_subscription(db: Session, subscription_id: int, user_id: int):
-    subscription = db.query(models.models.Subscription).filter(
-        models.models.Subscription.id == subscription_id,
-        models.models.Subscription.user_id == user_id
+    subscription = db.query(Subscription).filter(
+        Subscription.id == subscription_id,
+        Subscription.user_id == user_id
     ).first()
 
     if not subscription:
         return None
 
     db.delete(subscription)
+    adjust_participant_count(db, subscription.activity_id, -1)
     db.commit()
     return subscription
 
+# ✅ 신청자 수 카운터 점검/보정 (실제 subscriptions 수와 다른 활동만 갱신)
+def reconcile_participant_counts(db: Session, dry_run: bool = False):
+    actual = (
+        select(func.count(Subscription.id))
+        .where(Subscription.activity_id == Activity.id)
+        .correlate(Activity)
+        .scalar_subquery()
+    )
+    drifted = (
+        db.query(Activity.id, Activity.current_participants, actual.label("actual"))
+        .filter(Activity.current_participants != actual)
+        .all()
+    )
+    if drifted and not dry_run:
+        db.execute(
+            update(Activity)
+            .where(Activity.id.in_([row.id for row in drifted]))
+            .values(current_participants=actual)
+        )
+        db.commit()
+    return [
+        {"activity_id": row.id, "stored": row.current_participants, "actual": row.actual}
+        for row in drifted
+    ]
+
 def cancel_activity(db: Session, activity_id: int, provider_id: int):
     activity = db.query(Activity).filter(Activity.id == activity_id).first()
     if not activity:
@@ -357,36 +694,133 @@ def cancel_activity(db: Session, activity_id: int, provider_id: int):
     activity.status = "cancelled"
     db.commit()
     db.refresh(activity)
+    on_activity_changed(activity)
     return activity
 
-def get_users_with_filters(db: Session, search: str = "", sort: str = "created_at", order: str = "desc"):
-    query = db.query(User)
-
-    if search:
-        query = query.filter(User.name.contains(search) | User.email.contains(search))
+# ✅ 관리자 사용자/업체 목록 공통 검색 조건 (이름 또는 이메일 포함)
+def admin_search_condition(model, search: str):
+    if not search:
+        return None
+    return model.name.contains(search) | model.email.contains(search)
 
+# ✅ 관리자 사용자/업체 목록 공통 정렬 컬럼
+def admin_sort_column(model, sort: str):
     if sort == "created_at":
-        sort_column = User.created_at
-    elif sort == "email":
-        sort_column = User.email
-    else:
-        sort_column = User.name
-
-    sort_column = sort_column.desc() if order == "desc" else sort_column.asc()
-    return query.order_by(sort_column).all()
+        return model.created_at
+    if sort == "email":
+        return model.email
+    return model.name
+
+def get_users_with_filters(
+    db: Session,
+    search: str = "",
+    sort: str = "created_at",
+    order: str = "desc",
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_LIMIT
+):
+    query = db.query(User)
 
-def get_providers_with_filters(db: Session, search: str = "", sort: str = "created_at", order: str = "desc"):
+    condition = admin_search_condition(User, search)
+    if condition is not None:
+        query = query.filter(condition)
+
+    sort_column = admin_sort_column(User, sort)
+    return paginate(query, sort_column, User.id, cursor, limit, descending=(order == "desc"))
+
+# ✅ 관리자 사용자 목록 빠른 경로 (UserResponse 컬럼만 Core 행으로 읽어 dict 로)
+def get_user_rows_with_filters(
+    db: Session,
+    search: str = "",
+    sort: str = "created_at",
+    order: str = "desc",
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_LIMIT
+):
+    sort_column = admin_sort_column(User, sort)
+    stmt, keys = row_select(USER_LIST_COLUMNS, sort_column)
+
+    condition = admin_search_condition(User, search)
+    if condition is not None:
+        stmt = stmt.where(condition)
+
+    return paginate_rows(db, stmt, keys, sort_column, User.id, cursor, limit, descending=(order == "desc"))
+
+def get_providers_with_filters(
+    db: Session,
+    search: str = "",
+    sort: str = "created_at",
+    order: str = "desc",
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_LIMIT
+):
     query = db.query(Provider)
 
-    if search:
-        query = query.filter(Provider.name.contains(search) | Provider.email.contains(search))
-
-    if sort == "created_at":
-        sort_column = Provider.created_at
-    elif sort == "email":
-        sort_column = Provider.email
+    condition = admin_search_condition(Provider, search)
+    if condition is not None:
+        query = query.filter(condition)
+
+    sort_column = admin_sort_column(Provider, sort)
+    return paginate(query, sort_column, Provider.id, cursor, limit, descending=(order == "desc"))
+
+# ✅ DateTime 컬럼을 date 로 읽기 (스키마 필드가 date 일 때 pydantic 과 같은 값, SQL 은 그대로)
+class DateFromDateTime(TypeDecorator):
+    impl = DateTime
+    cache_ok = True
+
+    def process_result_value(self, value, dialect):
+        return value.date() if isinstance(value, datetime) else value
+
+# ✅ 응답 스키마 필드 중 모델 컬럼인 것 (스키마 필드 순서 그대로, 목록 빠른 경로용)
+def response_columns(model, schema) -> list:
+    columns = []
+    for name, field in schema.__fields__.items():
+        if name not in model.__table__.columns:
+            continue
+        column = getattr(model, name)
+        if field.type_ is date and isinstance(column.type, DateTime):
+            column = type_coerce(column, DateFromDateTime()).label(name)
+        columns.append(column)
+    return columns
+
+USER_LIST_COLUMNS = response_columns(User, schemas.UserResponse)
+ACTIVITY_LIST_COLUMNS = response_columns(Activity, schemas.ActivityResponse)
+NOTIFICATION_LIST_COLUMNS = response_columns(Notification, schemas.NotificationResponse)
+
+# ✅ CSV 내보내기 가능 컬럼 (기본 순서)
+USER_EXPORT_COLUMNS = ["id", "name", "email", "phone", "location", "interests"]
+PROVIDER_EXPORT_COLUMNS = [
+    "id", "name", "email", "phone", "service_area",
+    "service_name", "is_business", "business_registration_number", "is_approved"
+]
+EXPORT_BATCH_SIZE = 1000
+
+# ✅ 관리자 CSV 내보내기용 행 스트리밍
+#    서버 측 커서(stream_results)로 batch_size 행씩 받아 ORM 객체 없이 튜플 묶음으로 넘긴다.
+def stream_export_rows(
+    db: Session,
+    model,
+    columns: List[str],
+    search: str = "",
+    sort: str = "created_at",
+    order: str = "desc",
+    batch_size: int = EXPORT_BATCH_SIZE
+):
+    stmt = select(*[getattr(model, c) for c in columns])
+
+    condition = admin_search_condition(model, search)
+    if condition is not None:
+        stmt = stmt.where(condition)
+
+    sort_column = admin_sort_column(model, sort)
+    if order == "desc":
+        stmt = stmt.order_by(sort_column.desc(), model.id.desc())
     else:
-        sort_column = Provider.name
-
-    sort_column = sort_column.desc() if order == "desc" else sort_column.asc()
-    return query.order_by(sort_column).all()
+        stmt = stmt.order_by(sort_column.asc(), model.id.asc())
+
+    result = db.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+    try:
+        for rows in result.partitions():
+            yield rows
+    finally:
+        result.close()
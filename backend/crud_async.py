@@ -0,0 +1,264 @@
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+import crud
+from models.models import User, Provider, Admin, Activity, Subscription, Notification, RefreshToken, RevokedToken
+from revocation import revocation_index
+from auth_utils import new_refresh_token, hash_refresh_token, REFRESH_TOKEN_EXPIRE_DAYS, REFRESH_TOKEN_MAX_AGE_DAYS
+import search
+from pagination import apaginate, apaginate_rows, paginate_ranked, row_select, rows_to_dicts, DEFAULT_PAGE_LIMIT
+
+# ✅ crud.py 의 자주 호출되는 조회/신청 함수를 AsyncSession 으로 옮긴 버전
+#    조건/판단 로직은 crud.py 의 공용 함수를 그대로 사용한다.
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def get_provider_by_id(db: AsyncSession, provider_id: int):
+    result = await db.execute(select(Provider).where(Provider.id == provider_id))
+    return result.scalars().first()
+
+async def get_admin_by_id(db: AsyncSession, admin_id: int):
+    result = await db.execute(select(Admin).where(Admin.id == admin_id))
+    return result.scalars().first()
+
+async def get_activity_by_id(db: AsyncSession, activity_id: int):
+    result = await db.execute(select(Activity).where(Activity.id == activity_id))
+    return result.scalars().first()
+
+async def get_activities_with_filter(
+    db: AsyncSession,
+    region: Optional[str] = None,
+    interest: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    q: Optional[str] = None
+):
+    if q:
+        return await search_activities(db, q, region, interest, cursor, limit)
+    stmt = crud.filter_activities(select(Activity), region, interest)
+    return await apaginate(db, stmt, Activity.created_at, Activity.id, cursor, limit)
+
+# ✅ 활동 목록 빠른 경로 (ActivityResponse 컬럼만 Core 행으로 읽어 dict 로, 검색어가 있으면 관련도순)
+async def get_activity_rows_with_filter(
+    db: AsyncSession,
+    region: Optional[str] = None,
+    interest: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    q: Optional[str] = None
+):
+    if q:
+        return await search_activity_rows(db, q, region, interest, cursor, limit)
+    stmt, keys = row_select(crud.ACTIVITY_LIST_COLUMNS, Activity.created_at)
+    stmt = crud.filter_activities(stmt, region, interest)
+    return await apaginate_rows(db, stmt, keys, Activity.created_at, Activity.id, cursor, limit)
+
+async def search_activity_rows(
+    db: AsyncSession,
+    q: str,
+    region: Optional[str] = None,
+    interest: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_LIMIT
+):
+    page_ids, next_cursor = await search_activity_page_ids(db, q, region, interest, cursor, limit)
+
+    rows = []
+    if page_ids:
+        rows = (await db.execute(select(*crud.ACTIVITY_LIST_COLUMNS).where(Activity.id.in_(page_ids)))).all()
+    keys = [column.key for column in crud.ACTIVITY_LIST_COLUMNS]
+    return rows_to_dicts(crud.order_by_ids(rows, page_ids), keys), next_cursor
+
+# ✅ 검색어 순위 → 지역/관심사 필터 → 이번 페이지 활동 id
+async def search_activity_page_ids(
+    db: AsyncSession,
+    q: str,
+    region: Optional[str] = None,
+    interest: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_LIMIT
+):
+    await search.activity_search_index.aensure_fresh(db)
+    results = search.activity_search_index.search(q)
+
+    stmt = crud.search_filter_statement(results, region, interest)
+    allowed_ids = set((await db.execute(stmt)).scalars()) if stmt is not None else None
+    return paginate_ranked(crud.filter_search_results(results, allowed_ids), cursor, limit)
+
+# ✅ crud.search_activities 의 AsyncSession 버전
+async def search_activities(
+    db: AsyncSession,
+    q: str,
+    region: Optional[str] = None,
+    interest: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_LIMIT
+):
+    page_ids, next_cursor = await search_activity_page_ids(db, q, region, interest, cursor, limit)
+
+    activities = []
+    if page_ids:
+        activities = (await db.execute(select(Activity).where(Activity.id.in_(page_ids)))).scalars().all()
+    return crud.order_by_ids(activities, page_ids), next_cursor
+
+# ✅ 구독 생성 (crud.create_subscription 과 같은 단일 트랜잭션 흐름)
+async def create_subscription(db: AsyncSession, user_id: int, activity_id: int):
+    result = await db.execute(select(Activity).where(Activity.id == activity_id).with_for_update())
+    activity = result.scalars().first()
+    if not activity:
+        await db.rollback()
+        return None
+
+    if crud.is_subscription_closed(activity):
+        await db.rollback()
+        return "closed"
+
+    new_subscription = Subscription(
+        user_id=user_id,
+        activity_id=activity_id,
+        status="pending"
+    )
+    db.add(new_subscription)
+    await db.flush()
+
+    activity.current_participants += 1
+
+    notification = crud.minimum_reached_notification(activity)
+    if notification is not None:
+        db.add(notification)
+
+    await db.commit()
+    await db.refresh(new_subscription)
+    return new_subscription
+
+async def get_user_subscriptions(db: AsyncSession, user_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_LIMIT):
+    stmt = select(Subscription).where(Subscription.user_id == user_id)
+    return await apaginate(db, stmt, Subscription.created_at, Subscription.id, cursor, limit)
+
+async def delete_subscription(db: AsyncSession, subscription_id: int, user_id: int):
+    result = await db.execute(select(Subscription).where(
+        Subscription.id == subscription_id,
+        Subscription.user_id == user_id
+    ))
+    subscription = result.scalars().first()
+
+    if not subscription:
+        return None
+
+    await db.delete(subscription)
+    await db.execute(crud.participant_count_update(subscription.activity_id, -1))
+    await db.commit()
+    return subscription
+
+async def get_user_notifications(db: AsyncSession, user_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_LIMIT):
+    stmt = select(Notification).where(Notification.user_id == user_id)
+    return await apaginate(db, stmt, Notification.created_at, Notification.id, cursor, limit)
+
+# ✅ 내 알림 목록 빠른 경로 (NotificationResponse 컬럼만 Core 행으로 읽어 dict 로)
+async def get_user_notification_rows(db: AsyncSession, user_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_LIMIT):
+    stmt, keys = row_select(crud.NOTIFICATION_LIST_COLUMNS, Notification.created_at)
+    stmt = stmt.where(Notification.user_id == user_id)
+    return await apaginate_rows(db, stmt, keys, Notification.created_at, Notification.id, cursor, limit)
+
+async def get_provider_notifications(db: AsyncSession, provider_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_LIMIT):
+    stmt = select(Notification).where(Notification.provider_id == provider_id)
+    return await apaginate(db, stmt, Notification.created_at, Notification.id, cursor, limit)
+
+async def mark_notification_as_read(db: AsyncSession, notification_id: int, user_id: int):
+    result = await db.execute(select(Notification).where(
+        Notification.id == notification_id,
+        Notification.user_id == user_id
+    ))
+    notification = result.scalars().first()
+    if not notification:
+        return None
+
+    notification.is_read = True
+    await db.commit()
+    await db.refresh(notification)
+    return notification
+
+# ✅ 리프레시 토큰 발급 (로그인 시 새 family, 재발급 시 기존 family 와 최대 유지 시각을 이어받음)
+async def create_refresh_token(
+    db: AsyncSession,
+    subject_type: str,
+    subject: str,
+    family_id: Optional[str] = None,
+    session_expires_at: Optional[datetime] = None
+) -> str:
+    now = datetime.utcnow()
+    session_expires_at = session_expires_at or now + timedelta(days=REFRESH_TOKEN_MAX_AGE_DAYS)
+    token = new_refresh_token()
+    db.add(RefreshToken(
+        token_hash=hash_refresh_token(token),
+        family_id=family_id or uuid.uuid4().hex,
+        subject_type=subject_type,
+        subject=subject,
+        expires_at=min(now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS), session_expires_at),
+        session_expires_at=session_expires_at,
+    ))
+    await db.commit()
+    return token
+
+# ✅ 리프레시 토큰 교체: token_hash 유니크 인덱스 조회 한 번 + 조건부 UPDATE
+#    이미 교체된 토큰이 다시 오면 탈취로 보고 같은 family 전체를 폐기
+#    성공 시 (새 토큰, 기존 행), 실패 시 "invalid" | "expired" | "reused"
+async def rotate_refresh_token(db: AsyncSession, token: str):
+    result = await db.execute(select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token)))
+    current = result.scalars().first()
+    if not current:
+        return "invalid"
+
+    now = datetime.utcnow()
+    if current.revoked_at is None and current.expires_at <= now:
+        return "expired"
+
+    # 동시에 같은 토큰으로 두 번 요청해도 revoked_at 이 비어 있을 때 한 번만 성공
+    claimed = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == current.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+    )
+    if claimed.rowcount != 1:
+        await revoke_refresh_token_family(db, current.family_id)
+        return "reused"
+
+    new_token = await create_refresh_token(
+        db, current.subject_type, current.subject,
+        family_id=current.family_id, session_expires_at=current.session_expires_at
+    )
+    return new_token, current
+
+async def revoke_refresh_token_family(db: AsyncSession, family_id: str):
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+    await db.commit()
+
+# ✅ 로그아웃: 토큰이 속한 로그인(family) 전체 폐기
+async def revoke_refresh_token(db: AsyncSession, token: str) -> bool:
+    result = await db.execute(
+        select(RefreshToken.family_id).where(RefreshToken.token_hash == hash_refresh_token(token))
+    )
+    family_id = result.scalar()
+    if family_id is None:
+        return False
+    await revoke_refresh_token_family(db, family_id)
+    return True
+
+# ✅ 액세스 토큰 폐기 (jti 기록 후 이 인스턴스의 필터에 바로 추가, 같은 토큰을 다시 폐기해도 그대로 성공)
+async def revoke_access_token(db: AsyncSession, jti: str, expires_at: datetime):
+    db.add(RevokedToken(jti=jti, expires_at=expires_at))
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+    revocation_index.add(jti)
@@ -1,10 +1,17 @@
 # database.py
 import os
+import time
 import logging
+import threading
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select, insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from models.models import Base
+from models.models import Base, Region, Interest
+from regions import region_rows
+from interests import interest_rows
 
 # ✅ 환경 변수 로드
 load_dotenv()
@@ -13,20 +20,189 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# ✅ 환경 변수에서 DB 정보 가져오기
+# ✅ 환경 변수에서 DB 정보 가져오기 (검증과 엔진 생성은 첫 사용 시점에)
 DATABASE_URL = os.getenv("DATABASE_URL")
+AUTO_CREATE_DB = os.getenv("AUTO_CREATE_DB", "false").lower() == "true"
 
-if not DATABASE_URL:
-    logger.error("❌ DATABASE_URL이 설정되지 않았습니다. .env 파일을 확인하세요.")
-    raise ValueError("DATABASE_URL is not set.")
-else:
-    logger.info(f"✅ DATABASE_URL 확인: {DATABASE_URL}")
+# ✅ 배포 모드별 커넥션 풀 설정
+#    DB_POOL_MODE
+#      - "queue"  : uvicorn 등 상주 프로세스용 QueuePool (DB_POOL_SIZE / DB_MAX_OVERFLOW)
+#      - "single" : Lambda 컨테이너당 커넥션 1개만 유지 (DB_POOL_RECYCLE 초 후 재연결)
+#                   동기 엔진만 1개짜리 풀을 갖고, 비동기 엔진은 요청마다 연결/종료 (컨테이너당 합계 1개)
+#      - "null"   : 요청마다 연결/종료 (풀 없음)
+#    미지정 시 Lambda(AWS_LAMBDA_FUNCTION_NAME 존재)면 "single", 아니면 "queue"
+IS_LAMBDA = bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "single" if IS_LAMBDA else "queue").lower()
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+# MySQL wait_timeout 보다 짧게 잡아 끊긴 커넥션을 재사용하지 않도록 함 (pre_ping 의 SELECT 1 대신)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "300"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
 
-# ✅ SQLAlchemy 엔진 설정
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+if DB_POOL_MODE not in ("queue", "single", "null"):
+    raise ValueError(f"Unknown DB_POOL_MODE: {DB_POOL_MODE}")
+
+
+# ✅ 커넥션 풀 지표 (체크아웃 횟수, 대기 시간, 타임아웃)
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    def record_wait(self, wait_ms: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "checkout_wait_ms_avg": round(self.wait_ms_total / self.checkouts, 3) if self.checkouts else 0.0,
+                "checkout_wait_ms_max": round(self.wait_ms_max, 3),
+            }
+
+
+# ✅ 풀에서 커넥션을 꺼낼 때까지 걸린 시간을 기록하는 믹스인
+class MeteredPoolMixin:
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.metrics.record_wait(0.0, timed_out=True)
+            raise
+        self.metrics.record_wait((time.perf_counter() - started) * 1000)
+        return connection
+
+
+class MeteredQueuePool(MeteredPoolMixin, QueuePool):
+    metrics = PoolMetrics()
+
+
+class MeteredAsyncQueuePool(MeteredPoolMixin, AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
+
+
+class MeteredNullPool(MeteredPoolMixin, NullPool):
+    metrics = PoolMetrics()
+
+
+class MeteredAsyncNullPool(MeteredPoolMixin, NullPool):
+    metrics = PoolMetrics()
+
+
+# ✅ DB_POOL_MODE 에 맞는 create_engine 옵션
+#    single 모드에서 비동기 엔진까지 풀을 가지면 컨테이너당 커넥션이 2개가 되므로 비동기 엔진은 NullPool
+def pool_options(async_mode: bool = False) -> dict:
+    if DB_POOL_MODE == "null" or (DB_POOL_MODE == "single" and async_mode):
+        return {
+            "poolclass": MeteredAsyncNullPool if async_mode else MeteredNullPool,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+        }
+
+    options = {
+        "poolclass": MeteredAsyncQueuePool if async_mode else MeteredQueuePool,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+    if DB_POOL_MODE == "single":
+        options.update(pool_size=1, max_overflow=0)
+    else:
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW)
+    return options
+
+
+# ✅ 풀 점유 현황 + 체크아웃 대기 지표
+def pool_status(target_engine) -> dict:
+    if target_engine is None:
+        return {"mode": DB_POOL_MODE, "pool_class": "not created"}
+    pool = target_engine.pool
+    status = {"mode": DB_POOL_MODE, "pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    status.update(type(pool).metrics.snapshot())
+    return status
+
+# ✅ DATABASE_URL 확인 (로그에는 비밀번호를 가린 주소만 남김)
+def require_database_url() -> str:
+    if not DATABASE_URL:
+        logger.error("❌ DATABASE_URL이 설정되지 않았습니다. .env 파일을 확인하세요.")
+        raise ValueError("DATABASE_URL is not set.")
+    return DATABASE_URL
+
+# ✅ 비동기 DB URL (미지정 시 DATABASE_URL 의 드라이버만 aiomysql 로 교체)
+def async_database_url() -> str:
+    return os.getenv("ASYNC_DATABASE_URL") or make_url(require_database_url()).set(
+        drivername="mysql+aiomysql"
+    ).render_as_string(hide_password=False)
+
+# ✅ SQLAlchemy 엔진 설정 (import 시점이 아니라 첫 세션 생성 시 만들어 콜드 스타트를 줄임)
+_engine = None
+_async_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                url = require_database_url()
+                _engine = create_engine(url, **pool_options())
+                logger.info(f"✅ 연결된 DB 주소: {make_url(url).render_as_string(hide_password=True)} (pool={DB_POOL_MODE})")
+    return _engine
+
+# ✅ 비동기 엔진 (async def 라우터용, 스레드풀을 점유하지 않음)
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                _async_engine = create_async_engine(async_database_url(), **pool_options(async_mode=True))
+    return _async_engine
+
+# ✅ `from database import engine` 호환: 모듈 속성으로 접근할 때 엔진 생성
+def __getattr__(name):
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ✅ 처음 세션을 만들 때 엔진을 bind 하는 세션 팩토리
+class LazySessionMaker(sessionmaker):
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+class LazyAsyncSessionMaker(async_sessionmaker):
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_async_engine())
+        return super().__call__(**local_kw)
 
 # ✅ 세션 팩토리 생성
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = LazySessionMaker(autocommit=False, autoflush=False)
 
 # ✅ 의존성 주입을 위한 세션 함수
 def get_db():
@@ -36,10 +212,39 @@ def get_db():
     finally:
         db.close()
 
-# ✅ 개발 모드에서만 테이블 자동 생성
-if os.getenv("AUTO_CREATE_DB", "false").lower() == "true":
+# ✅ 비동기 세션 팩토리
+AsyncSessionLocal = LazyAsyncSessionMaker(class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# ✅ 의존성 주입을 위한 비동기 세션 함수
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# ✅ 동기/비동기 엔진 풀 지표 (관리자 모니터링용, 아직 만들지 않은 엔진은 만들지 않고 "not created")
+def get_pool_metrics() -> dict:
+    return {
+        "sync": pool_status(_engine),
+        "async": pool_status(_async_engine.sync_engine if _async_engine is not None else None),
+    }
+
+# ✅ 개발 모드에서만 테이블 자동 생성 (import 시점이 아니라 앱 시작 시 한 번 호출)
+def create_tables():
     logger.info("✅ 데이터베이스 테이블 생성 중...")
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
+    seed_regions()
+    seed_interests()
     logger.info("✅ 테이블 생성 완료!")
 
-logger.info(f"✅ 연결된 DB 주소: {DATABASE_URL}")
+# ✅ 지역 테이블이 비어 있으면 regions.py 목록으로 채움 (운영에서는 alembic 마이그레이션이 시드)
+def seed_regions():
+    with get_engine().begin() as conn:
+        if conn.execute(select(Region.code).limit(1)).first() is None:
+            conn.execute(insert(Region), region_rows())
+
+# ✅ 관심사 테이블에 없는 기본 분류/세부 관심사 추가 (운영에서는 alembic 마이그레이션이 시드)
+def seed_interests():
+    with get_engine().begin() as conn:
+        existing = set(conn.execute(select(Interest.category, Interest.subcategory)).all())
+        missing = [row for row in interest_rows() if (row["category"], row["subcategory"]) not in existing]
+        if missing:
+            conn.execute(insert(Interest), missing)
@@ -0,0 +1,63 @@
+import math
+from typing import Optional
+
+from memory_index import load_numpy
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180  # ✅ haversine 과 같은 구면 기준 (경도는 x cos(위도))
+
+# ✅ 격자 셀: 위도/경도를 0.05도(남북 약 5.5km, 한국 위도에서 동서 약 4.4km) 단위로 나눈 번호
+#    셀 번호 = 위도 칸 x 경도 칸 수 + 경도 칸 → 같은 위도 줄의 셀은 번호가 연속이라
+#    반경 검색은 위도 줄마다 BETWEEN 한 번 (ix_activities_geo_cell 범위 조회)
+GRID_CELL_DEGREES = 0.05
+GRID_COLUMNS = round(360 / GRID_CELL_DEGREES)
+
+# ✅ 주변 활동 검색 반경 (km)
+NEARBY_DEFAULT_RADIUS_KM = 5.0
+NEARBY_MAX_RADIUS_KM = 50.0
+
+
+def grid_row(lat: float) -> int:
+    return math.floor((lat + 90) / GRID_CELL_DEGREES)
+
+
+def grid_column(lon: float) -> int:
+    return math.floor((lon + 180) / GRID_CELL_DEGREES) % GRID_COLUMNS
+
+
+def geo_cell(lat: Optional[float], lon: Optional[float]) -> Optional[int]:
+    if lat is None or lon is None:
+        return None
+    return grid_row(lat) * GRID_COLUMNS + grid_column(lon)
+
+
+# ✅ 중심에서 radius_km 안의 점이 들어갈 수 있는 셀 번호 범위 [(시작, 끝), ...]
+#    (위도 줄마다 하나, 경도 180도 경계를 넘으면 둘)
+def cell_ranges(lat: float, lon: float, radius_km: float) -> list:
+    lat_delta = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = max(lat - lat_delta, -90.0), min(lat + lat_delta, 90.0)
+    # 범위 안에서 가장 극에 가까운 위도 기준으로 경도 폭을 잡아야 빠지는 셀이 없음
+    widest = max(abs(min_lat), abs(max_lat))
+    cos_lat = math.cos(math.radians(widest))
+    lon_delta = 180.0 if cos_lat < 1e-6 else min(radius_km / (KM_PER_DEGREE * cos_lat), 180.0)
+
+    if lon_delta >= 180.0:
+        column_spans = [(0, GRID_COLUMNS - 1)]
+    else:
+        first, last = grid_column(lon - lon_delta), grid_column(lon + lon_delta)
+        column_spans = [(first, last)] if first <= last else [(first, GRID_COLUMNS - 1), (0, last)]
+
+    return [
+        (row * GRID_COLUMNS + first, row * GRID_COLUMNS + last)
+        for row in range(grid_row(min_lat), grid_row(max_lat) + 1)
+        for first, last in column_spans
+    ]
+
+
+# ✅ 한 점과 여러 점 사이의 haversine 거리 (km, numpy 배열로 한 번에)
+def haversine_km(lat: float, lon: float, lats, lons):
+    np = load_numpy()
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
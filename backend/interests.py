@@ -0,0 +1,159 @@
+# ✅ 관심사 분류 (frontend/src/utils/interestOptions.js 의 interestOptions 와 동일하게 유지)
+INTEREST_OPTIONS = [
+    {
+        "category": "운동/스포츠",
+        "subcategories": [
+            "걷기", "등산", "요가", "필라테스",
+            "수영", "파크골프", "라인댄스", "실버 태권도",
+            "건강 체조", "게이트볼",
+        ]
+    },
+    {
+        "category": "예술/취미/공예",
+        "subcategories": [
+            "그림 그리기", "서예", "도예", "뜨개질",
+            "캘리그라피", "플로리스트", "공예 소품 만들기", "종이접기",
+        ]
+    },
+    {
+        "category": "음악/공연/무용",
+        "subcategories": [
+            "합창", "노래교실", "기타 연주", "우쿨렐레 연주",
+            "피아노 연주", "전통무용", "실버댄스", "민요 배우기",
+        ]
+    },
+    {
+        "category": "건강/힐링/웰빙",
+        "subcategories": [
+            "명상", "스트레칭", "한방요법", "웃음치료",
+            "헬스 퍼스널 트레이닝", "건강 상담", "심리 상담", "웰빙 요가",
+        ]
+    },
+    {
+        "category": "여행/문화탐방",
+        "subcategories": [
+            "국내여행", "해외여행", "문화유적 탐방", "전통마을 방문",
+            "사찰순례", "지역 특산지 탐방", "박물관/미술관 관람",
+        ]
+    },
+    {
+        "category": "봉사/사회참여",
+        "subcategories": [
+            "재능기부", "복지관 봉사", "청소년 멘토링", "도서관 봉사",
+            "환경 보호 봉사", "마을 공동체 참여",
+        ]
+    },
+    {
+        "category": "교육/디지털역량",
+        "subcategories": [
+            "스마트폰 기본 배우기", "태블릿 활용법", "컴퓨터/인터넷 기초", "SNS 배우기 (카톡, 인스타)",
+            "유튜브 활용법", "디지털 금융 이용하기",
+        ]
+    },
+    {
+        "category": "요리/식생활/전통음식",
+        "subcategories": [
+            "전통음식 만들기", "김치 담그기", "건강식 요리", "약선요리 배우기",
+            "베이킹", "도시락 만들기", "반찬 만들기",
+        ]
+    },
+    {
+        "category": "반려동물/가드닝",
+        "subcategories": [
+            "화초 가꾸기", "텃밭 가꾸기", "다육이 키우기", "반려견 산책 모임",
+            "반려동물 건강관리", "식물 교환 모임",
+        ]
+    },
+    {
+        "category": "커뮤니티/모임/동아리",
+        "subcategories": [
+            "또래 친구 만들기", "독서 모임", "영화 감상 모임", "커피 모임",
+            "시니어 극단 활동", "동호회 활동", "보드게임 모임",
+        ]
+    },
+    {
+        "category": "생활기술/셀프메이킹",
+        "subcategories": [
+            "재봉틀 배우기", "소가구 리폼", "셀프 인테리어", "생활 공구 다루기",
+            "생활 수리 DIY",
+        ]
+    },
+    {
+        "category": "사진/영상/디지털 콘텐츠",
+        "subcategories": [
+            "스마트폰 사진 촬영", "디지털 사진 편집", "영상 촬영 기초", "영상 편집 배우기",
+            "나만의 유튜브 채널 만들기",
+        ]
+    },
+    {
+        "category": "자서전/글쓰기/출판",
+        "subcategories": [
+            "자서전 쓰기", "시 쓰기", "수필 쓰기", "책 출판하기",
+            "블로그 운영하기",
+        ]
+    },
+    {
+        "category": "경제/재무/재테크",
+        "subcategories": [
+            "시니어 재테크", "연금 활용법", "부동산 관리 기초", "기초 금융 상식",
+            "금융 사기 예방",
+        ]
+    },
+    {
+        "category": "자기계발/심리/멘탈케어",
+        "subcategories": [
+            "심리상담 참여", "스트레스 관리", "마음챙김 워크숍", "인생 재설계 워크숍",
+            "행복 찾기 프로그램",
+        ]
+    },
+]
+
+# ✅ 야외 활동 세부 관심사 (나머지는 실내 활동으로 취급)
+OUTDOOR_SUBCATEGORIES = frozenset([
+    "걷기", "등산", "파크골프", "게이트볼",
+    "국내여행", "해외여행", "문화유적 탐방", "전통마을 방문", "사찰순례", "지역 특산지 탐방",
+    "환경 보호 봉사", "마을 공동체 참여",
+    "텃밭 가꾸기", "반려견 산책 모임",
+    "스마트폰 사진 촬영", "영상 촬영 기초",
+])
+
+
+def all_subcategories() -> list:
+    return [sub for option in INTEREST_OPTIONS for sub in option["subcategories"]]
+
+
+# ✅ setting: "outdoor" | "indoor" → 해당하는 세부 관심사 목록
+def subcategories_for_setting(setting: str) -> list:
+    outdoor = setting == "outdoor"
+    return [sub for sub in all_subcategories() if (sub in OUTDOOR_SUBCATEGORIES) == outdoor]
+
+
+# ✅ 세부 관심사 → 상위 분류
+def category_of(subcategory: str):
+    for option in INTEREST_OPTIONS:
+        if subcategory in option["subcategories"]:
+            return option["category"]
+    return None
+
+
+# ✅ interests 테이블 시드 행 [{category, subcategory}]
+def interest_rows() -> list:
+    return [
+        {"category": option["category"], "subcategory": sub}
+        for option in INTEREST_OPTIONS for sub in option["subcategories"]
+    ]
+
+
+# ✅ 사용자 interests 문자열 ("분류, 세부 관심사, ...") → 토큰 목록
+def split_interests(text) -> list:
+    return [token.strip() for token in (text or "").split(",") if token.strip()]
+
+
+# ✅ 토큰 → interests.id 목록 (분류를 고르면 그 분류의 모든 세부 관심사)
+#    interest_rows: (id, category, subcategory) 행
+def match_interest_ids(tokens, interest_rows) -> list:
+    tokens = set(tokens)
+    return [
+        interest_id for interest_id, category, subcategory in interest_rows
+        if category in tokens or subcategory in tokens
+    ]
@@ -1,4 +1,20 @@
-from main import app
-from mangum import Mangum
+from main import handler as http_handler
 
-handler = Mangum(app)
+
+# ✅ 날씨 미리 받아두기 전용 진입점
+#    API 와 같은 코드로 별도 Lambda 함수(핸들러 lambda_function.prefetch_handler)를 만들고
+#    EventBridge 스케줄과 넉넉한 타임아웃(예: 5~15분)은 그 함수에만 설정하는 것을 권장
+#    한 번 호출에서는 남은 실행 시간 안에서만 받아두고, 못 끝낸 지역은 다음 호출이 이어 받음
+def prefetch_handler(event, context):
+    import weather_prefetch
+    return weather_prefetch.prefetch_next_slice(context.get_remaining_time_in_millis() / 1000)
+
+
+# ✅ Lambda 진입점
+#    EventBridge 스케줄 이벤트(source=aws.events)는 날씨 미리 받아두기 작업으로,
+#    그 외(API Gateway) 이벤트는 FastAPI(Mangum) 로 전달
+#    (스케줄을 API 함수에 걸어 두어도 API 타임아웃 안에서 나눠 처리하지만, 그동안 이 컨테이너는 API 요청을 받지 못함)
+def handler(event, context):
+    if isinstance(event, dict) and event.get("source") == "aws.events":
+        return prefetch_handler(event, context)
+    return http_handler(event, context)
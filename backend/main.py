@@ -4,6 +4,8 @@ import os
 # ✅ backend 경로를 sys.path에 강제 추가 (import 문제 해결)
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.cors import CORSMiddleware
@@ -21,13 +23,20 @@ from routers.admin import router as admin_router
 from routers.payments import router as payments_router
 from routers.weather import router as weather_router  # ✅ 추가
 
-from database import engine
-from models.models import Base
+from database import AUTO_CREATE_DB, create_tables
 import schemas
 from schemas import UserCreate, UserResponse
 
+# ✅ 앱 시작 시 처리: 개발 모드(AUTO_CREATE_DB=true)에서만 테이블 생성
+#    운영(Lambda)에서는 import/시작 단계에 DDL 을 실행하지 않는다. 스키마는 alembic 으로 관리.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if AUTO_CREATE_DB:
+        create_tables()
+    yield
+
 # ✅ FastAPI 앱 생성 (배포 환경 root_path 포함)
-app = FastAPI(root_path="/senior-backend")
+app = FastAPI(root_path="/senior-backend", lifespan=lifespan)
 
 # ✅ CORS 설정: 로컬 + Netlify 모두 허용
 app.add_middleware(
@@ -41,9 +50,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ✅ DB 테이블 자동 생성
-Base.metadata.create_all(bind=engine)
-
 # ✅ 라우터 등록
 app.include_router(users_router)
 app.include_router(auth_router, prefix="/auth")
@@ -90,4 +96,5 @@ def custom_openapi():
 app.openapi = custom_openapi
 
 # ✅ AWS Lambda 연동용 핸들러
-handler = Mangum(app)
+#    Mangum 은 호출마다 lifespan 을 실행하므로 Lambda 에서는 끈다.
+handler = Mangum(app, lifespan="off")
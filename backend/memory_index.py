@@ -0,0 +1,147 @@
+import os
+import time
+import logging
+import threading
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# ✅ 다른 Lambda 인스턴스에서 바뀐 활동을 반영하기 위한 주기 (초)
+#    NEW_SYNC: 새로 등록된 활동(id 증가분)만 추가, REBUILD: 전체 다시 읽기
+INDEX_NEW_SYNC_SECONDS = int(os.getenv("INDEX_NEW_SYNC_SECONDS", "10"))
+INDEX_REBUILD_SECONDS = int(os.getenv("INDEX_REBUILD_SECONDS", "600"))
+
+
+# ✅ 커넥션 1개 풀(DB_POOL_MODE=single, Lambda)에서는 백그라운드 스레드가 요청과 그 커넥션을 다투므로
+#    REBUILD 주기의 전체 빌드를 스레드 없이 요청 세션으로 그 자리에서 실행
+def background_rebuild_enabled() -> bool:
+    from database import DB_POOL_MODE
+    return DB_POOL_MODE != "single"
+
+
+# ✅ numpy 는 인덱스를 처음 쓰는 요청에서만 import (Lambda 콜드 스타트에서 제외)
+@lru_cache(maxsize=None)
+def load_numpy():
+    import numpy
+    return numpy
+
+
+# ✅ DB 활동 테이블을 메모리에 올려두는 인덱스 공통 동작 (랭킹, 검색, 자동완성)
+#    - 첫 요청에서 전체 빌드 (동기/비동기 세션 모두 가능)
+#    - 이 인스턴스의 쓰기는 crud 훅(upsert)으로 즉시 반영
+#    - 다른 인스턴스의 새 활동은 NEW_SYNC 주기로 id 증가분만 읽고,
+#      수정/삭제는 REBUILD 주기의 백그라운드 전체 빌드로 반영 (그동안 기존 인덱스로 응답,
+#      single 풀에서는 그 주기의 첫 요청이 자기 세션으로 다시 빌드)
+#    하위 클래스는 source_query / load_rows / add_rows 를 구현한다.
+class RefreshingIndex:
+    name = "index"
+    new_sync_seconds = INDEX_NEW_SYNC_SECONDS
+    rebuild_seconds = INDEX_REBUILD_SECONDS
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._built = False
+        self._built_at = 0.0
+        self._synced_at = 0.0
+        self._max_id = 0
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def source_query(self, min_id: int = 0):
+        """id > min_id 인 행을 읽는 select() (첫 컬럼은 id)"""
+        raise NotImplementedError
+
+    def load_rows(self, rows):
+        """전체 행으로 인덱스를 새로 만들어 교체 (만드는 동안은 락 없이, 교체만 self._lock 안에서)"""
+        raise NotImplementedError
+
+    def add_rows(self, rows):
+        """행 추가/갱신 (self._lock 안에서 호출됨)"""
+        raise NotImplementedError
+
+    def sync_query(self):
+        """NEW_SYNC 주기에 읽을 select() (기본은 id 증가분)"""
+        return self.source_query(self._max_id)
+
+    def after_rebuild(self):
+        """전체 빌드 직후 호출 (스냅샷 저장 등)"""
+
+    def _replace(self, rows, built_at: float = None):
+        self.load_rows(rows)
+        with self._lock:
+            self._max_id = max((row[0] for row in rows), default=0)
+            self._built = True
+            self._built_at = self._synced_at = built_at if built_at is not None else time.monotonic()
+        self.after_rebuild()
+
+    def _add(self, rows):
+        with self._lock:
+            self.add_rows(rows)
+            self._max_id = max([self._max_id] + [row[0] for row in rows])
+            self._synced_at = time.monotonic()
+
+    def rebuild(self, db):
+        self._replace(db.execute(self.source_query()).all())
+
+    def sync_new(self, db):
+        self._add(db.execute(self.sync_query()).all())
+
+    def _needs(self) -> str:
+        now = time.monotonic()
+        if not self._built:
+            return "build"
+        if now - self._built_at > self.rebuild_seconds and self._build_lock.acquire(blocking=False):
+            self._built_at = now
+            if not background_rebuild_enabled():
+                return "rebuild"  # _build_lock 은 호출한 쪽에서 해제
+            threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+            return None
+        if now - self._synced_at > self.new_sync_seconds:
+            return "sync"
+        return None
+
+    def ensure_fresh(self, db):
+        needs = self._needs()
+        if needs == "build":
+            with self._build_lock:
+                if not self._built:
+                    self.rebuild(db)
+        elif needs == "rebuild":
+            try:
+                self.rebuild(db)
+            except Exception as e:
+                db.rollback()
+                logger.warning("%s rebuild failed: %s", self.name, e)
+            finally:
+                self._build_lock.release()
+        elif needs == "sync":
+            self.sync_new(db)
+
+    async def aensure_fresh(self, db):
+        needs = self._needs()
+        if needs == "build":
+            self._replace((await db.execute(self.source_query())).all())
+        elif needs == "rebuild":
+            try:
+                self._replace((await db.execute(self.source_query())).all())
+            except Exception as e:
+                await db.rollback()
+                logger.warning("%s rebuild failed: %s", self.name, e)
+            finally:
+                self._build_lock.release()
+        elif needs == "sync":
+            self._add((await db.execute(self.sync_query())).all())
+
+    def _rebuild_in_background(self):
+        from database import SessionLocal
+        db = SessionLocal()
+        try:
+            self.rebuild(db)
+        except Exception as e:
+            logger.warning("%s rebuild failed: %s", self.name, e)
+        finally:
+            db.close()
+            self._build_lock.release()
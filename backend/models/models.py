@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Boolean, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Boolean, Text, Index, UniqueConstraint
 from sqlalchemy.orm import relationship, Session
 from models.base import Base
 from datetime import datetime
@@ -8,6 +8,15 @@ import models  # ✅ 관계 매핑용 import
 
 
 
+# ✅ 지역 테이블 (시/도 2자리 코드, 시/군/구 5자리 코드 = 시/도 코드 + 순번, regions.py 에서 시드)
+class Region(Base):
+    __tablename__ = "regions"
+
+    code = Column(String(5), primary_key=True)
+    name = Column(String(50), nullable=False)
+    full_name = Column(String(100), nullable=False, unique=True)
+    parent_code = Column(String(5), ForeignKey("regions.code"), nullable=True, index=True)
+
 # ✅ 사용자 테이블
 class User(Base):
     __tablename__ = "users"
@@ -18,15 +27,21 @@ class User(Base):
     phone = Column(String(15), nullable=True)
     password_hash = Column(String(255), nullable=False)
     location = Column(String(255), nullable=True)
+    region_code = Column(String(5), ForeignKey("regions.code"), nullable=True, index=True)  # ✅ location 을 정규화한 지역 코드
     interests = Column(String(255), nullable=True)
     is_admin = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
+    interest_links = relationship("UserInterest", cascade="all, delete-orphan")
 
 # ✅ 업체 테이블 (수정됨)
 class Provider(Base):
     __tablename__ = "providers"
+    __table_args__ = (
+        # ✅ 승인 대기 업체 목록 (is_approved 필터 + created_at 정렬)
+        Index("ix_providers_is_approved_created_at", "is_approved", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
@@ -34,15 +49,22 @@ class Provider(Base):
     phone = Column(String(20), nullable=False)
     password_hash = Column(String(255))  # ✅ 이 줄 추가!
     service_area = Column(String(100), nullable=False)
+    region_code = Column(String(5), ForeignKey("regions.code"), nullable=True, index=True)  # ✅ service_area 를 정규화한 지역 코드
     service_name = Column(String(100), nullable=False)
     is_business = Column(Boolean, default=False)
     business_registration_number = Column(String(50), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    latitude = Column(Float, nullable=True)  # ✅ 업체 위치 (선택)
+    longitude = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     is_approved = Column(Boolean, default=False)  # ✅ 업체 승인 여부 필드 추가
 
 # ✅ 결제 테이블
 class Payment(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        # ✅ 내 결제 목록 (user_id 필터 + created_at 정렬)
+        Index("ix_payments_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -57,6 +79,14 @@ class Payment(Base):
 # ✅ 활동 신청(구독) 테이블
 class Subscription(Base):
     __tablename__ = "subscriptions"
+    __table_args__ = (
+        # ✅ 같은 활동 중복 신청 방지 (user_id 단독 조회도 이 인덱스로 처리)
+        UniqueConstraint("user_id", "activity_id", name="uq_subscriptions_user_activity"),
+        # ✅ 활동별 신청자 조회/집계
+        Index("ix_subscriptions_activity_id_user_id", "activity_id", "user_id"),
+        # ✅ 내 신청 목록 (user_id 필터 + created_at 정렬)
+        Index("ix_subscriptions_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -70,6 +100,11 @@ class Subscription(Base):
 # ✅ 알림 테이블
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # ✅ 사용자/업체 알림 목록 (수신자 필터 + created_at 정렬)
+        Index("ix_notifications_user_id_created_at", "user_id", "created_at"),
+        Index("ix_notifications_provider_id_created_at", "provider_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -83,20 +118,37 @@ class Notification(Base):
 # ✅ 수정된 Activity 클래스 (마감일 컬럼 추가됨)
 class Activity(Base):
     __tablename__ = "activities"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # ✅ 업체별 활동 목록 (provider_id 필터 + created_at 정렬)
+        Index("ix_activities_provider_id_created_at", "provider_id", "created_at"),
+        # ✅ 상태별 활동 조회 + 마감일 범위 조건
+        Index("ix_activities_status_deadline", "status", "deadline"),
+        # ✅ 관심사 필터/날씨 기반 추천 (관심사 id 조건 + 최신순)
+        Index("ix_activities_interest_id_created_at", "interest_id", "created_at"),
+        # ✅ 지역 필터 (코드 일치/접두어 조건 + 최신순)
+        Index("ix_activities_region_code_created_at", "region_code", "created_at"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     title = Column(String(100), nullable=False)
     description = Column(String(500), nullable=False)
     provider_id = Column(Integer, ForeignKey("providers.id"), nullable=False)
     min_participants = Column(Integer, nullable=False)
+    current_participants = Column(Integer, default=0, server_default="0", nullable=False)  # ✅ 신청자 수 (subscriptions 와 같은 트랜잭션에서 증감)
     price_per_person = Column(Float, nullable=False)
     interest_category = Column(String(100), nullable=True)
     interest_subcategory = Column(String(100), nullable=True)
+    interest_id = Column(Integer, ForeignKey("interests.id"), nullable=True)  # ✅ (interest_category, interest_subcategory) 에 해당하는 관심사
     region = Column(String(100), nullable=True)  # ✅ 이 줄을 새로 추가!
+    region_code = Column(String(5), ForeignKey("regions.code"), nullable=True)  # ✅ region (없으면 업체 service_area) 의 지역 코드
     status = Column(String(50), default="pending", nullable=False)
     deadline = Column(DateTime, nullable=True)  # ✅ 모집 마감일 컬럼 추가
-    created_at = Column(DateTime, default=datetime.utcnow)
+    minimum_notified_at = Column(DateTime, nullable=True)  # ✅ 최소 인원 도달 알림을 보낸 시각 (취소 후 다시 도달해도 알림은 한 번만)
+    latitude = Column(Float, nullable=True)  # ✅ 활동 장소 (없으면 업체 위치)
+    longitude = Column(Float, nullable=True)
+    geo_cell = Column(Integer, nullable=True, index=True)  # ✅ 주변 검색용 격자 셀 번호 (geo.geo_cell)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     provider = relationship("Provider")
 
@@ -122,7 +174,52 @@ class Admin(Base):
 
 class Interest(Base):
     __tablename__ = "interests"
+    __table_args__ = (
+        # ✅ 같은 분류/세부 관심사는 한 행 (분류 조건 조회도 이 인덱스로 처리)
+        UniqueConstraint("category", "subcategory", name="uq_interests_category_subcategory"),
+        Index("ix_interests_subcategory", "subcategory"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     category = Column(String(50), nullable=False)
     subcategory = Column(String(50), nullable=False)
+
+# ✅ 사용자 관심사 (users.interests 문자열을 관심사 id 로 정규화)
+class UserInterest(Base):
+    __tablename__ = "user_interests"
+    __table_args__ = (
+        # ✅ 관심사별 사용자 조회
+        Index("ix_user_interests_interest_id_user_id", "interest_id", "user_id"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    interest_id = Column(Integer, ForeignKey("interests.id", ondelete="CASCADE"), primary_key=True)
+
+# ✅ 리프레시 토큰 (원문은 클라이언트만 보관, DB 에는 sha256 만 저장)
+#    재발급마다 새 토큰으로 교체(rotation)하고, 같은 로그인에서 이어진 토큰은 family_id 로 묶음
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # ✅ 사용자/업체/관리자 삭제 시 토큰 일괄 폐기
+        Index("ix_refresh_tokens_subject_type_subject", "subject_type", "subject"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    token_hash = Column(String(64), nullable=False, unique=True)
+    family_id = Column(String(32), nullable=False, index=True)
+    subject_type = Column(String(20), nullable=False)  # user | provider | admin
+    subject = Column(String(100), nullable=False)  # 사용자는 이메일, 업체/관리자는 id
+    expires_at = Column(DateTime, nullable=False)
+    session_expires_at = Column(DateTime, nullable=False)  # 재발급해도 넘길 수 없는 로그인 최대 유지 시각
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+# ✅ 폐기(로그아웃)된 액세스 토큰 jti (인스턴스마다 revocation.py 의 Bloom filter 로 복제)
+#    revoked_at 은 증분 동기화 커서, 토큰 만료(expires_at)가 지나면 필터와 테이블에서 정리
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    jti = Column(String(32), nullable=False, unique=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -0,0 +1,136 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_, or_, select
+
+# ✅ 목록 API 기본/최대 페이지 크기
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
+
+
+# ✅ (정렬값, id) → 불투명 커서 문자열
+def encode_cursor(value, row_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+# ✅ 커서 문자열 → (정렬값, id), 정렬 컬럼 타입에 맞춰 복원 (sort_column 이 없으면 JSON 값 그대로)
+def decode_cursor(cursor: str, sort_column=None):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        value, row_id = json.loads(raw)
+        if value is not None and sort_column is not None and sort_column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+        return value, int(row_id)
+    except (ValueError, TypeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+
+# ✅ (sort_column, id) 기준 keyset 조건/정렬/limit 적용
+#    OFFSET 없이 마지막 행 다음부터 limit + 1 개만 읽어 다음 페이지 여부를 판단
+#    Query 와 select() 모두 filter/order_by/limit 를 지원하므로 동기/비동기 공용
+def apply_keyset(query, sort_column, id_column, cursor: Optional[str] = None,
+                 limit: int = DEFAULT_PAGE_LIMIT, descending: bool = True):
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort_column)
+        if descending:
+            query = query.filter(or_(
+                sort_column < value,
+                and_(sort_column == value, id_column < row_id)
+            ))
+        else:
+            query = query.filter(or_(
+                sort_column > value,
+                and_(sort_column == value, id_column > row_id)
+            ))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    return query.limit(limit + 1)
+
+
+# ✅ limit + 1 개로 읽은 행 → (이번 페이지 행, 다음 커서)
+def build_page(rows, sort_column, id_column, limit: int):
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return items, next_cursor
+
+
+# ✅ 동기 Session 용 keyset 페이지네이션
+def paginate(query, sort_column, id_column, cursor: Optional[str] = None,
+             limit: int = DEFAULT_PAGE_LIMIT, descending: bool = True):
+    rows = apply_keyset(query, sort_column, id_column, cursor, limit, descending).all()
+    return build_page(rows, sort_column, id_column, limit)
+
+
+# ✅ AsyncSession 용 keyset 페이지네이션 (stmt 는 select(Model))
+async def apaginate(db, stmt, sort_column, id_column, cursor: Optional[str] = None,
+                    limit: int = DEFAULT_PAGE_LIMIT, descending: bool = True):
+    result = await db.execute(apply_keyset(stmt, sort_column, id_column, cursor, limit, descending))
+    rows = result.scalars().all()
+    return build_page(rows, sort_column, id_column, limit)
+
+
+# ✅ 읽기 전용 목록의 빠른 경로: ORM 객체/pydantic 검증 없이 Core 행 → dict → orjson
+#    columns 는 응답 스키마 필드 순서대로, 정렬 컬럼이 응답에 없으면 커서용으로만 뒤에 붙여 읽는다.
+#    반환한 select() 에 필터를 더한 뒤 paginate_rows / apaginate_rows 로 넘김
+def row_select(columns, sort_column):
+    keys = [column.key for column in columns]
+    extra = [] if sort_column.key in keys else [sort_column]
+    return select(*columns, *extra), keys
+
+
+def rows_to_dicts(rows, keys):
+    return [dict(zip(keys, row)) for row in rows]
+
+
+# ✅ 동기 Session 용 keyset 페이지네이션 (dict 목록)
+def paginate_rows(db, stmt, keys, sort_column, id_column, cursor: Optional[str] = None,
+                  limit: int = DEFAULT_PAGE_LIMIT, descending: bool = True):
+    rows = db.execute(apply_keyset(stmt, sort_column, id_column, cursor, limit, descending)).all()
+    items, next_cursor = build_page(rows, sort_column, id_column, limit)
+    return rows_to_dicts(items, keys), next_cursor
+
+
+# ✅ AsyncSession 용 keyset 페이지네이션 (dict 목록)
+async def apaginate_rows(db, stmt, keys, sort_column, id_column, cursor: Optional[str] = None,
+                         limit: int = DEFAULT_PAGE_LIMIT, descending: bool = True):
+    rows = (await db.execute(apply_keyset(stmt, sort_column, id_column, cursor, limit, descending))).all()
+    items, next_cursor = build_page(rows, sort_column, id_column, limit)
+    return rows_to_dicts(items, keys), next_cursor
+
+
+# ✅ Page 응답을 response_model 검증/jsonable_encoder 없이 orjson 으로 바로 인코딩
+#    (라우터의 response_model 은 문서용으로 그대로 두고 이 응답을 반환)
+def page_response(items, next_cursor: Optional[str]) -> ORJSONResponse:
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor})
+
+
+# ✅ 메모리에서 순위를 매긴 결과 [(id, score), ...] (score 내림차순, id 내림차순) 페이지네이션
+#    커서는 keyset 과 같은 (score, id) 형식
+def paginate_ranked(results, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_LIMIT):
+    if cursor:
+        last_score, last_id = decode_cursor(cursor)
+        results = [
+            (row_id, score) for row_id, score in results
+            if score < last_score or (score == last_score and row_id < last_id)
+        ]
+
+    page = results[:limit]
+    next_cursor = None
+    if len(results) > limit:
+        last_id, last_score = page[-1]
+        next_cursor = encode_cursor(last_score, last_id)
+    return [row_id for row_id, _ in page], next_cursor
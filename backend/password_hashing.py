@@ -0,0 +1,196 @@
+import os
+import math
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+logger = logging.getLogger(__name__)
+
+# ✅ 비밀번호 해시/검증 전용 스레드풀
+#    bcrypt 는 CPU 를 오래 쓰므로 요청 스레드풀(Starlette 기본 40개)에서 돌리면 로그인 폭주 때
+#    다른 API 까지 스레드를 못 받아 같이 느려짐 → 워커 수를 제한한 별도 풀에서만 실행
+#    (bcrypt 는 해시 중 GIL 을 놓으므로 스레드로도 코어 수만큼 병렬 처리됨)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS") or min(4, os.cpu_count() or 1))
+# 실행 중인 작업 외에 대기열에 둘 수 있는 개수, 넘치면 503 + Retry-After 로 바로 거절
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+PASSWORD_HASH_RETRY_AFTER = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", "1"))
+
+# ✅ bcrypt cost 자동 보정: 해시 1회가 PASSWORD_HASH_TARGET_MS 를 넘지 않는 가장 큰 rounds
+#    BCRYPT_ROUNDS 를 지정하면 보정하지 않음. 검증은 해시에 기록된 rounds 를 쓰므로 기존 해시와 호환
+PASSWORD_HASH_TARGET_MS = float(os.getenv("PASSWORD_HASH_TARGET_MS", "250"))
+BCRYPT_ROUNDS = os.getenv("BCRYPT_ROUNDS")
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 14
+
+
+# ✅ 해시 풀 지표 (대기열 깊이, 대기/실행 시간, 거절 횟수)
+class HashPoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.run_ms_total = 0.0
+        self.run_ms_max = 0.0
+
+    def try_admit(self, capacity: int) -> bool:
+        with self._lock:
+            if self.queued + self.running >= capacity:
+                self.rejected += 1
+                return False
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+            return True
+
+    def release(self):
+        with self._lock:
+            self.queued -= 1
+
+    def record_start(self, wait_ms: float):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def record_finish(self, run_ms: float):
+        with self._lock:
+            self.running -= 1
+            self.completed += 1
+            self.run_ms_total += run_ms
+            self.run_ms_max = max(self.run_ms_max, run_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "queued": self.queued,
+                "running": self.running,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_ms_avg": round(self.wait_ms_total / self.completed, 3) if self.completed else 0.0,
+                "wait_ms_max": round(self.wait_ms_max, 3),
+                "run_ms_avg": round(self.run_ms_total / self.completed, 3) if self.completed else 0.0,
+                "run_ms_max": round(self.run_ms_max, 3),
+            }
+
+
+metrics = HashPoolMetrics()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+# ✅ 풀은 첫 해시/검증 때 생성 (콜드 스타트에서 제외)
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+    return _executor
+
+
+# ✅ rounds 10 으로 한 번 재 보고, rounds 가 1 늘 때마다 시간이 2배인 점으로 목표 rounds 계산
+def calibrate_rounds(target_ms: float = PASSWORD_HASH_TARGET_MS) -> int:
+    import bcrypt
+    started = time.perf_counter()
+    bcrypt.hashpw(b"calibration", bcrypt.gensalt(BCRYPT_MIN_ROUNDS))
+    base_ms = max((time.perf_counter() - started) * 1000, 0.001)
+    rounds = BCRYPT_MIN_ROUNDS + math.floor(math.log2(max(target_ms / base_ms, 1.0)))
+    rounds = max(BCRYPT_MIN_ROUNDS, min(rounds, BCRYPT_MAX_ROUNDS))
+    logger.info(f"✅ bcrypt rounds={rounds} (rounds {BCRYPT_MIN_ROUNDS} 해시 {base_ms:.1f}ms, 목표 {target_ms:.0f}ms)")
+    return rounds
+
+
+@lru_cache(maxsize=1)
+def bcrypt_rounds() -> int:
+    if BCRYPT_ROUNDS:
+        return int(BCRYPT_ROUNDS)
+    return calibrate_rounds()
+
+
+# ✅ passlib/bcrypt 는 첫 해시/검증 때 로드 (검증에는 보정이 필요 없으므로 rounds 는 해시 때 결정)
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+@lru_cache(maxsize=1)
+def get_bcrypt_hasher():
+    return get_pwd_context().handler("bcrypt").using(rounds=bcrypt_rounds())
+
+
+def _hash(password: str) -> str:
+    return get_bcrypt_hasher().hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def overloaded_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="요청이 많아 잠시 후 다시 시도해 주세요.",
+        headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER)},
+    )
+
+
+# ✅ 풀에 작업 제출 (실행 중 + 대기 중이 한도를 넘으면 503)
+def submit(fn, *args):
+    if not metrics.try_admit(PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE):
+        raise overloaded_exception()
+    submitted = time.perf_counter()
+
+    def run():
+        started = time.perf_counter()
+        metrics.record_start((started - submitted) * 1000)
+        try:
+            return fn(*args)
+        finally:
+            metrics.record_finish((time.perf_counter() - started) * 1000)
+
+    try:
+        return get_executor().submit(run)
+    except RuntimeError:
+        # 종료 중인 풀: 대기열에 올린 몫을 되돌리고 거절
+        metrics.release()
+        raise overloaded_exception()
+
+
+# ✅ 동기 라우터/crud 용: 요청 스레드는 결과만 기다리고 bcrypt 는 전용 풀에서 실행
+def hash_password(password: str) -> str:
+    return submit(_hash, password).result()
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return submit(_verify, plain_password, hashed_password).result()
+
+
+# ✅ async def 라우터용: 기다리는 동안 이벤트 루프를 양보하고 요청 스레드도 쓰지 않음
+async def hash_password_async(password: str) -> str:
+    return await asyncio.wrap_future(submit(_hash, password))
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.wrap_future(submit(_verify, plain_password, hashed_password))
+
+
+def get_hash_pool_metrics() -> dict:
+    return {
+        "workers": PASSWORD_HASH_WORKERS,
+        "max_queue": PASSWORD_HASH_MAX_QUEUE,
+        "bcrypt_rounds": bcrypt_rounds() if bcrypt_rounds.cache_info().currsize else None,
+        **metrics.snapshot(),
+    }
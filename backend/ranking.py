@@ -0,0 +1,279 @@
+import time
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import select
+from interests import INTEREST_OPTIONS, category_of
+from memory_index import RefreshingIndex, load_numpy
+from models.models import Activity, Provider
+from regions import parse_region
+
+# ✅ 점수 = 관심사/지역 특성 내적 + 최신 등록 가산점 + 마감 임박 가산점
+INTEREST_WEIGHT = 1.0
+REGION_WEIGHT = 0.8
+RECENCY_WEIGHT = 0.3
+RECENCY_HALF_LIFE_DAYS = 14.0
+DEADLINE_WEIGHT = 0.2
+DEADLINE_WINDOW_DAYS = 7.0
+
+# ✅ 활동 1건당 특성 슬롯: 분류, 세부 관심사, 시/도, 시/군/구
+FEATURE_SLOTS = 4
+
+OPEN_STATUSES = ("pending", "confirmed")
+
+CATEGORIES = frozenset(option["category"] for option in INTEREST_OPTIONS)
+
+
+def interest_features(category: Optional[str], subcategory: Optional[str]) -> dict:
+    features = {}
+    if category:
+        features[f"cat:{category.strip()}"] = INTEREST_WEIGHT
+    if subcategory:
+        features[f"sub:{subcategory.strip()}"] = INTEREST_WEIGHT
+    return features
+
+
+# ✅ 같은 지역 문자열이 반복되므로 파싱 결과 캐시 (반환 dict 는 수정하지 않음)
+@lru_cache(maxsize=4096)
+def region_features(text: Optional[str]) -> dict:
+    province, city = parse_region(text or "")
+    features = {}
+    if province:
+        features[f"prov:{province}"] = REGION_WEIGHT * 0.5
+        if city:
+            features[f"city:{province} {city}"] = REGION_WEIGHT
+    return features
+
+
+# ✅ 활동 특성 (지역은 활동 region, 없으면 업체 service_area)
+def activity_features(category, subcategory, region, service_area) -> dict:
+    return {**interest_features(category, subcategory), **region_features(region or service_area)}
+
+
+# ✅ 사용자 특성: interests 는 "분류, 세부 관심사, ..." 형식 (Signup.jsx)
+#    세부 관심사를 고르면 상위 분류에도 절반 가중치
+def user_features(interests: Optional[str], location: Optional[str]) -> dict:
+    features = {}
+    for token in (interests or "").split(","):
+        token = token.strip()
+        if not token:
+            continue
+        if token in CATEGORIES:
+            features[f"cat:{token}"] = INTEREST_WEIGHT
+        else:
+            features[f"sub:{token}"] = INTEREST_WEIGHT
+            parent = category_of(token)
+            if parent:
+                features.setdefault(f"cat:{parent}", INTEREST_WEIGHT * 0.5)
+    features.update(region_features(location))
+    return features
+
+
+# ✅ DB 의 시간은 UTC naive (datetime.utcnow) 기준
+def to_timestamp(value: Optional[datetime]) -> float:
+    if value is None:
+        return float("nan")
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+# ✅ 전체 빌드 시 교체하는 필드
+DATA_FIELDS = (
+    "_vocab", "_rows", "_size", "_capacity",
+    "_ids", "_feature_ids", "_weights", "_created", "_deadline", "_open",
+    "_postings", "_dirty", "_all_dirty",
+)
+
+
+# ✅ 활동 특성 희소 행렬
+#    - 슬롯 행렬 (slot x 활동): 활동별 feature id + weight, 활동 변경 시 해당 열만 덮어씀
+#    - 특성별 posting (활동 행 번호 배열 + weight 배열): 슬롯 행렬에서 만든 열 방향(CSC) 인덱스
+#    사용자 벡터와의 내적 = 사용자 특성(몇 개)의 posting 을 점수 배열에 더하는 numpy 연산
+class ActivityRanker(RefreshingIndex):
+    name = "activity ranker"
+
+    def __init__(self):
+        super().__init__()
+        self._vocab = {}     # feature 문자열 -> id
+        self._rows = {}      # activity_id -> 행 번호
+        self._size = 0
+        self._postings = {}    # feature id -> (rows, weights)
+        self._dirty = set()    # posting 을 다시 만들어야 하는 feature id
+        self._all_dirty = True
+        self._allocate(0)
+
+    def _allocate(self, capacity: int):
+        np = load_numpy()
+        self._capacity = capacity
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._feature_ids = np.full((FEATURE_SLOTS, capacity), -1, dtype=np.int32)
+        self._weights = np.zeros((FEATURE_SLOTS, capacity), dtype=np.float32)
+        self._created = np.zeros(capacity, dtype=np.float64)
+        self._deadline = np.full(capacity, np.nan, dtype=np.float64)
+        self._open = np.zeros(capacity, dtype=bool)
+
+    def _grow(self, needed: int):
+        np = load_numpy()
+        capacity = max(needed, self._capacity * 2, 1024)
+        old = (self._ids, self._feature_ids, self._weights, self._created, self._deadline, self._open)
+        self._allocate(capacity)
+        for new, prev in zip(
+            (self._ids, self._feature_ids, self._weights, self._created, self._deadline, self._open), old
+        ):
+            np.copyto(new[..., :prev.shape[-1]], prev)
+
+    def _feature_id(self, name: str) -> int:
+        feature_id = self._vocab.get(name)
+        if feature_id is None:
+            feature_id = self._vocab[name] = len(self._vocab)
+        return feature_id
+
+    def _set_row(self, activity_id, category, subcategory, region, service_area, status, created_at, deadline):
+        row = self._rows.get(activity_id)
+        if row is None:
+            if self._size >= self._capacity:
+                self._grow(self._size + 1)
+            row = self._rows[activity_id] = self._size
+            self._size += 1
+
+        features = list(activity_features(category, subcategory, region, service_area).items())[:FEATURE_SLOTS]
+        if not self._all_dirty:
+            self._dirty.update(int(f) for f in self._feature_ids[:, row] if f >= 0)
+        self._feature_ids[:, row] = -1
+        self._weights[:, row] = 0
+        for slot, (name, weight) in enumerate(features):
+            feature_id = self._feature_id(name)
+            self._feature_ids[slot, row] = feature_id
+            self._weights[slot, row] = weight
+            if not self._all_dirty:
+                self._dirty.add(feature_id)
+
+        self._ids[row] = activity_id
+        self._created[row] = to_timestamp(created_at)
+        self._deadline[row] = to_timestamp(deadline)
+        self._open[row] = status in OPEN_STATUSES
+
+    def source_query(self, min_id: int = 0):
+        return (
+            select(
+                Activity.id, Activity.interest_category, Activity.interest_subcategory, Activity.region,
+                Provider.service_area, Activity.status, Activity.created_at, Activity.deadline
+            )
+            .outerjoin(Provider, Activity.provider_id == Provider.id)
+            .where(Activity.id > min_id)
+            .order_by(Activity.id)
+        )
+
+    # ✅ 전체 빌드: ORM 객체 없이 필요한 컬럼만 읽어 새 행렬을 만든 뒤 한 번에 교체
+    def load_rows(self, rows):
+        fresh = ActivityRanker()
+        fresh._allocate(max(len(rows), 1024))
+        for row in rows:
+            fresh._set_row(*row)
+        with self._lock:
+            for name in DATA_FIELDS:
+                setattr(self, name, getattr(fresh, name))
+
+    def add_rows(self, rows):
+        for row in rows:
+            self._set_row(*row)
+
+    # ✅ 이 인스턴스에서 활동이 생성/수정되면 해당 행만 갱신 (빌드 전이면 다음 빌드에 포함되므로 무시)
+    def upsert(self, activity: Activity):
+        if not self._built:
+            return
+        service_area = activity.provider.service_area if not activity.region and activity.provider else None
+        with self._lock:
+            self._set_row(
+                activity.id, activity.interest_category, activity.interest_subcategory, activity.region,
+                service_area, activity.status, activity.created_at, activity.deadline
+            )
+
+    # ✅ posting 갱신: 전체 빌드 직후에는 정렬 한 번으로 모든 특성, 이후에는 바뀐 특성만
+    def _refresh_postings(self, feature_ids):
+        np = load_numpy()
+        n = self._size
+        if self._all_dirty:
+            flat = self._feature_ids[:, :n].ravel()
+            weights = self._weights[:, :n].ravel()
+            rows = np.tile(np.arange(n, dtype=np.int32), FEATURE_SLOTS)
+            valid = flat >= 0
+            flat, weights, rows = flat[valid], weights[valid], rows[valid]
+            order = np.argsort(flat, kind="stable")
+            flat, weights, rows = flat[order], weights[order], rows[order]
+            keys, starts = np.unique(flat, return_index=True)
+            ends = np.append(starts[1:], len(flat))
+            self._postings = {
+                int(key): (rows[start:end], weights[start:end]) for key, start, end in zip(keys, starts, ends)
+            }
+            self._dirty.clear()
+            self._all_dirty = False
+            return
+
+        for feature_id in feature_ids:
+            if feature_id in self._dirty:
+                slots, rows = np.nonzero(self._feature_ids[:, :n] == feature_id)
+                self._postings[feature_id] = (rows.astype(np.int32), self._weights[slots, rows])
+                self._dirty.discard(feature_id)
+
+    def rank(self, features: dict, limit: int, exclude_ids=(), now: Optional[float] = None) -> list:
+        np = load_numpy()
+        now = now if now is not None else time.time()
+        with self._lock:
+            n = self._size
+            if n == 0:
+                return []
+
+            user_vector = {
+                self._vocab[name]: weight for name, weight in features.items() if name in self._vocab
+            }
+            self._refresh_postings(user_vector.keys())
+
+            # 관심사/지역 내적: 사용자 특성마다 해당 활동들에 (사용자 weight x 활동 weight) 가산
+            scores = np.zeros(n, dtype=np.float64)
+            for feature_id, weight in user_vector.items():
+                rows, activity_weights = self._postings.get(feature_id, ((), ()))
+                if len(rows):
+                    scores[rows] += weight * activity_weights
+
+            age_days = (now - self._created[:n]) / 86400.0
+            scores += RECENCY_WEIGHT * np.exp2(-np.clip(age_days, 0, None) / RECENCY_HALF_LIFE_DAYS)
+
+            days_left = (self._deadline[:n] - now) / 86400.0
+            has_deadline = ~np.isnan(days_left)
+            closing = np.where(has_deadline, np.clip(1.0 - days_left / DEADLINE_WINDOW_DAYS, 0.0, 1.0), 0.0)
+            scores += DEADLINE_WEIGHT * closing
+
+            eligible = self._open[:n] & ~(has_deadline & (days_left < 0))
+            if exclude_ids:
+                eligible &= ~np.isin(self._ids[:n], np.fromiter(exclude_ids, dtype=np.int64))
+            scores[~eligible] = -np.inf
+
+            k = min(limit, int(eligible.sum()))
+            if k == 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return self._ids[top].tolist()
+
+
+activity_ranker = None
+_ranker_lock = threading.Lock()
+
+
+def get_activity_ranker() -> ActivityRanker:
+    global activity_ranker
+    if activity_ranker is None:
+        with _ranker_lock:
+            if activity_ranker is None:
+                activity_ranker = ActivityRanker()
+    return activity_ranker
+
+
+# ✅ crud 에서 활동 변경 후 호출 (랭커가 아직 없으면 아무것도 하지 않음)
+def on_activity_changed(activity: Activity):
+    if activity_ranker is not None:
+        activity_ranker.upsert(activity)
@@ -0,0 +1,114 @@
+import json
+import time
+import logging
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+import crud
+import weather_service
+from interests import subcategories_for_setting
+from schemas import ActivityResponse
+
+logger = logging.getLogger(__name__)
+
+# ✅ 도시별 추천 결과는 1시간 단위로 캐시
+RECOMMEND_CACHE_TTL = 60 * 60
+RECOMMEND_MAX_ITEMS = 20
+
+# ✅ 날씨/미세먼지 조건 → (실내/야외, 우선 추천 세부 관심사)
+#    frontend/src/utils/recommendUtils.js 의 추천 목록을 interestOptions 세부 관심사로 옮긴 것
+RECOMMEND_RULES = {
+    "very_bad_air": ("indoor", ["요가", "독서 모임", "컴퓨터/인터넷 기초", "플로리스트", "공예 소품 만들기", "도예"]),
+    "rain": ("indoor", ["플로리스트", "건강식 요리", "도예", "요가", "공예 소품 만들기", "책 출판하기"]),
+    "snow": ("indoor", ["스트레칭", "디지털 사진 편집", "영상 편집 배우기", "독서 모임", "자서전 쓰기"]),
+    "clouds_bad_air": ("indoor", ["공예 소품 만들기", "독서 모임", "플로리스트"]),
+    "clouds": ("outdoor", ["걷기", "스마트폰 사진 촬영", "커피 모임"]),
+    "clear_bad_air": ("indoor", ["요가", "플로리스트", "공예 소품 만들기"]),
+    "clear": ("outdoor", ["걷기", "등산", "텃밭 가꾸기", "반려견 산책 모임", "스마트폰 사진 촬영", "파크골프"]),
+    "other": ("indoor", ["독서 모임", "공예 소품 만들기", "뜨개질"]),
+}
+
+# ✅ 이전 캐시 값처럼 condition 이 없을 때 설명(lang=kr)으로 판단
+DESCRIPTION_KEYWORDS = [
+    ("rain", ("비", "소나기", "뇌우", "rain", "drizzle", "thunderstorm")),
+    ("snow", ("눈", "진눈깨비", "snow")),
+    ("clouds", ("구름", "흐림", "clouds")),
+    ("clear", ("맑음", "clear")),
+]
+
+
+def weather_condition(current: dict) -> str:
+    condition = (current.get("condition") or "").lower()
+    if condition in ("rain", "drizzle", "thunderstorm"):
+        return "rain"
+    if condition in ("snow", "clouds", "clear"):
+        return condition
+    if condition:
+        return "other"
+
+    description = (current.get("weather") or "").lower()
+    for name, keywords in DESCRIPTION_KEYWORDS:
+        if any(keyword in description for keyword in keywords):
+            return name
+    return "other"
+
+
+# ✅ 날씨 응답 → 추천 규칙 이름
+def recommend_rule(weather: dict) -> str:
+    pm10 = weather.get("air", {}).get("pm10") or 0
+    if pm10 > 150:
+        return "very_bad_air"
+
+    condition = weather_condition(weather["current"])
+    if condition in ("clouds", "clear") and pm10 > 80:
+        return f"{condition}_bad_air"
+    return condition
+
+
+def recommend_cache_key(city: str, hour: Optional[int] = None) -> str:
+    hour = hour if hour is not None else int(time.time() // 3600)
+    return f"recommend:{weather_service.normalize_city(city)}:{hour}"
+
+
+def build_recommendation(db: Session, city: str) -> dict:
+    weather = weather_service.get_full_weather(city)
+    rule = recommend_rule(weather)
+    setting, preferred = RECOMMEND_RULES[rule]
+
+    # 우선 추천 세부 관심사로 먼저 채우고, 부족하면 같은 실내/야외 분류의 다른 세부 관심사로 채움
+    activities = crud.get_open_activities_by_subcategories(db, preferred, RECOMMEND_MAX_ITEMS)
+    if len(activities) < RECOMMEND_MAX_ITEMS:
+        others = [sub for sub in subcategories_for_setting(setting) if sub not in preferred]
+        activities += crud.get_open_activities_by_subcategories(
+            db, others, RECOMMEND_MAX_ITEMS - len(activities), exclude_ids=[a.id for a in activities]
+        )
+
+    return {
+        "city": city,
+        "condition": rule,
+        "setting": setting,
+        "pm10": weather.get("air", {}).get("pm10"),
+        "subcategories": preferred,
+        # 공유 캐시에 JSON 으로 저장할 수 있도록 응답 스키마 기준으로 직렬화
+        "items": [json.loads(ActivityResponse.from_orm(a).json()) for a in activities],
+    }
+
+
+# ✅ /activities/recommended 진입점 (도시 + 시간 단위 캐시)
+def get_recommended_activities(db: Session, city: str, limit: int) -> dict:
+    key = recommend_cache_key(city)
+    try:
+        cached = weather_service.cache_backend.get(key)
+    except Exception as e:
+        logger.warning("recommendation cache read failed (%s): %s", key, e)
+        cached = None
+
+    if cached is None:
+        cached = build_recommendation(db, city)
+        try:
+            weather_service.cache_backend.set(key, cached, ttl=RECOMMEND_CACHE_TTL)
+        except Exception as e:
+            logger.warning("recommendation cache write failed (%s): %s", key, e)
+
+    return {**cached, "city": city, "items": cached["items"][:limit]}
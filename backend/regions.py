@@ -0,0 +1,304 @@
+from functools import lru_cache
+from typing import Optional
+
+# ✅ 지원 지역 목록 (frontend/src/utils/regions.js 의 regionOptions 와 동일하게 유지)
+REGION_OPTIONS = [
+    {
+        "province": "강원특별자치도",
+        "cities": [
+            "고성군", "동해시", "삼척시", "속초시", "양구군", "양양군",
+            "영월군", "원주시", "인제군", "정선군", "철원군", "춘천시",
+            "태백시", "평창군", "홍천군", "화천군",
+        ]
+    },
+    {
+        "province": "경기도",
+        "cities": [
+            "가평군", "고양시", "과천시", "광명시", "광주시", "구리시",
+            "군포시", "김포시", "남양주시", "동두천시", "부천시", "성남시",
+            "수원시", "시흥시", "안산시", "안성시", "안양시", "양주시",
+            "양평군", "여주시", "연천군", "오산시", "용인시", "의왕시",
+            "의정부시", "이천시", "파주시", "평택시", "포천시", "하남시",
+            "화성시",
+        ]
+    },
+    {
+        "province": "경상남도",
+        "cities": [
+            "거제시", "거창군", "고성군", "김해시", "남해군", "밀양시",
+            "사천시", "산청군", "양산시", "의령군", "진주시", "창녕군",
+            "창원시", "통영시", "하동군", "함안군", "함양군", "합천군",
+        ]
+    },
+    {
+        "province": "경상북도",
+        "cities": [
+            "경산시", "경주시", "고령군", "구미시", "김천시", "문경시",
+            "봉화군", "상주시", "성주군", "안동시", "영덕군", "영양군",
+            "영주시", "영천시", "예천군", "울릉군", "울진군", "의성군",
+            "청도군", "청송군", "칠곡군", "포항시",
+        ]
+    },
+    {
+        "province": "광주광역시",
+        "cities": [
+            "광산구", "남구", "동구", "북구", "서구",
+        ]
+    },
+    {
+        "province": "대구광역시",
+        "cities": [
+            "남구", "달서구", "달성군", "동구", "북구", "서구",
+            "수성구", "중구",
+        ]
+    },
+    {
+        "province": "대전광역시",
+        "cities": [
+            "대덕구", "동구", "서구", "유성구", "중구",
+        ]
+    },
+    {
+        "province": "부산광역시",
+        "cities": [
+            "강서구", "금정구", "기장군", "남구", "동구", "동래구",
+            "부산진구", "북구", "사상구", "사하구", "서구", "수영구",
+            "연제구", "영도구", "중구", "해운대구",
+        ]
+    },
+    {
+        "province": "세종특별자치시",
+        "cities": [
+            "고운동", "금남면", "나성동", "다정동", "대평동", "도담동",
+            "반곡동", "보람동", "부강면", "새롬동", "소담동", "소정면",
+            "아름동", "연기면", "연동면", "연서면", "전동면", "전의면",
+            "조치원읍", "종촌동", "한솔동",
+        ]
+    },
+    {
+        "province": "울산광역시",
+        "cities": [
+            "남구", "동구", "북구", "울주군", "중구",
+        ]
+    },
+    {
+        "province": "인천광역시",
+        "cities": [
+            "강화군", "계양구", "남동구", "동구", "미추홀구", "부평구",
+            "서구", "연수구", "옹진군", "중구",
+        ]
+    },
+    {
+        "province": "전라남도",
+        "cities": [
+            "강진군", "고흥군", "곡성군", "광양시", "구례군", "나주시",
+            "담양군", "목포시", "무안군", "보성군", "순천시", "신안군",
+            "여수시", "영광군", "영암군", "완도군", "장성군", "장흥군",
+            "진도군", "함평군", "해남군", "화순군",
+        ]
+    },
+    {
+        "province": "전북특별자치도",
+        "cities": [
+            "고창군", "군산시", "김제시", "남원시", "무주군", "부안군",
+            "순창군", "완주군", "익산시", "임실군", "장수군", "전주시",
+            "정읍시", "진안군",
+        ]
+    },
+    {
+        "province": "제주특별자치도",
+        "cities": [
+            "서귀포시", "제주시",
+        ]
+    },
+    {
+        "province": "충청남도",
+        "cities": [
+            "계룡시", "공주시", "금산군", "논산시", "당진시", "보령시",
+            "부여군", "서산시", "서천군", "아산시", "예산군", "천안시",
+            "청양군", "태안군", "홍성군",
+        ]
+    },
+    {
+        "province": "충청북도",
+        "cities": [
+            "괴산군", "단양군", "보은군", "옥천군", "음성군", "영동군",
+            "제천시", "증평군", "진천군", "청주시", "충주시",
+        ]
+    },
+    {
+        "province": "서울특별시",
+        "cities": [
+            "강남구", "강동구", "강북구", "강서구", "관악구", "광진구",
+            "구로구", "금천구", "노원구", "도봉구", "동대문구", "동작구",
+            "마포구", "서대문구", "서초구", "성동구", "성북구", "송파구",
+            "양천구", "영등포구", "용산구", "은평구", "종로구", "중구",
+            "중랑구",
+        ]
+    },
+]
+
+# ✅ 홈 화면 기본 날씨 도시 (frontend/src/pages/home.jsx)
+DEFAULT_WEATHER_CITY = "Seoul"
+
+
+# ✅ 날씨 미리 받아둘 지역 목록 ("서울특별시 중구" 처럼 시/도까지 붙인 이름)
+#    중구/동구/서구/고성군 등은 여러 시/도에 있으므로 구/군 이름만으로는 합치거나 조회하지 않음
+def weather_prefetch_cities() -> list:
+    return [DEFAULT_WEATHER_CITY] + [f"{province} {city}" for province, city in REGION_CODES]
+
+
+# ✅ "시/도 시/군/구" 이름 → (시/도, 시/군/구) (정확히 그 형태가 아니면 None)
+def find_weather_region(city: str):
+    return WEATHER_REGIONS.get(" ".join(city.split()))
+
+
+# ✅ OpenWeather 지오코딩 결과의 state(영문)로 시/도를 확인하기 위한 키워드 (소문자, 하나라도 포함되면 일치)
+PROVINCE_GEOCODE_STATES = {
+    "강원특별자치도": ("gangwon",),
+    "경기도": ("gyeonggi",),
+    "경상남도": ("gyeongsangnam", "south gyeongsang"),
+    "경상북도": ("gyeongsangbuk", "north gyeongsang"),
+    "광주광역시": ("gwangju",),
+    "대구광역시": ("daegu",),
+    "대전광역시": ("daejeon",),
+    "부산광역시": ("busan",),
+    "세종특별자치시": ("sejong",),
+    "울산광역시": ("ulsan",),
+    "인천광역시": ("incheon",),
+    "전라남도": ("jeollanam", "south jeolla"),
+    "전북특별자치도": ("jeollabuk", "jeonbuk", "north jeolla"),
+    "제주특별자치도": ("jeju",),
+    "충청남도": ("chungcheongnam", "south chungcheong"),
+    "충청북도": ("chungcheongbuk", "north chungcheong"),
+    "서울특별시": ("seoul",),
+}
+
+
+# ✅ 시/도 줄임말 (사용자 입력 "서울 강남구", "경기 수원시" 등)
+PROVINCE_ALIASES = {
+    "강원특별자치도": ("강원도", "강원"),
+    "경기도": ("경기",),
+    "경상남도": ("경남",),
+    "경상북도": ("경북",),
+    "광주광역시": ("광주",),
+    "대구광역시": ("대구",),
+    "대전광역시": ("대전",),
+    "부산광역시": ("부산",),
+    "세종특별자치시": ("세종시", "세종"),
+    "울산광역시": ("울산",),
+    "인천광역시": ("인천",),
+    "전라남도": ("전남",),
+    "전북특별자치도": ("전라북도", "전북"),
+    "제주특별자치도": ("제주도", "제주"),
+    "충청남도": ("충남",),
+    "충청북도": ("충북",),
+    "서울특별시": ("서울시", "서울"),
+}
+
+
+# ✅ 시/도 찾기: 정식 이름은 문자열 어디에 있어도 되지만, 줄임말은 맨 앞 단어일 때만 인정
+#    (줄임말을 부분 문자열로 찾으면 "부산광역시 해운대구" 의 "해운대구" 안 "대구" 처럼 잘못 잡힘)
+def find_province(text: str):
+    for region in REGION_OPTIONS:
+        if region["province"] in text:
+            return region["province"]
+    tokens = text.split()
+    if not tokens:
+        return None
+    for province, aliases in PROVINCE_ALIASES.items():
+        if tokens[0] in aliases:
+            return province
+    return None
+
+
+# ✅ 자유 입력 지역 문자열 → (시/도, 시/군/구) (못 찾으면 None)
+#    시/도가 없으면 가장 긴 일치 이름이 한 곳에만 있을 때만 시/도를 추정 ("강남구" 는 "남구" 보다 우선)
+def parse_region(text: str):
+    if not text:
+        return None, None
+
+    province = find_province(text)
+    candidates = [r for r in REGION_OPTIONS if province is None or r["province"] == province]
+    matches = [
+        (r["province"], city)
+        for r in candidates for city in r["cities"]
+        if city in text
+    ]
+    if province is not None:
+        if matches:
+            return province, max(matches, key=lambda m: len(m[1]))[1]
+        return province, None
+    longest = max((len(city) for _, city in matches), default=0)
+    matches = [m for m in matches if len(m[1]) == longest]
+    if len(matches) == 1:
+        return matches[0]
+    return None, None
+
+
+# ✅ 시/도 코드 (행정구역 시도 코드 2자리)
+SIDO_CODES = {
+    "서울특별시": "11",
+    "부산광역시": "26",
+    "대구광역시": "27",
+    "인천광역시": "28",
+    "광주광역시": "29",
+    "대전광역시": "30",
+    "울산광역시": "31",
+    "세종특별자치시": "36",
+    "경기도": "41",
+    "충청북도": "43",
+    "충청남도": "44",
+    "전라남도": "46",
+    "경상북도": "47",
+    "경상남도": "48",
+    "제주특별자치도": "50",
+    "강원특별자치도": "51",
+    "전북특별자치도": "52",
+}
+
+
+# ✅ 시/군/구 코드 = 시/도 코드 + REGION_OPTIONS 목록 순번 3자리 ("11" + "001")
+#    regions 테이블에 시드된 값이므로 새 시/군/구는 목록 끝에 추가해야 기존 코드가 바뀌지 않음
+#    시/도 코드가 앞자리이므로 "시/도 전체" 필터는 코드 접두어(LIKE '11%')로 처리
+def sigungu_code(province: str, index: int) -> str:
+    return f"{SIDO_CODES[province]}{index + 1:03d}"
+
+
+# ✅ regions 테이블 시드 행 [{code, name, full_name, parent_code}]
+def region_rows() -> list:
+    rows = []
+    for region in REGION_OPTIONS:
+        province = region["province"]
+        rows.append({"code": SIDO_CODES[province], "name": province, "full_name": province, "parent_code": None})
+        for index, city in enumerate(region["cities"]):
+            rows.append({
+                "code": sigungu_code(province, index),
+                "name": city,
+                "full_name": f"{province} {city}",
+                "parent_code": SIDO_CODES[province],
+            })
+    return rows
+
+
+REGION_CODES = {
+    (region["province"], city): sigungu_code(region["province"], index)
+    for region in REGION_OPTIONS for index, city in enumerate(region["cities"])
+}
+
+WEATHER_REGIONS = {f"{province} {city}": (province, city) for province, city in REGION_CODES}
+
+
+def is_sido_code(code: str) -> bool:
+    return len(code) == 2
+
+
+# ✅ 자유 입력 지역 문자열 → 지역 코드 (시/군/구까지 찾으면 5자리, 시/도만 찾으면 2자리, 못 찾으면 None)
+@lru_cache(maxsize=4096)
+def region_code(text: str) -> Optional[str]:
+    province, city = parse_region(text or "")
+    if province is None:
+        return None
+    if city is None:
+        return SIDO_CODES[province]
+    return REGION_CODES[(province, city)]
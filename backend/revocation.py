@@ -0,0 +1,112 @@
+import os
+import math
+import hashlib
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from memory_index import RefreshingIndex
+from models.models import RevokedToken
+
+# ✅ 폐기 토큰 필터 설정
+#    다른 인스턴스에서 폐기한 토큰은 REVOCATION_SYNC_SECONDS 안에 반영 (이 인스턴스의 폐기는 즉시)
+#    Bloom filter 는 지울 수 없으므로 REVOCATION_REBUILD_SECONDS 마다 만료 안 된 jti 로 다시 만듦
+#    id 는 커밋이 아니라 INSERT 때 정해져 늦게 커밋된 행이 id 커서 뒤로 밀릴 수 있으므로
+#    증분 동기화는 지금까지 본 가장 늦은 revoked_at 에서 REVOCATION_SYNC_MARGIN_SECONDS 만큼 겹쳐 다시 읽음
+REVOCATION_SYNC_SECONDS = int(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+REVOCATION_SYNC_MARGIN_SECONDS = int(os.getenv("REVOCATION_SYNC_MARGIN_SECONDS", "60"))
+REVOCATION_REBUILD_SECONDS = int(os.getenv("REVOCATION_REBUILD_SECONDS", "600"))
+REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+REVOCATION_BLOOM_FP_RATE = float(os.getenv("REVOCATION_BLOOM_FP_RATE", "0.001"))
+
+
+# ✅ Bloom filter: "없음" 은 확실, "있음" 은 FP_RATE 확률로 틀릴 수 있음
+#    비트 수 m = -n ln p / (ln 2)^2, 해시 수 k = m / n ln 2 (blake2b 128비트를 둘로 나눈 이중 해싱)
+class BloomFilter:
+    def __init__(self, capacity: int, fp_rate: float):
+        self.size = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+# ✅ revoked_tokens 테이블을 Bloom filter 로 복제한 인덱스
+#    인증 요청은 필터만 보고, 필터가 "있음" 일 때만 jti 로 정확히 조회 (auth_utils.ensure_not_revoked)
+class RevocationIndex(RefreshingIndex):
+    name = "revocation filter"
+    new_sync_seconds = REVOCATION_SYNC_SECONDS
+    rebuild_seconds = REVOCATION_REBUILD_SECONDS
+
+    def __init__(self):
+        super().__init__()
+        self._filter = BloomFilter(REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_FP_RATE)
+        self._latest_revoked_at = None
+
+    def source_query(self, min_id: int = 0):
+        return (
+            select(RevokedToken.id, RevokedToken.jti, RevokedToken.revoked_at)
+            .where(RevokedToken.id > min_id, RevokedToken.expires_at > datetime.utcnow())
+            .order_by(RevokedToken.id)
+        )
+
+    # ✅ id 대신 revoked_at 으로 증분 동기화 (겹쳐 읽은 jti 는 다시 넣어도 필터가 그대로)
+    def sync_query(self):
+        query = self.source_query()
+        if self._latest_revoked_at is not None:
+            since = self._latest_revoked_at - timedelta(seconds=REVOCATION_SYNC_MARGIN_SECONDS)
+            query = query.where(RevokedToken.revoked_at >= since)
+        return query
+
+    def _track_revoked_at(self, rows):
+        latest = max((row.revoked_at for row in rows if row.revoked_at is not None), default=None)
+        if latest is not None and (self._latest_revoked_at is None or latest > self._latest_revoked_at):
+            self._latest_revoked_at = latest
+
+    # 폐기 토큰이 용량을 넘으면 다음 전체 빌드 때 2배 크기로 (오탐률 유지)
+    def load_rows(self, rows):
+        bloom = BloomFilter(max(REVOCATION_BLOOM_CAPACITY, 2 * len(rows)), REVOCATION_BLOOM_FP_RATE)
+        for row in rows:
+            bloom.add(row.jti)
+        with self._lock:
+            self._filter = bloom
+            self._latest_revoked_at = None
+            self._track_revoked_at(rows)
+
+    def add_rows(self, rows):
+        for row in rows:
+            if row.jti not in self._filter:
+                self._filter.add(row.jti)
+        self._track_revoked_at(rows)
+
+    # ✅ 이 인스턴스에서 폐기한 jti 는 바로 반영 (동기화 커서는 건드리지 않아 다른 인스턴스 행도 놓치지 않음)
+    def add(self, jti: str):
+        with self._lock:
+            self._filter.add(jti)
+
+    def might_contain(self, jti: str) -> bool:
+        return jti in self._filter
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "built": self._built,
+                "entries": self._filter.count,
+                "bits": self._filter.size,
+                "hashes": self._filter.hashes,
+            }
+
+
+revocation_index = RevocationIndex()
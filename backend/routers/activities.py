@@ -1,12 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import crud
-from schemas import ActivityCreate, ActivityResponse, ActivityUpdate, ActivityDeadlineUpdate
-from models.models import Provider, Notification, Subscription
-from auth_utils import get_current_provider
-from database import get_db
-from datetime import datetime
-from typing import Optional
+import crud_async
+import geo
+import recommendation
+import suggest
+from schemas import (
+    ActivityCreate, ActivityResponse, ActivityUpdate, ActivityDeadlineUpdate, Page,
+    RecommendedActivities, NearbyActivity
+)
+from models.models import Provider, User
+from auth_utils import get_current_provider, get_current_user
+from database import get_db, get_async_db
+from pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, page_response
+from typing import Optional, List
 
 router = APIRouter(prefix="/activities")
 
@@ -22,19 +31,69 @@ def create_activity(
     activity.provider_id = current_provider.id
     return crud.create_activity(db, activity)
 
-# ✅ 활동 목록 조회
-@router.get("/", response_model=list[ActivityResponse])
-def read_activities(
+# ✅ 활동 목록 조회 (Core 행 → dict → orjson 빠른 경로)
+@router.get("/", response_model=Page[ActivityResponse], response_class=ORJSONResponse)
+async def read_activities(
     region: Optional[str] = None,
     interest: Optional[str] = None,
+    q: Optional[str] = Query(None, max_length=100),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # q 가 있으면 제목/설명/관심사 검색 결과를 관련도순으로, 없으면 최신순
+    items, next_cursor = await crud_async.get_activity_rows_with_filter(db, region, interest, cursor, limit, q)
+    return page_response(items, next_cursor)
+
+# ✅ 날씨 기반 추천 활동 (도시 + 시간 단위 캐시, /{activity_id} 보다 먼저 등록)
+@router.get("/recommended", response_model=RecommendedActivities)
+def read_recommended_activities(
+    city: str,
+    limit: int = Query(6, ge=1, le=recommendation.RECOMMEND_MAX_ITEMS),
     db: Session = Depends(get_db)
 ):
-    return crud.get_activities_with_filter(db, region, interest)
+    return recommendation.get_recommended_activities(db, city, limit)
+
+# ✅ 내 관심사/지역 기반 맞춤 활동 (/{activity_id} 보다 먼저 등록)
+@router.get("/for-me", response_model=List[ActivityResponse])
+def read_activities_for_me(
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return crud.get_activities_for_user(db, current_user, limit)
+
+# ✅ 주변 모집 중 활동 (가까운 순, /{activity_id} 보다 먼저 등록)
+@router.get("/nearby", response_model=Page[NearbyActivity])
+def read_nearby_activities(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(geo.NEARBY_DEFAULT_RADIUS_KM, gt=0, le=geo.NEARBY_MAX_RADIUS_KM),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    db: Session = Depends(get_db)
+):
+    results, next_cursor = crud.get_nearby_activities(db, lat, lon, radius_km, cursor, limit)
+    items = [
+        NearbyActivity(**ActivityResponse.from_orm(activity).dict(), distance_km=round(distance, 3))
+        for activity, distance in results
+    ]
+    return {"items": items, "next_cursor": next_cursor}
+
+# ✅ 활동/관심사 자동완성 (초성 입력 지원, 예: "ㅇㄱ" → "요가")
+@router.get("/suggest")
+def suggest_activities(
+    prefix: str = Query(..., min_length=1, max_length=50),
+    limit: int = Query(suggest.SUGGEST_DEFAULT_LIMIT, ge=1, le=suggest.SUGGEST_MAX_LIMIT),
+    db: Session = Depends(get_db)
+):
+    suggest.suggest_index.ensure_fresh(db)
+    return suggest.suggest_index.suggest(prefix, limit)
 
 # ✅ 활동 상세 조회
 @router.get("/{activity_id}", response_model=ActivityResponse)
-def read_activity(activity_id: int, db: Session = Depends(get_db)):
-    db_activity = crud.get_activity_by_id(db, activity_id)
+async def read_activity(activity_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_activity = await crud_async.get_activity_by_id(db, activity_id)
     if not db_activity:
         raise HTTPException(status_code=404, detail="활동을 찾을 수 없습니다.")
     return db_activity
@@ -67,34 +126,8 @@ def confirm_activity(
     current_provider: Provider = Depends(get_current_provider),
     db: Session = Depends(get_db)
 ):
-    result = crud.confirm_activity(db, activity_id, current_provider.id)
-
-    if result is None:
-        raise HTTPException(status_code=404, detail="활동을 찾을 수 없습니다.")
-    if result == "unauthorized":
-        raise HTTPException(status_code=403, detail="해당 활동을 확정할 권한이 없습니다.")
-    if result == "already_confirmed":
-        raise HTTPException(status_code=400, detail="이미 확정된 활동입니다.")
-    if result == "not_enough_participants":
-        raise HTTPException(status_code=400, detail="참여 인원이 부족하여 확정할 수 없습니다.")
-
-    # ✅ 사용자에게 알림 발송
-    subscriptions = db.query(Subscription).filter(
-        Subscription.activity_id == activity_id
-    ).distinct(Subscription.user_id).all()
-
-    for sub in subscriptions:
-        if sub.user_id:
-            notification = Notification(
-                user_id=sub.user_id,
-                message="모집하신 활동이 확정되었습니다! 결제를 진행해주세요.",
-                is_read=False,
-                created_at=datetime.utcnow()
-            )
-            db.add(notification)
-
-    db.commit()
-    return result
+    # ✅ 상태 변경과 신청자 알림 발송은 crud.confirm_activity 에서 한 번에 처리
+    return crud.confirm_activity(db, activity_id, current_provider.id)
 
 # ✅ 활동 모집 취소
 @router.patch("/{activity_id}/cancel", response_model=ActivityResponse)
@@ -1,19 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, get_pool_metrics
+from pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, page_response
 from models.models import User, Provider, Activity, CustomInterest, Admin, Interest, Notification
-from auth_utils import get_current_admin
+from auth_utils import get_current_admin, invalidate_user, invalidate_provider
+from password_hashing import get_hash_pool_metrics
 from schemas import (
     CustomInterestResponse, GroupInterestsRequest,
     UserResponse, ProviderOut, ProviderPendingResponse,
-    InterestOut, InterestCreate
+    InterestOut, InterestCreate, Page
 )
 import crud
-from fastapi.responses import StreamingResponse
+import suggest
+from fastapi.responses import StreamingResponse, ORJSONResponse
 import io
 import csv
 from sqlalchemy import func
 from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -37,6 +41,7 @@ def approve_provider(
 
     provider.is_approved = True
     db.commit()
+    invalidate_provider(provider.id)
     db.refresh(provider)
 
     notification = Notification(
@@ -50,38 +55,50 @@ def approve_provider(
     return provider
 
 # ✅ 2. 승인 대기 업체 조회
-@router.get("/pending-providers", response_model=list[ProviderPendingResponse])
+@router.get("/pending-providers", response_model=Page[ProviderPendingResponse])
 def get_pending_providers(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
     db: Session = Depends(get_db),
     current_admin: Admin = Depends(get_current_admin)
 ):
     check_admin(current_admin)
-    pending = db.query(Provider).filter(Provider.is_approved == False).order_by(Provider.created_at.desc()).all()
-    return pending
+    items, next_cursor = crud.get_pending_providers(db, cursor, limit)
+    return {"items": items, "next_cursor": next_cursor}
 
-# ✅ 3. 사용자 전체 조회 (검색/정렬 지원)
-@router.get("/users", response_model=list[UserResponse])
+# ✅ 3. 사용자 전체 조회 (검색/정렬 지원, Core 행 → dict → orjson 빠른 경로)
+@router.get("/users", response_model=Page[UserResponse], response_class=ORJSONResponse)
 def get_all_users(
     db: Session = Depends(get_db),
     current_admin: Admin = Depends(get_current_admin),
     search: str = Query("", description="검색어"),
     sort: str = Query("created_at", description="정렬 기준"),
-    order: str = Query("desc", description="정렬 방향")
+    order: str = Query("desc", description="정렬 방향"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서"),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT)
 ):
     check_admin(current_admin)
-    return crud.get_users_with_filters(db, search=search, sort=sort, order=order)
+    items, next_cursor = crud.get_user_rows_with_filters(
+        db, search=search, sort=sort, order=order, cursor=cursor, limit=limit
+    )
+    return page_response(items, next_cursor)
 
 # ✅ 4. 공급자 전체 조회 (검색/정렬 지원)
-@router.get("/providers", response_model=list[ProviderOut])
+@router.get("/providers", response_model=Page[ProviderOut])
 def get_all_providers(
     db: Session = Depends(get_db),
     current_admin: Admin = Depends(get_current_admin),
     search: str = Query("", description="검색어"),
     sort: str = Query("created_at", description="정렬 기준"),
-    order: str = Query("desc", description="정렬 방향")
+    order: str = Query("desc", description="정렬 방향"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서"),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT)
 ):
     check_admin(current_admin)
-    return crud.get_providers_with_filters(db, search=search, sort=sort, order=order)
+    items, next_cursor = crud.get_providers_with_filters(
+        db, search=search, sort=sort, order=order, cursor=cursor, limit=limit
+    )
+    return {"items": items, "next_cursor": next_cursor}
 
 # ✅ 5. 사용자 삭제
 @router.delete("/users/{user_id}")
@@ -97,7 +114,9 @@ def delete_user(
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
 
     db.delete(user)
+    crud.revoke_subject_refresh_tokens(db, "user", user.email)
     db.commit()
+    invalidate_user(user.email)
     return {"message": f"사용자 '{user.name}' 삭제 완료."}
 
 # ✅ 6. 관리자 대시보드 요약 통계
@@ -118,27 +137,61 @@ def get_summary_stats(
         "total_admins": total_admins
     }
 
+# ✅ CSV 내보내기 컬럼 파싱 (쉼표 구분, 미지정 시 전체)
+def parse_export_columns(columns: Optional[str], allowed: list[str]) -> list[str]:
+    if not columns:
+        return allowed
+    selected = [c.strip() for c in columns.split(",") if c.strip()]
+    unknown = [c for c in selected if c not in allowed]
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"내보낼 수 없는 컬럼입니다: {', '.join(unknown)}")
+    return selected
+
+# ✅ CSV 스트리밍 생성기
+#    요청 세션(get_db)을 그대로 이어 쓰므로 커넥션 1개 풀(DB_POOL_MODE=single)에서도 두 번째 커넥션을 기다리지 않는다.
+#    get_db 가 응답 전에 세션을 닫아도 세션은 다시 쓸 수 있고, 다 내보낸 뒤 여기서 한 번 더 닫는다.
+#    행 묶음마다 CSV 조각을 만들어 바로 내보내므로 메모리는 batch 크기만큼만 사용한다.
+def stream_csv(db: Session, model, columns: list[str], search: str, sort: str, order: str):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    try:
+        writer.writerow(columns)
+        for rows in crud.stream_export_rows(db, model, columns, search=search, sort=sort, order=order):
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
+# ✅ DB 커넥션 풀 점유/대기 지표
+@router.get("/stats/db-pool")
+def get_db_pool_stats(current_admin: Admin = Depends(get_current_admin)):
+    check_admin(current_admin)
+    return get_pool_metrics()
+
+# ✅ 비밀번호 해시 풀 대기열/거절 지표
+@router.get("/stats/password-hashing")
+def get_password_hashing_stats(current_admin: Admin = Depends(get_current_admin)):
+    check_admin(current_admin)
+    return get_hash_pool_metrics()
+
 # ✅ 7. 사용자 CSV 다운로드
 @router.get("/users/download")
 def download_users_csv(
     db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin)
+    current_admin: Admin = Depends(get_current_admin),
+    columns: Optional[str] = Query(None, description="내보낼 컬럼 (쉼표 구분)"),
+    search: str = Query("", description="검색어"),
+    sort: str = Query("created_at", description="정렬 기준"),
+    order: str = Query("desc", description="정렬 방향")
 ):
     check_admin(current_admin)
+    selected = parse_export_columns(columns, crud.USER_EXPORT_COLUMNS)
 
-    users = db.query(User).all()
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["id", "name", "email", "phone", "location", "interests"])
-
-    for user in users:
-        writer.writerow([
-            user.id, user.name, user.email, user.phone, user.location, user.interests
-        ])
-
-    output.seek(0)
-    return StreamingResponse(output, media_type="text/csv", headers={
+    return StreamingResponse(stream_csv(db, User, selected, search, sort, order), media_type="text/csv", headers={
         "Content-Disposition": "attachment; filename=users.csv"
     })
 
@@ -146,27 +199,16 @@ def download_users_csv(
 @router.get("/providers/download")
 def download_providers_csv(
     db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_admin)
+    current_admin: Admin = Depends(get_current_admin),
+    columns: Optional[str] = Query(None, description="내보낼 컬럼 (쉼표 구분)"),
+    search: str = Query("", description="검색어"),
+    sort: str = Query("created_at", description="정렬 기준"),
+    order: str = Query("desc", description="정렬 방향")
 ):
     check_admin(current_admin)
+    selected = parse_export_columns(columns, crud.PROVIDER_EXPORT_COLUMNS)
 
-    providers = db.query(Provider).all()
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow([
-        "id", "name", "email", "phone", "service_area",
-        "service_name", "is_business", "business_registration_number", "is_approved"
-    ])
-
-    for p in providers:
-        writer.writerow([
-            p.id, p.name, p.email, p.phone, p.service_area,
-            p.service_name, p.is_business, p.business_registration_number, p.is_approved
-        ])
-
-    output.seek(0)
-    return StreamingResponse(output, media_type="text/csv", headers={
+    return StreamingResponse(stream_csv(db, Provider, selected, search, sort, order), media_type="text/csv", headers={
         "Content-Disposition": "attachment; filename=providers.csv"
     })
 
@@ -234,6 +276,7 @@ def delete_custom_interest(
         raise HTTPException(status_code=404, detail="해당 관심사를 찾을 수 없습니다.")
     db.delete(interest)
     db.commit()
+    suggest.suggest_index.remove_custom_interest(interest)
 
 # ✅ 13. 공식 관심사 추가
 @router.post("/interests", response_model=InterestOut)
@@ -244,13 +287,23 @@ def create_official_interest(
 ):
     check_admin(current_admin)
 
+    exists = db.query(Interest.id).filter(
+        Interest.category == interest_data.category,
+        Interest.subcategory == interest_data.subcategory
+    ).first()
+    if exists:
+        raise HTTPException(status_code=400, detail="이미 등록된 관심사입니다.")
+
     new_interest = Interest(
         category=interest_data.category,
         subcategory=interest_data.subcategory
     )
     db.add(new_interest)
+    db.flush()
+    crud.link_activities_to_interest(db, new_interest)
     db.commit()
     db.refresh(new_interest)
+    suggest.suggest_index.upsert_interest(new_interest)
 
     return InterestOut.from_orm(new_interest)
 
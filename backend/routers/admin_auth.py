@@ -1,27 +1,29 @@
 from fastapi import APIRouter, HTTPException, Depends, Body
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 
-from database import get_db
+from database import get_db, get_async_db
 from models.models import Admin
 from schemas import AdminLoginRequest, AdminSignupRequest, TokenResponse
-from auth_utils import create_admin_access_token
+import crud_async
+from auth_utils import create_admin_access_token, get_password_hash, verify_password_async
 
 router = APIRouter(prefix="/admin", tags=["Admin Login"])
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # ✅ 관리자 로그인
 @router.post("/login", response_model=TokenResponse)
-def admin_login(login_req: AdminLoginRequest = Body(...), db: Session = Depends(get_db)):
-    admin = db.query(Admin).filter(Admin.email == login_req.email).first()
+async def admin_login(login_req: AdminLoginRequest = Body(...), db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Admin).where(Admin.email == login_req.email))
+    admin = result.scalars().first()
     if not admin:
         raise HTTPException(status_code=401, detail="이메일이 존재하지 않습니다.")
-    if not pwd_context.verify(login_req.password, admin.password_hash):
+    if not await verify_password_async(login_req.password, admin.password_hash):
         raise HTTPException(status_code=401, detail="비밀번호가 일치하지 않습니다.")
 
     token = create_admin_access_token({"sub": str(admin.id)})
-    return {"access_token": token, "token_type": "bearer"}
+    refresh_token = await crud_async.create_refresh_token(db, "admin", str(admin.id))
+    return {"access_token": token, "token_type": "bearer", "refresh_token": refresh_token}
 
 # ✅ 관리자 회원가입
 @router.post("/signup")
@@ -32,7 +34,7 @@ def admin_signup(request: AdminSignupRequest, db: Session = Depends(get_db)):
 
     new_admin = Admin(
         email=request.email,
-        password_hash=pwd_context.hash(request.password)
+        password_hash=get_password_hash(request.password)
     )
     db.add(new_admin)
     db.commit()
@@ -1,44 +1,84 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from models.models import User, Provider, Admin
-from database import get_db  # ✅ get_db 가져오기
-from auth_utils import get_current_user, create_access_token, create_admin_access_token, verify_password
-from passlib.context import CryptContext
-from schemas import TokenResponse, UserResponse
+from database import get_db, get_async_db  # ✅ get_db 가져오기
+from auth_utils import (
+    get_current_user_async, create_access_token, create_admin_access_token, verify_password_async, issue_access_token,
+    decode_revocable_token, oauth2_scheme
+)
+from schemas import TokenResponse, UserResponse, RefreshTokenRequest
+import crud_async
 from datetime import datetime, timedelta
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # ✅ 사용자 로그인 (JWT 발급)
+#    로그인 라우터는 async: bcrypt 검증을 전용 풀에서 기다리는 동안 요청 스레드풀을 점유하지 않음
 @router.post("/login", response_model=TokenResponse)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(User).where(User.email == form_data.username))
+    user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=400, detail="이메일이 존재하지 않습니다.")
-    if not user.password_hash or not verify_password(form_data.password, user.password_hash):
+    if not user.password_hash or not await verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(status_code=400, detail="비밀번호가 일치하지 않습니다.")
 
     access_token = create_access_token(data={"sub": user.email})
-    return {"access_token": access_token, "token_type": "bearer"}
+    refresh_token = await crud_async.create_refresh_token(db, "user", user.email)
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
 
 # ✅ 현재 로그인한 사용자 정보
 @router.get("/me", response_model=UserResponse)
-def read_current_user(current_user: User = Depends(get_current_user)):
+async def read_current_user(current_user: User = Depends(get_current_user_async)):
     return current_user
 
 # ✅ 업체 로그인용 API
 @router.post("/provider-login", response_model=TokenResponse)
-def provider_login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    provider = db.query(Provider).filter(Provider.email == form_data.username).first()
+async def provider_login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Provider).where(Provider.email == form_data.username))
+    provider = result.scalars().first()
     if not provider:
         raise HTTPException(status_code=400, detail="업체를 찾을 수 없습니다.")
-    if not verify_password(form_data.password, provider.password_hash):
+    if not await verify_password_async(form_data.password, provider.password_hash):
         raise HTTPException(status_code=400, detail="비밀번호가 일치하지 않습니다.")
 
-    access_token = create_access_token(data={"sub": provider.id})
-    return {"access_token": access_token, "token_type": "bearer"}
+    access_token = create_access_token(data={"sub": str(provider.id)})
+    refresh_token = await crud_async.create_refresh_token(db, "provider", str(provider.id))
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+# ✅ 액세스 토큰 재발급 (bcrypt 검증 없이 리프레시 토큰 해시 조회 한 번, 리프레시 토큰도 새로 교체)
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh_access_token(request: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
+    result = await crud_async.rotate_refresh_token(db, request.refresh_token)
+    if result == "expired":
+        raise HTTPException(status_code=401, detail="로그인이 만료되었습니다. 다시 로그인해 주세요.")
+    if isinstance(result, str):
+        raise HTTPException(status_code=401, detail="유효하지 않은 리프레시 토큰입니다.")
+
+    refresh_token, previous = result
+    access_token = issue_access_token(previous.subject_type, previous.subject)
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+# ✅ 로그아웃 (이 로그인에서 발급된 리프레시 토큰 전부 폐기)
+@router.post("/revoke", status_code=204)
+async def revoke_refresh_token(request: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
+    await crud_async.revoke_refresh_token(db, request.refresh_token)
+
+# ✅ 로그아웃 (사용자/업체/관리자 공용): 지금 쓰는 액세스 토큰을 폐기하고, 리프레시 토큰을 보내면 그 로그인도 폐기
+@router.post("/logout", status_code=204)
+async def logout(
+    request: Optional[RefreshTokenRequest] = None,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    jti, expires_at = decode_revocable_token(token)
+    await crud_async.revoke_access_token(db, jti, expires_at)
+    if request is not None:
+        await crud_async.revoke_refresh_token(db, request.refresh_token)
 
 # ✅ 관리자 인증 함수
 def get_current_admin(request: Request, db: Session = Depends(get_db)) -> Admin:
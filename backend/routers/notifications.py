@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
+from typing import Optional
 
-from database import get_db
+import crud_async
+from database import get_db, get_async_db
+from pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, page_response
 from models.models import Notification
-from schemas import NotificationCreate, NotificationResponse
-from auth_utils import get_current_user, get_current_provider
+from schemas import NotificationCreate, NotificationResponse, Page
+from auth_utils import get_current_user_async, get_current_provider_async
 
 router = APIRouter(
     prefix="/notifications",
@@ -26,38 +31,36 @@ def create_notification(notification: NotificationCreate, db: Session = Depends(
     db.refresh(new_notification)
     return new_notification
 
-# 2️⃣ 사용자 본인 알림 조회
-@router.get("/me", response_model=list[NotificationResponse])
-def get_notifications(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    notifications = db.query(Notification).filter(
-        Notification.user_id == current_user.id
-    ).order_by(Notification.created_at.desc()).all()
-    return notifications
+# 2️⃣ 사용자 본인 알림 조회 (Core 행 → dict → orjson 빠른 경로)
+@router.get("/me", response_model=Page[NotificationResponse], response_class=ORJSONResponse)
+async def get_notifications(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async)
+):
+    items, next_cursor = await crud_async.get_user_notification_rows(db, current_user.id, cursor, limit)
+    return page_response(items, next_cursor)
 
 # 3️⃣ 알림 읽음 처리
 @router.patch("/{notification_id}/read", response_model=NotificationResponse)
-def mark_notification_as_read(notification_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    notification = db.query(Notification).filter(
-        Notification.id == notification_id,
-        Notification.user_id == current_user.id
-    ).first()
-    
+async def mark_notification_as_read(
+    notification_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async)
+):
+    notification = await crud_async.mark_notification_as_read(db, notification_id, current_user.id)
     if not notification:
         raise HTTPException(status_code=404, detail="알림을 찾을 수 없습니다.")
-    
-    notification.is_read = True
-    db.commit()
-    db.refresh(notification)
     return notification
 
 # 4️⃣ provider 본인 알림 조회
-@router.get("/provider/me", response_model=list[NotificationResponse])
-def get_notifications_for_provider_me(
-    db: Session = Depends(get_db),
-    current_provider=Depends(get_current_provider)
+@router.get("/provider/me", response_model=Page[NotificationResponse])
+async def get_notifications_for_provider_me(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+    current_provider=Depends(get_current_provider_async)
 ):
-    notifications = db.query(Notification).filter(
-        Notification.provider_id == current_provider.id
-    ).order_by(Notification.created_at.desc()).all()
-
-    return notifications
+    items, next_cursor = await crud_async.get_provider_notifications(db, current_provider.id, cursor, limit)
+    return {"items": items, "next_cursor": next_cursor}
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+import crud
 from database import get_db
+from pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
 from models.models import Payment, Activity
-from schemas import PaymentCreate, PaymentResponse
+from schemas import PaymentCreate, PaymentResponse, Page
 from auth_utils import get_current_user  # ✅ JWT에서 사용자 정보 가져오기
 import datetime
+from typing import Optional
 
 router = APIRouter(
     prefix="/payments",
@@ -40,10 +43,15 @@ def get_payment(payment_id: int, db: Session = Depends(get_db)):
     return payment
 
 # ✅ 내 결제 목록 조회 API (JWT 적용)
-@router.get("/", response_model=list[PaymentResponse])
-def get_user_payments(db: Session = Depends(get_db), user=Depends(get_current_user)):
-    payments = db.query(Payment).filter(Payment.user_id == user.id).all()
-    return payments
+@router.get("/", response_model=Page[PaymentResponse])
+def get_user_payments(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user)
+):
+    items, next_cursor = crud.get_user_payments(db, user.id, cursor, limit)
+    return {"items": items, "next_cursor": next_cursor}
 
 # ✅ 결제 완료 API
 @router.put("/{payment_id}/complete", response_model=PaymentResponse)
@@ -1,24 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import crud
+import crud_async
+import regions
 from schemas import (
     ProviderCreate, ProviderUpdate, ProviderResponse,
     ActivityParticipantsResponse, ActivityResponse
 )
-from auth_utils import get_current_provider, create_access_token, verify_password
-from database import get_db
+from auth_utils import (
+    get_current_provider, get_current_provider_async, create_access_token, verify_password_async, get_password_hash,
+    invalidate_provider
+)
+from database import get_db, get_async_db
 from models.models import Provider
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
 
 router = APIRouter()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # ✅ 로그인한 provider 본인 정보 확인 API
 @router.get("/providers/me", response_model=ProviderResponse)
-def read_current_provider(current_provider: Provider = Depends(get_current_provider)):
+async def read_current_provider(current_provider: Provider = Depends(get_current_provider_async)):
     return current_provider
 
 # ✅ 로그인한 provider의 활동 목록 조회
@@ -34,7 +38,7 @@ def get_activities_by_provider(provider_id: int, db: Session = Depends(get_db)):
 # ✅ 업체 등록
 @router.post("/providers/", response_model=ProviderResponse)
 def create_provider(provider: ProviderCreate, db: Session = Depends(get_db)):
-    hashed_password = pwd_context.hash(provider.password)
+    hashed_password = get_password_hash(provider.password)
     db_provider = Provider(
         name=provider.name,
         email=provider.email,
@@ -42,6 +46,9 @@ def create_provider(provider: ProviderCreate, db: Session = Depends(get_db)):
         phone=provider.phone,
         password_hash=hashed_password,
         service_area=provider.service_area,
+        region_code=regions.region_code(provider.service_area),
+        latitude=provider.latitude,
+        longitude=provider.longitude,
         is_business=provider.is_business,
         business_registration_number=provider.business_registration_number,
     )
@@ -81,17 +88,20 @@ def get_activity_participants(provider_id: int, db: Session = Depends(get_db)):
 
 # ✅ 업체 로그인 API - JWT 토큰 발급
 @router.post("/providers/login")
-def provider_login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    provider = crud.get_provider_by_email(db, form_data.username)
+async def provider_login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Provider).where(Provider.email == form_data.username))
+    provider = result.scalars().first()
     if not provider:
         raise HTTPException(status_code=401, detail="존재하지 않는 이메일입니다.")
-    if not verify_password(form_data.password, provider.password_hash):
+    if not await verify_password_async(form_data.password, provider.password_hash):
         raise HTTPException(status_code=401, detail="비밀번호가 일치하지 않습니다.")
 
-    access_token = create_access_token(data={"sub": provider.id})
+    access_token = create_access_token(data={"sub": str(provider.id)})
+    refresh_token = await crud_async.create_refresh_token(db, "provider", str(provider.id))
     return {
         "access_token": access_token,
         "token_type": "bearer",
+        "refresh_token": refresh_token,
         "provider": {
             "id": provider.id,
             "name": provider.name,
@@ -108,5 +118,7 @@ def get_provider_activities_with_counts_api(provider_id: int, db: Session = Depe
 @router.delete("/providers/me", response_model=dict)
 def delete_current_provider(db: Session = Depends(get_db), current_provider: Provider = Depends(get_current_provider)):
     db.delete(current_provider)
+    crud.revoke_subject_refresh_tokens(db, "provider", current_provider.id)
     db.commit()
+    invalidate_provider(current_provider.id)
     return {"message": "업체 탈퇴 완료"}
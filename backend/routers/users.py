@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 import crud
 from database import get_db  # ✅ get_db 직접 import
-from auth_utils import get_current_user  # ✅ 로그인 유저 의존성 주입
+from auth_utils import get_current_user, get_current_user_async  # ✅ 로그인 유저 의존성 주입
 from schemas import UserCreate, UserResponse, UserUpdate, CustomInterestCreate  # ✅ schemas import
 from models.models import CustomInterest
 
@@ -18,7 +18,7 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
 
 # ✅ 현재 로그인한 사용자 정보 조회 API
 @router.get("/me", response_model=UserResponse)
-def read_users_me(current_user = Depends(get_current_user)):
+async def read_users_me(current_user = Depends(get_current_user_async)):
     return current_user
 
 # ✅ 사용자 ID로 조회 API
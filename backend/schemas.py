@@ -1,8 +1,15 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field
+from pydantic.generics import GenericModel
+from typing import Optional, List, Generic, TypeVar
 from datetime import datetime
 from datetime import date
 
+T = TypeVar("T")
+
+# ✅ 커서 기반 목록 응답 모델 (next_cursor 가 없으면 마지막 페이지)
+class Page(GenericModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
 
 
 # ✅ 사용자 관련 모델
@@ -50,6 +57,8 @@ class ProviderBase(BaseModel):
     phone: str
     service_area: str
     service_name: str
+    latitude: Optional[float] = Field(None, ge=-90, le=90)  # ✅ 업체 위치 (선택)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class ProviderCreate(ProviderBase):
     password: str  # ✅ 입력 받을 때만 필요
@@ -60,6 +69,8 @@ class ProviderUpdate(BaseModel):
     name: Optional[str] = None
     phone: Optional[str] = None
     service_area: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class ProviderResponse(ProviderBase):
     id: int
@@ -78,6 +89,8 @@ class ActivityBase(BaseModel):
     interest_subcategory: Optional[str] = None  # ✅ 추가
     deadline: Optional[date] = None  # ✅ 여기에 추가 필요!
     region: Optional[str] = None  # ✅ 이 줄 추가
+    latitude: Optional[float] = Field(None, ge=-90, le=90)  # ✅ 활동 장소 (없으면 업체 위치)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class ActivityCreate(ActivityBase):
     status: Optional[str] = "pending"
@@ -85,10 +98,24 @@ class ActivityCreate(ActivityBase):
 class ActivityResponse(ActivityBase):
     id: int
     status: str
+    current_participants: int = 0
 
     class Config:
         orm_mode = True
 
+# ✅ 주변 활동 (가까운 순)
+class NearbyActivity(ActivityResponse):
+    distance_km: float
+
+# ✅ 날씨 기반 추천 활동
+class RecommendedActivities(BaseModel):
+    city: str
+    condition: str
+    setting: str  # indoor | outdoor
+    pm10: Optional[int] = None
+    subcategories: List[str]
+    items: List[ActivityResponse]
+
 # ✅ 결제 관련 모델
 class PaymentBase(BaseModel):
     activity_id: int
@@ -113,6 +140,7 @@ class TokenRequest(BaseModel):
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
 
 # ✅ 구독(참여 신청) 관련 모델
 class SubscriptionCreate(BaseModel):
@@ -152,6 +180,8 @@ class ActivityUpdate(BaseModel):
     min_participants: Optional[int] = None
     price_per_person: Optional[float] = None
     status: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 # ✅ 로그인용 모델
 class ProviderLogin(BaseModel):
@@ -201,6 +231,11 @@ class AdminLoginRequest(BaseModel):
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+
+# ✅ 토큰 재발급/로그아웃 요청 (로그인 때 받은 refresh_token)
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1, max_length=255)
 
 # ✅ 사용자 주관식 관심사 조회용 스키마
 class CustomInterestOut(BaseModel):
@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+import anyio
+import anyio.to_thread
+
+# ✅ backend 경로를 sys.path에 추가 (crud, database import 용)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BASE_DIR))
+
+import crud
+import crud_async
+from database import SessionLocal, AsyncSessionLocal, async_engine
+from bench_utils import percentile
+
+# ✅ Starlette 가 동기 라우터에 쓰는 기본 스레드풀 크기
+STARLETTE_THREADPOOL_SIZE = 40
+
+
+def sync_request(activity_id: int):
+    """동기 라우터 1회: 스레드 하나가 세션을 열고 조회가 끝날 때까지 점유"""
+    db = SessionLocal()
+    try:
+        crud.get_activity_by_id(db, activity_id)
+        crud.get_activities_with_filter(db)
+    finally:
+        db.close()
+
+
+async def async_request(activity_id: int):
+    """비동기 라우터 1회: DB 응답을 기다리는 동안 이벤트 루프를 양보"""
+    async with AsyncSessionLocal() as db:
+        await crud_async.get_activity_by_id(db, activity_id)
+        await crud_async.get_activities_with_filter(db)
+
+
+async def run(label, make_call, requests: int, concurrency: int):
+    latencies = []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            started = time.perf_counter()
+            await make_call()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<6} {requests / elapsed:8.1f} req/s  "
+        f"p50={percentile(latencies, 0.50):7.1f}ms  p99={percentile(latencies, 0.99):7.1f}ms"
+    )
+
+
+async def main_async(args):
+    limiter = anyio.CapacityLimiter(STARLETTE_THREADPOOL_SIZE)
+
+    async def sync_call():
+        await anyio.to_thread.run_sync(sync_request, args.activity_id, limiter=limiter)
+
+    async def async_call():
+        await async_request(args.activity_id)
+
+    print(f"요청 {args.requests}건, 동시성 {args.concurrency}, 스레드풀 {STARLETTE_THREADPOOL_SIZE}")
+    await run("sync", sync_call, args.requests, args.concurrency)
+    await run("async", async_call, args.requests, args.concurrency)
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="활동 조회를 동기 세션(스레드풀)과 AsyncSession 으로 각각 실행해 처리량/지연을 비교합니다.")
+    parser.add_argument("--requests", type=int, default=2000, help="경로별 총 요청 수")
+    parser.add_argument("--concurrency", type=int, default=200, help="동시 요청 수")
+    parser.add_argument("--activity-id", type=int, default=1, help="상세 조회에 쓸 활동 id")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+# ✅ 명시적으로 실행될 때만 실행
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import uuid
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# ✅ backend 경로를 sys.path에 추가 (crud, database import 용)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BASE_DIR))
+
+import crud
+from database import SessionLocal
+from models.models import User, Provider, Activity, Subscription, Notification
+from bench_utils import percentile
+
+
+def setup(n: int, min_participants: int):
+    """벤치마크용 업체 1개, 활동 1개, 사용자 n명 생성"""
+    tag = uuid.uuid4().hex[:8]
+    db = SessionLocal()
+    try:
+        provider = Provider(
+            name=f"bench-{tag}", email=f"bench-{tag}@example.com", phone="000",
+            password_hash="x", service_area="bench", service_name="bench", is_approved=True
+        )
+        db.add(provider)
+        db.flush()
+        activity = Activity(
+            title=f"bench-{tag}", description="concurrent subscribe benchmark",
+            provider_id=provider.id, min_participants=min_participants,
+            price_per_person=0, status="pending"
+        )
+        db.add(activity)
+        users = [
+            User(name=f"bench-{tag}-{i}", email=f"bench-{tag}-{i}@example.com", password_hash="x")
+            for i in range(n)
+        ]
+        db.add_all(users)
+        db.commit()
+        return provider.id, activity.id, [u.id for u in users]
+    finally:
+        db.close()
+
+
+def subscribe(user_id: int, activity_id: int):
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        result = crud.create_subscription(db, user_id=user_id, activity_id=activity_id)
+        ok = result is not None and not isinstance(result, str)
+    except Exception:
+        db.rollback()
+        ok = False
+    finally:
+        db.close()
+    return ok, (time.perf_counter() - started) * 1000
+
+
+def teardown(provider_id: int, activity_id: int, user_ids):
+    db = SessionLocal()
+    try:
+        db.query(Notification).filter(Notification.provider_id == provider_id).delete(synchronize_session=False)
+        db.query(Subscription).filter(Subscription.activity_id == activity_id).delete(synchronize_session=False)
+        db.query(Activity).filter(Activity.id == activity_id).delete(synchronize_session=False)
+        db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+        db.query(Provider).filter(Provider.id == provider_id).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="한 활동에 N건의 동시 신청을 보내고 카운터/알림 정합성과 지연 시간을 측정합니다.")
+    parser.add_argument("-n", type=int, default=200, help="동시 신청 수")
+    parser.add_argument("--workers", type=int, default=16, help="동시 실행 스레드 수")
+    parser.add_argument("--min-participants", type=int, default=None, help="최소 인원 (기본값: n // 2)")
+    parser.add_argument("--keep", action="store_true", help="벤치마크 데이터 삭제하지 않음")
+    args = parser.parse_args()
+
+    min_participants = args.min_participants or max(1, args.n // 2)
+    provider_id, activity_id, user_ids = setup(args.n, min_participants)
+
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(lambda uid: subscribe(uid, activity_id), user_ids))
+        elapsed = time.perf_counter() - started
+
+        db = SessionLocal()
+        try:
+            counter = db.query(Activity.current_participants).filter(Activity.id == activity_id).scalar()
+            actual = db.query(Subscription).filter(Subscription.activity_id == activity_id).count()
+            notifications = db.query(Notification).filter(Notification.provider_id == provider_id).count()
+        finally:
+            db.close()
+
+        latencies = [ms for _, ms in results]
+        succeeded = sum(1 for ok, _ in results if ok)
+        print(f"신청 {args.n}건 / 스레드 {args.workers}개 / 최소 인원 {min_participants}명")
+        print(f"성공 {succeeded}건, 총 {elapsed:.2f}s, {succeeded / elapsed:.1f} req/s")
+        print(f"지연 p50={percentile(latencies, 0.50):.1f}ms p99={percentile(latencies, 0.99):.1f}ms")
+        print(f"카운터={counter} 실제 신청 수={actual} 업체 알림={notifications}")
+
+        expected_notifications = 1 if succeeded >= min_participants else 0
+        if counter != actual or notifications != expected_notifications:
+            print("❌ 정합성 오류")
+            sys.exit(1)
+        print("✅ 카운터와 알림이 정확합니다.")
+    finally:
+        if not args.keep:
+            teardown(provider_id, activity_id, user_ids)
+
+
+# ✅ 명시적으로 실행될 때만 실행
+if __name__ == "__main__":
+    main()
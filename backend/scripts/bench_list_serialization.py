@@ -0,0 +1,170 @@
+import os
+import sys
+import time
+import uuid
+import asyncio
+import argparse
+import statistics
+import tracemalloc
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# ✅ backend 경로를 sys.path에 추가 (crud, database import 용)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BASE_DIR))
+
+import crud
+import crud_async
+from database import SessionLocal, AsyncSessionLocal, get_async_engine
+from models.models import User, Provider, Activity, Notification
+from pagination import page_response
+from schemas import Page, ActivityResponse, UserResponse, NotificationResponse
+
+
+def setup(n: int):
+    """벤치마크용 업체 1개, 활동/사용자 n개, 첫 사용자의 알림 n개 생성"""
+    tag = uuid.uuid4().hex[:8]
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        provider = Provider(
+            name=f"bench-{tag}", email=f"bench-{tag}@example.com", phone="000",
+            password_hash="x", service_area="bench", service_name="bench", is_approved=True
+        )
+        db.add(provider)
+        db.flush()
+        db.add_all([
+            Activity(
+                title=f"bench-{tag} 활동 {i}", description="목록 직렬화 벤치마크", provider_id=provider.id,
+                min_participants=3, price_per_person=10000, status="pending",
+                deadline=now + timedelta(days=i % 30), created_at=now - timedelta(seconds=i)
+            )
+            for i in range(n)
+        ])
+        users = [
+            User(name=f"bench-{tag}-{i}", email=f"bench-{tag}-{i}@example.com", password_hash="x", location="서울")
+            for i in range(n)
+        ]
+        db.add_all(users)
+        db.flush()
+        db.add_all([
+            Notification(user_id=users[0].id, message=f"알림 {i}", is_read=False, created_at=now - timedelta(seconds=i))
+            for i in range(n)
+        ])
+        db.commit()
+        return tag, provider.id, users[0].id
+    finally:
+        db.close()
+
+
+def teardown(tag: str, provider_id: int, user_id: int):
+    db = SessionLocal()
+    try:
+        db.query(Notification).filter(Notification.user_id == user_id).delete(synchronize_session=False)
+        db.query(Activity).filter(Activity.provider_id == provider_id).delete(synchronize_session=False)
+        db.query(User).filter(User.email.like(f"bench-{tag}-%")).delete(synchronize_session=False)
+        db.query(Provider).filter(Provider.id == provider_id).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+# ✅ 이전 경로: ORM 객체 → response_model(pydantic orm_mode) 검증 → jsonable_encoder → json.dumps
+def encode_before(schema, items, next_cursor) -> bytes:
+    page = Page[schema](items=items, next_cursor=next_cursor)
+    return JSONResponse(jsonable_encoder(page)).body
+
+
+# ✅ 지금 경로: Core 행 dict → orjson
+def encode_after(items, next_cursor) -> bytes:
+    return page_response(items, next_cursor).body
+
+
+async def measure(label: str, run, rows: int, repeat: int):
+    """조회 + 직렬화 1회의 시간(중앙값)과 그동안 할당된 메모리 최대치"""
+    body = await run()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await run()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    await run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ms_per_1000 = statistics.median(timings) * 1000 / rows
+    print(f"{label:<28} {ms_per_1000:8.2f} ms/1000 rows  {peak / 1024:9.1f} KiB allocated  {len(body) / 1024:8.1f} KiB body")
+
+
+async def run(args, tag: str, user_id: int):
+    rows = args.rows
+
+    async def activities_before():
+        async with AsyncSessionLocal() as db:
+            items, next_cursor = await crud_async.get_activities_with_filter(db, limit=rows)
+        return encode_before(ActivityResponse, items, next_cursor)
+
+    async def activities_after():
+        async with AsyncSessionLocal() as db:
+            items, next_cursor = await crud_async.get_activity_rows_with_filter(db, limit=rows)
+        return encode_after(items, next_cursor)
+
+    async def notifications_before():
+        async with AsyncSessionLocal() as db:
+            items, next_cursor = await crud_async.get_user_notifications(db, user_id, limit=rows)
+        return encode_before(NotificationResponse, items, next_cursor)
+
+    async def notifications_after():
+        async with AsyncSessionLocal() as db:
+            items, next_cursor = await crud_async.get_user_notification_rows(db, user_id, limit=rows)
+        return encode_after(items, next_cursor)
+
+    async def users_before():
+        db = SessionLocal()
+        try:
+            items, next_cursor = crud.get_users_with_filters(db, search=f"bench-{tag}", limit=rows)
+            return encode_before(UserResponse, items, next_cursor)
+        finally:
+            db.close()
+
+    async def users_after():
+        db = SessionLocal()
+        try:
+            items, next_cursor = crud.get_user_rows_with_filters(db, search=f"bench-{tag}", limit=rows)
+            return encode_after(items, next_cursor)
+        finally:
+            db.close()
+
+    print(f"행 {rows}개 / 반복 {args.repeat}회")
+    await measure("GET /activities/ before", activities_before, rows, args.repeat)
+    await measure("GET /activities/ after", activities_after, rows, args.repeat)
+    await measure("GET /admin/users before", users_before, rows, args.repeat)
+    await measure("GET /admin/users after", users_after, rows, args.repeat)
+    await measure("GET /notifications/me before", notifications_before, rows, args.repeat)
+    await measure("GET /notifications/me after", notifications_after, rows, args.repeat)
+
+    await get_async_engine().dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="목록 API 의 ORM+pydantic 경로와 Core 행+orjson 경로의 ms/1000행, 할당 메모리를 비교합니다.")
+    parser.add_argument("--rows", type=int, default=1000, help="한 번에 읽을 행 수 (벤치마크 데이터도 이만큼 생성)")
+    parser.add_argument("--repeat", type=int, default=20, help="시간 측정 반복 횟수")
+    parser.add_argument("--keep", action="store_true", help="벤치마크 데이터 삭제하지 않음")
+    args = parser.parse_args()
+
+    tag, provider_id, user_id = setup(args.rows)
+    try:
+        asyncio.run(run(args, tag, user_id))
+    finally:
+        if not args.keep:
+            teardown(tag, provider_id, user_id)
+
+
+# ✅ 명시적으로 실행될 때만 실행
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import os
+import sys
+import time
+import uuid
+import asyncio
+import argparse
+
+import httpx  # requirements-dev.txt
+
+# ✅ backend 경로를 sys.path에 추가 (main, database import 용)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BASE_DIR))
+
+from main import app
+from auth_utils import get_password_hash
+from database import SessionLocal, get_async_engine
+from models.models import User, Provider
+from password_hashing import get_hash_pool_metrics
+from bench_utils import percentile
+
+BENCH_PASSWORD = "bench-password"
+
+
+def setup():
+    """로그인용 사용자 1명, 조회용 업체 1개 생성"""
+    tag = uuid.uuid4().hex[:8]
+    db = SessionLocal()
+    try:
+        user = User(name=f"bench-{tag}", email=f"bench-{tag}@example.com", password_hash=get_password_hash(BENCH_PASSWORD))
+        provider = Provider(
+            name=f"bench-{tag}", email=f"bench-{tag}@example.com", phone="000",
+            password_hash="x", service_area="bench", service_name="bench", is_approved=True
+        )
+        db.add_all([user, provider])
+        db.commit()
+        return user.id, user.email, provider.id
+    finally:
+        db.close()
+
+
+def teardown(user_id: int, provider_id: int):
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.id == user_id).delete(synchronize_session=False)
+        db.query(Provider).filter(Provider.id == provider_id).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def timed(client: httpx.AsyncClient, latencies: list, statuses: dict, method: str, url: str, **kwargs):
+    started = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    latencies.append((time.perf_counter() - started) * 1000)
+    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+async def non_login_traffic(client, provider_id: int, requests: int, concurrency: int):
+    """로그인이 아닌 가벼운 동기 라우터 (GET /providers/{id}/activities) 를 동시에 호출"""
+    latencies, statuses = [], {}
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            await timed(client, latencies, statuses, "GET", f"/providers/{provider_id}/activities")
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies, statuses
+
+
+async def login_storm(client, email: str, requests: int, concurrency: int):
+    latencies, statuses = [], {}
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            await timed(
+                client, latencies, statuses, "POST", "/auth/login",
+                data={"username": email, "password": BENCH_PASSWORD},
+            )
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies, statuses
+
+
+def report(label: str, latencies: list, statuses: dict):
+    print(
+        f"{label:<16} n={len(latencies):<5} p50={percentile(latencies, 0.50):8.1f}ms  "
+        f"p99={percentile(latencies, 0.99):8.1f}ms  status={dict(sorted(statuses.items()))}"
+    )
+
+
+async def run(args, email: str, provider_id: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # 1) 로그인 폭주 없이 일반 요청만
+        latencies, statuses = await non_login_traffic(client, provider_id, args.requests, args.concurrency)
+        report("non-login idle", latencies, statuses)
+
+        # 2) 로그인 폭주와 일반 요청을 동시에
+        (login_latencies, login_statuses), (latencies, statuses) = await asyncio.gather(
+            login_storm(client, email, args.logins, args.login_concurrency),
+            non_login_traffic(client, provider_id, args.requests, args.concurrency),
+        )
+        report("login storm", login_latencies, login_statuses)
+        report("non-login storm", latencies, statuses)
+
+    await get_async_engine().dispose()
+    print(f"password pool: {get_hash_pool_metrics()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로그인 폭주 중 로그인/일반 API 의 p99 지연과 해시 풀 대기열을 측정합니다.")
+    parser.add_argument("--logins", type=int, default=200, help="로그인 요청 수")
+    parser.add_argument("--login-concurrency", type=int, default=100, help="동시 로그인 수")
+    parser.add_argument("--requests", type=int, default=500, help="일반 요청 수")
+    parser.add_argument("--concurrency", type=int, default=20, help="일반 요청 동시 실행 수")
+    args = parser.parse_args()
+
+    user_id, email, provider_id = setup()
+    try:
+        asyncio.run(run(args, email, provider_id))
+    finally:
+        teardown(user_id, provider_id)
+
+
+# ✅ 명시적으로 실행될 때만 실행
+if __name__ == "__main__":
+    main()
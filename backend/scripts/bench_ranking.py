@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+# ✅ backend 경로를 sys.path에 추가 (ranking import 용)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BASE_DIR))
+
+import ranking
+from interests import INTEREST_OPTIONS
+from regions import REGION_OPTIONS
+from bench_utils import percentile
+
+
+def fill_synthetic(ranker: ranking.ActivityRanker, count: int):
+    """DB 없이 임의 활동 count 개로 랭커 행렬 채움"""
+    now = datetime.utcnow()
+    ranker._allocate(count)
+    for activity_id in range(1, count + 1):
+        option = random.choice(INTEREST_OPTIONS)
+        region = random.choice(REGION_OPTIONS)
+        ranker._set_row(
+            activity_id,
+            option["category"],
+            random.choice(option["subcategories"]),
+            f"{region['province']} {random.choice(region['cities'])}",
+            None,
+            random.choice(ranking.OPEN_STATUSES + ("cancelled",)),
+            now - timedelta(days=random.uniform(0, 90)),
+            now + timedelta(days=random.uniform(-5, 30)) if random.random() < 0.7 else None,
+        )
+    ranker._built = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="개인화 랭킹 1회 계산 시간을 임의 활동 데이터로 측정합니다.")
+    parser.add_argument("--activities", type=int, default=100_000, help="활동 수")
+    parser.add_argument("--requests", type=int, default=500, help="측정 횟수")
+    parser.add_argument("--limit", type=int, default=20, help="반환 개수")
+    args = parser.parse_args()
+
+    ranker = ranking.ActivityRanker()
+    started = time.perf_counter()
+    fill_synthetic(ranker, args.activities)
+    print(f"빌드: {args.activities}건 {time.perf_counter() - started:.2f}s")
+
+    users = [
+        ranking.user_features(
+            ", ".join(random.choice(INTEREST_OPTIONS)["category"] for _ in range(3)),
+            f"{region['province']} {random.choice(region['cities'])}",
+        )
+        for region in random.choices(REGION_OPTIONS, k=args.requests)
+    ]
+
+    latencies = []
+    for features in users:
+        started = time.perf_counter()
+        ranker.rank(features, args.limit, exclude_ids=[1, 2, 3])
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    print(f"rank: p50={percentile(latencies, 0.50):.2f}ms  p99={percentile(latencies, 0.99):.2f}ms")
+
+
+# ✅ 명시적으로 실행될 때만 실행
+if __name__ == "__main__":
+    main()
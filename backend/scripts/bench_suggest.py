@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# ✅ backend 경로를 sys.path에 추가 (suggest import 용)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BASE_DIR))
+
+import suggest
+from interests import INTEREST_OPTIONS
+from regions import REGION_OPTIONS
+from bench_utils import percentile
+
+SUFFIXES = ("교실", "모임", "클래스", "동호회", "체험", "배우기", "함께해요", "초급반", "주말반")
+
+
+def synthetic_rows(count: int):
+    """DB 없이 (id, 제목, 상태) 임의 활동 count 개"""
+    rows = []
+    for activity_id in range(1, count + 1):
+        option = random.choice(INTEREST_OPTIONS)
+        region = random.choice(REGION_OPTIONS)
+        title = f"{random.choice(option['subcategories'])} {random.choice(SUFFIXES)} {random.choice(region['cities'])}"
+        rows.append((activity_id, title, random.choice(suggest.OPEN_STATUSES + ("cancelled",))))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="자동완성 1회 조회 시간을 임의 활동 제목으로 측정합니다.")
+    parser.add_argument("--activities", type=int, default=100_000, help="활동 수")
+    parser.add_argument("--requests", type=int, default=2000, help="측정 횟수")
+    parser.add_argument("--limit", type=int, default=suggest.SUGGEST_DEFAULT_LIMIT, help="반환 개수")
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.activities)
+    index = suggest.SuggestIndex()
+    started = time.perf_counter()
+    index._replace(rows)
+    print(f"빌드: {args.activities}건 {time.perf_counter() - started:.2f}s")
+
+    # 제목 앞 1~4글자, 같은 접두어의 초성, 음절+초성 혼합 입력
+    prefixes = []
+    for _, title, _ in random.choices(rows, k=args.requests):
+        path = suggest.trie_path(title)[:random.randint(1, 4)]
+        prefixes.append(random.choice((path, suggest.to_choseong(path), path[:1] + suggest.to_choseong(path[1:]))))
+
+    latencies = []
+    for prefix in prefixes:
+        started = time.perf_counter()
+        index.suggest(prefix, args.limit)
+        latencies.append((time.perf_counter() - started) * 1000)
+    print(f"suggest: p50={percentile(latencies, 0.50):.3f}ms  p99={percentile(latencies, 0.99):.3f}ms")
+
+    # 쓰기 반영: 활동 제목 변경/마감 후 조회
+    latencies = []
+    for activity_id, _, _ in random.sample(rows, min(500, len(rows))):
+        started = time.perf_counter()
+        with index._lock:
+            index._set_activity(activity_id, random.choice(rows)[1], random.choice(suggest.OPEN_STATUSES))
+        latencies.append((time.perf_counter() - started) * 1000)
+    print(f"update: p50={percentile(latencies, 0.50):.3f}ms  p99={percentile(latencies, 0.99):.3f}ms")
+
+
+# ✅ 명시적으로 실행될 때만 실행
+if __name__ == "__main__":
+    main()
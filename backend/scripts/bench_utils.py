@@ -0,0 +1,9 @@
+# ✅ 벤치마크 스크립트 공통 함수 (scripts/ 에서 직접 실행하면 이 폴더가 sys.path 에 있으므로 그대로 import)
+
+
+def percentile(values, p):
+    """values 의 p 분위 값 (0 <= p <= 1, 비어 있으면 nan)"""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
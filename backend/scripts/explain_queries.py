@@ -0,0 +1,132 @@
+import os
+import sys
+
+from sqlalchemy import event
+
+# ✅ backend 경로를 sys.path에 추가 (crud, database import 용)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BASE_DIR))
+
+import crud
+from database import SessionLocal, get_engine
+from models.models import User, Provider, Activity
+
+# ✅ 실행 계획의 type 이 ALL 이면 풀 테이블 스캔
+FULL_SCAN_TYPES = {"ALL"}
+
+# ✅ 풀 스캔이 나와도 실패로 보지 않는 검사 (검사 이름 → 이유)
+#    필터 없는 목록의 첫 페이지는 LIMIT 이 있어도 옵티마이저가 스캔 + filesort 를 고를 수 있고,
+#    나머지는 일부러 인덱스를 두지 않은 작은 관리용 목록
+EXPECTED_FULL_SCANS = {
+    "get_activities": "필터 없는 최신순 첫 페이지",
+    "get_activities_with_filter": "필터 없는 최신순 첫 페이지",
+    "get_users_with_filters": "필터 없는 관리자 목록 첫 페이지",
+    "get_providers_with_filters": "필터 없는 관리자 목록 첫 페이지",
+    "get_unprocessed_custom_interests": "처리 대기 주관식 관심사 (status 인덱스 없음, 관리자 화면 전용)",
+}
+
+
+def first_id(db, model):
+    row = db.query(model.id).order_by(model.id).first()
+    return row[0] if row else 0
+
+
+def build_checks(db):
+    """crud 조회 함수를 (이름, 호출) 쌍으로 반환"""
+    user_id = first_id(db, User)
+    provider_id = first_id(db, Provider)
+    activity_id = first_id(db, Activity)
+    user = db.query(User).filter(User.id == user_id).first()
+    provider = db.query(Provider).filter(Provider.id == provider_id).first()
+    user_email = user.email if user else ""
+    provider_email = provider.email if provider else ""
+
+    return [
+        ("get_user_by_email", lambda: crud.get_user_by_email(db, user_email)),
+        ("get_provider_by_email", lambda: crud.get_provider_by_email(db, provider_email)),
+        ("get_user_by_id", lambda: crud.get_user_by_id(db, user_id)),
+        ("get_activities", lambda: crud.get_activities(db)),
+        ("get_activity_by_id", lambda: crud.get_activity_by_id(db, activity_id)),
+        ("get_user_subscriptions", lambda: crud.get_user_subscriptions(db, user_id)),
+        ("get_provider_activities_with_counts", lambda: crud.get_provider_activities_with_counts(db, provider_id)),
+        ("get_activity_participants_for_provider", lambda: crud.get_activity_participants_for_provider(db, provider_id)),
+        ("get_activities_by_provider", lambda: crud.get_activities_by_provider(db, provider_id)),
+        ("get_activities_with_filter", lambda: crud.get_activities_with_filter(db)),
+        ("get_activities_with_filter(시/군/구)", lambda: crud.get_activities_with_filter(db, region="서울특별시 강남구")),
+        ("get_activities_with_filter(시/도)", lambda: crud.get_activities_with_filter(db, region="경기도")),
+        ("get_activities_with_filter(관심사)", lambda: crud.get_activities_with_filter(db, interest="요가")),
+        ("get_users_with_filters", lambda: crud.get_users_with_filters(db)),
+        ("get_providers_with_filters", lambda: crud.get_providers_with_filters(db)),
+        ("get_unprocessed_custom_interests", lambda: crud.get_unprocessed_custom_interests(db)),
+        ("get_user_notifications", lambda: crud.get_user_notifications(db, user_id)),
+        ("get_provider_notifications", lambda: crud.get_provider_notifications(db, provider_id)),
+        ("get_user_payments", lambda: crud.get_user_payments(db, user_id)),
+        ("get_pending_providers", lambda: crud.get_pending_providers(db)),
+        ("get_nearby_activities", lambda: crud.get_nearby_activities(db, 37.5665, 126.978, 5)),
+        ("get_open_activities_by_subcategories",
+         lambda: crud.get_open_activities_by_subcategories(db, ["걷기", "등산"], 20)),
+    ]
+
+
+def capture_statements(func):
+    """func 실행 중 발생한 SELECT 문과 파라미터를 수집"""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(get_engine(), "before_cursor_execute", before_cursor_execute)
+    try:
+        func()
+    finally:
+        event.remove(get_engine(), "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def explain(statement, parameters):
+    with get_engine().connect() as conn:
+        result = conn.exec_driver_sql("EXPLAIN " + statement, parameters)
+        return [dict(row._mapping) for row in result]
+
+
+def main():
+    db = SessionLocal()
+    full_scans = []
+    expected_scans = []
+    try:
+        for name, func in build_checks(db):
+            print(f"\n=== {name} ===")
+            for statement, parameters in capture_statements(func):
+                print(" ".join(statement.split()))
+                for row in explain(statement, parameters):
+                    print(
+                        f"  table={row.get('table')} type={row.get('type')} "
+                        f"key={row.get('key')} rows={row.get('rows')} extra={row.get('Extra')}"
+                    )
+                    if row.get("type") not in FULL_SCAN_TYPES:
+                        continue
+                    if name in EXPECTED_FULL_SCANS:
+                        expected_scans.append((name, row.get("table")))
+                    else:
+                        full_scans.append((name, row.get("table")))
+    finally:
+        db.close()
+
+    print()
+    if expected_scans:
+        print("⚠️ 예상된 풀 테이블 스캔 (실패로 보지 않음):")
+        for name, table in expected_scans:
+            print(f"  - {name}: {table} ({EXPECTED_FULL_SCANS[name]})")
+    if full_scans:
+        print("❌ 풀 테이블 스캔 발생:")
+        for name, table in full_scans:
+            print(f"  - {name}: {table}")
+        print("※ 행 수가 매우 적은 테이블은 옵티마이저가 인덱스 대신 스캔을 선택할 수 있습니다.")
+        sys.exit(1)
+    print("✅ 모든 쿼리가 인덱스를 사용합니다.")
+
+
+# ✅ 명시적으로 실행될 때만 실행
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+
+# ✅ backend 경로 (lambda_function.py 가 있는 위치에서 import 측정)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BASE_DIR)
+
+# ✅ 프로젝트 모듈 (패키지별 합계와 별도로 개별 모듈 시간을 보여줌)
+PROJECT_MODULES = ("main", "lambda_function", "database", "crud", "crud_async", "auth_utils",
+                   "schemas", "pagination", "models", "routers")
+
+
+def measure(module: str):
+    """새 인터프리터에서 `import module` 을 -X importtime 으로 실행하고 (모듈, self_us, cumulative_us) 목록 반환"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr)
+        raise SystemExit(f"❌ import {module} 실패")
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def summarize(entries, entry_module: str):
+    total_us = next(cum for name, _, cum in entries if name == entry_module)
+
+    by_package = defaultdict(int)
+    for name, self_us, _ in entries:
+        by_package[name.split(".")[0]] += self_us
+
+    project = {
+        name: cum for name, _, cum in entries
+        if name.split(".")[0] in PROJECT_MODULES
+    }
+    return {
+        "entry": entry_module,
+        "total_ms": round(total_us / 1000, 1),
+        "packages_ms": {k: round(v / 1000, 1) for k, v in sorted(by_package.items(), key=lambda kv: -kv[1])},
+        "project_modules_ms": {k: round(v / 1000, 1) for k, v in sorted(project.items(), key=lambda kv: -kv[1])},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lambda 엔트리포인트의 import 시간을 모듈/패키지별로 보고합니다.")
+    parser.add_argument("--module", default="lambda_function", help="측정할 엔트리 모듈")
+    parser.add_argument("--runs", type=int, default=5, help="반복 횟수 (총 시간이 가장 짧은 결과 사용)")
+    parser.add_argument("--top", type=int, default=15, help="출력할 패키지 수")
+    parser.add_argument("--budget-ms", type=float, default=None, help="총 import 시간 예산 (초과 시 종료 코드 1)")
+    parser.add_argument("--json", dest="json_path", default=None, help="결과를 JSON 파일로 저장 (릴리스별 추적용)")
+    args = parser.parse_args()
+
+    # 첫 실행은 .pyc 생성 비용이 섞이므로 버림
+    measure(args.module)
+    report = min(
+        (summarize(measure(args.module), args.module) for _ in range(args.runs)),
+        key=lambda r: r["total_ms"]
+    )
+
+    print(f"=== import {report['entry']}: {report['total_ms']}ms (best of {args.runs}) ===")
+    print("\n패키지별 (self 합계)")
+    for name, ms in list(report["packages_ms"].items())[:args.top]:
+        print(f"  {ms:8.1f}ms  {name}")
+    print("\n프로젝트 모듈 (cumulative)")
+    for name, ms in report["project_modules_ms"].items():
+        print(f"  {ms:8.1f}ms  {name}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        print(f"\n❌ 예산 초과: {report['total_ms']}ms > {args.budget_ms}ms")
+        sys.exit(1)
+
+
+# ✅ 명시적으로 실행될 때만 실행
+if __name__ == "__main__":
+    main()
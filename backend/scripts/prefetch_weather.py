@@ -0,0 +1,33 @@
+import os
+import sys
+import logging
+import argparse
+
+# ✅ backend 경로를 sys.path에 추가 (weather_prefetch import 용)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BASE_DIR))
+
+import weather_prefetch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지원 지역 전체의 날씨/예보/미세먼지를 받아 캐시에 저장합니다.")
+    parser.add_argument("--loop", action="store_true", help="WEATHER_PREFETCH_INTERVAL 초마다 반복 실행")
+    parser.add_argument("--city", action="append", help="특정 도시만 갱신 (여러 번 지정 가능)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.loop:
+        weather_prefetch.run_forever()
+        return
+
+    result = weather_prefetch.prefetch_all(cities=args.city)
+    print(f"✅ {result['refreshed']}/{result['cities']}개 도시 갱신 ({result['elapsed_s']}s)")
+    if result["failed"]:
+        print(f"⚠️ 실패: {', '.join(result['failed'])}")
+
+
+# ✅ 명시적으로 실행될 때만 실행
+if __name__ == "__main__":
+    main()
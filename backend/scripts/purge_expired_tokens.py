@@ -0,0 +1,28 @@
+import os
+import sys
+import argparse
+
+# ✅ backend 경로를 sys.path에 추가 (crud, database import 용)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BASE_DIR))
+
+import crud
+from database import SessionLocal
+
+
+def main():
+    argparse.ArgumentParser(description="만료된 리프레시 토큰과 폐기 토큰 행을 삭제합니다. (주기 실행용)").parse_args()
+
+    db = SessionLocal()
+    try:
+        refresh_deleted = crud.purge_expired_refresh_tokens(db)
+        revoked_deleted = crud.purge_expired_revoked_tokens(db)
+    finally:
+        db.close()
+
+    print(f"✅ 만료된 리프레시 토큰 {refresh_deleted}개, 폐기 토큰 {revoked_deleted}개를 삭제했습니다.")
+
+
+# ✅ 명시적으로 실행될 때만 실행
+if __name__ == "__main__":
+    main()
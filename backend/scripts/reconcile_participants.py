@@ -0,0 +1,37 @@
+import os
+import sys
+import argparse
+
+# ✅ backend 경로를 sys.path에 추가 (crud, database import 용)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BASE_DIR))
+
+import crud
+from database import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="activities.current_participants 를 subscriptions 수와 맞춥니다.")
+    parser.add_argument("--dry-run", action="store_true", help="보정하지 않고 차이만 출력")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        drifted = crud.reconcile_participant_counts(db, dry_run=args.dry_run)
+    finally:
+        db.close()
+
+    for row in drifted:
+        print(f"activity_id={row['activity_id']} stored={row['stored']} actual={row['actual']}")
+
+    if not drifted:
+        print("✅ 모든 활동의 신청자 수가 일치합니다.")
+    elif args.dry_run:
+        print(f"⚠️ {len(drifted)}개 활동의 신청자 수가 다릅니다. (--dry-run: 보정하지 않음)")
+    else:
+        print(f"✅ {len(drifted)}개 활동의 신청자 수를 보정했습니다.")
+
+
+# ✅ 명시적으로 실행될 때만 실행
+if __name__ == "__main__":
+    main()
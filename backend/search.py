@@ -0,0 +1,284 @@
+import os
+import gzip
+import json
+import math
+import time
+import logging
+import unicodedata
+from collections import Counter, defaultdict
+
+from sqlalchemy import select
+
+from memory_index import RefreshingIndex, INDEX_REBUILD_SECONDS, load_numpy
+from models.models import Activity
+
+logger = logging.getLogger(__name__)
+
+# ✅ BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# ✅ 필드별 가중치 (제목 일치를 설명 일치보다 높게)
+FIELD_WEIGHTS = {
+    "title": 2.0,
+    "interest_category": 1.5,
+    "interest_subcategory": 1.5,
+    "description": 1.0,
+}
+
+# ✅ 검색어 토큰 중 이 비율 이상 포함한 활동만 결과로 (bigram 한두 개만 겹친 결과 제외)
+MIN_MATCH_RATIO = 0.6
+
+# ✅ 한 번의 검색에서 순위를 매기는 최대 결과 수
+SEARCH_MAX_RESULTS = 1000
+
+# ✅ 웜 스타트용 스냅샷 (비우면 저장/로드 안 함)
+SEARCH_SNAPSHOT_PATH = os.getenv("SEARCH_SNAPSHOT_PATH", "/tmp/activity-search.json.gz")
+SNAPSHOT_VERSION = 1
+
+
+def is_hangul_or_cjk(char: str) -> bool:
+    code = ord(char)
+    return 0xAC00 <= code <= 0xD7A3 or 0x3131 <= code <= 0x318E or 0x4E00 <= code <= 0x9FFF
+
+
+# ✅ 토큰화: 한글/한자 연속 구간은 글자 bigram (한 글자면 그대로), 영문/숫자는 단어 단위
+#    조사/띄어쓰기가 달라도 ("요가교실" / "요가 교실의") 같은 bigram 이 생긴다.
+def tokenize(text: str) -> list:
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKC", text).lower()
+
+    tokens = []
+    run, run_is_cjk = [], False
+
+    def flush():
+        if not run:
+            return
+        if run_is_cjk:
+            if len(run) == 1:
+                tokens.append(run[0])
+            else:
+                tokens.extend(run[i] + run[i + 1] for i in range(len(run) - 1))
+        else:
+            tokens.append("".join(run))
+
+    for char in text:
+        if char.isalnum():
+            cjk = is_hangul_or_cjk(char)
+            if run and cjk != run_is_cjk:
+                flush()
+                run = []
+            run.append(char)
+            run_is_cjk = cjk
+        else:
+            flush()
+            run = []
+    flush()
+    return tokens
+
+
+def document_terms(title, description, interest_category, interest_subcategory) -> dict:
+    """필드 가중치를 곱한 term frequency"""
+    terms = Counter()
+    for field, text in (
+        ("title", title), ("description", description),
+        ("interest_category", interest_category), ("interest_subcategory", interest_subcategory),
+    ):
+        weight = FIELD_WEIGHTS[field]
+        for token in tokenize(text):
+            terms[token] += weight
+    return dict(terms)
+
+
+# ✅ 활동 역색인 (term -> {activity_id: 가중 tf}) + BM25 점수
+#    점수 계산은 term 별 numpy 배열(문서 행 번호, tf)로 한 번에 (배열은 term 이 바뀔 때만 다시 만듦)
+class ActivitySearchIndex(RefreshingIndex):
+    name = "activity search index"
+
+    def __init__(self, snapshot_path: str = SEARCH_SNAPSHOT_PATH):
+        super().__init__()
+        self.snapshot_path = snapshot_path
+        self._postings = defaultdict(dict)
+        self._doc_terms = {}    # activity_id -> {term: tf} (수정 시 이전 term 제거용)
+        self._doc_row = {}      # activity_id -> 행 번호 (문서 길이 배열 위치)
+        self._row_ids = []      # 행 번호 -> activity_id
+        self._doc_len = []      # 행 번호 -> 가중 문서 길이
+        self._total_len = 0.0
+        self._term_arrays = {}  # term -> (행 번호 배열, tf 배열)
+        self._len_array = None  # 문서 길이 numpy 배열 (문서 변경 시 다시 만듦)
+        self._id_array = None
+
+    def source_query(self, min_id: int = 0):
+        return (
+            select(
+                Activity.id, Activity.title, Activity.description,
+                Activity.interest_category, Activity.interest_subcategory
+            )
+            .where(Activity.id > min_id)
+            .order_by(Activity.id)
+        )
+
+    def _set_doc(self, activity_id: int, terms: dict):
+        previous = self._doc_terms.get(activity_id, {})
+        for term in previous:
+            if term not in terms:
+                postings = self._postings[term]
+                postings.pop(activity_id, None)
+                if not postings:
+                    del self._postings[term]
+        for term, tf in terms.items():
+            self._postings[term][activity_id] = tf
+        for term in set(previous) | set(terms):
+            self._term_arrays.pop(term, None)
+
+        row = self._doc_row.get(activity_id)
+        if row is None:
+            row = self._doc_row[activity_id] = len(self._row_ids)
+            self._row_ids.append(activity_id)
+            self._doc_len.append(0.0)
+        length = sum(terms.values())
+        self._total_len += length - self._doc_len[row]
+        self._doc_len[row] = length
+        self._doc_terms[activity_id] = terms
+        self._len_array = None
+
+    def _load_terms(self, docs):
+        """[(activity_id, terms), ...] 로 새 색인을 만들어 교체"""
+        fresh = ActivitySearchIndex(self.snapshot_path)
+        for activity_id, terms in docs:
+            fresh._set_doc(activity_id, terms)
+        # 검색 시점이 아니라 빌드 시점에 term 별 배열을 미리 만들어 둠
+        for term in list(fresh._postings):
+            fresh._arrays_for(term)
+        with self._lock:
+            for name in ("_postings", "_doc_terms", "_doc_row", "_row_ids", "_doc_len",
+                         "_total_len", "_term_arrays", "_len_array"):
+                setattr(self, name, getattr(fresh, name))
+
+    def load_rows(self, rows):
+        self._load_terms((row[0], document_terms(*row[1:])) for row in rows)
+
+    def add_rows(self, rows):
+        for row in rows:
+            self._set_doc(row[0], document_terms(*row[1:]))
+
+    # ✅ 이 인스턴스에서 활동이 생성/수정되면 해당 문서만 다시 색인
+    def upsert(self, activity: Activity):
+        if not self._built:
+            return
+        terms = document_terms(
+            activity.title, activity.description, activity.interest_category, activity.interest_subcategory
+        )
+        with self._lock:
+            self._set_doc(activity.id, terms)
+
+    # ✅ 색인에 없는 검색어는 캐시하지 않음 (사용자 입력만큼 캐시가 커지지 않도록)
+    def _arrays_for(self, term: str):
+        arrays = self._term_arrays.get(term)
+        if arrays is None:
+            np = load_numpy()
+            postings = self._postings.get(term)
+            if not postings:
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+            rows = np.fromiter((self._doc_row[i] for i in postings), dtype=np.int64, count=len(postings))
+            tfs = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            arrays = self._term_arrays[term] = (rows, tfs)
+        return arrays
+
+    # ✅ BM25 검색 → [(activity_id, score), ...] (점수 내림차순, 같은 점수는 id 내림차순)
+    def search(self, query: str, limit: int = SEARCH_MAX_RESULTS) -> list:
+        query_terms = list(set(tokenize(query)))
+        if not query_terms:
+            return []
+
+        np = load_numpy()
+        with self._lock:
+            n_docs = len(self._row_ids)
+            if n_docs == 0 or self._total_len <= 0:
+                return []
+            if self._len_array is None:
+                self._len_array = np.array(self._doc_len, dtype=np.float64)
+                self._id_array = np.array(self._row_ids, dtype=np.int64)
+            doc_len, row_ids = self._len_array, self._id_array
+            avg_len = self._total_len / n_docs
+
+            scores = np.zeros(n_docs, dtype=np.float64)
+            matched = np.zeros(n_docs, dtype=np.int16)
+            for term in query_terms:
+                rows, tfs = self._arrays_for(term)
+                if not len(rows):
+                    continue
+                idf = math.log(1 + (n_docs - len(rows) + 0.5) / (len(rows) + 0.5))
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len[rows] / avg_len)
+                scores[rows] += idf * tfs * (BM25_K1 + 1) / (tfs + norm)
+                matched[rows] += 1
+
+        required = max(1, math.ceil(len(query_terms) * MIN_MATCH_RATIO))
+        candidates = np.nonzero(matched >= required)[0]
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        order = np.lexsort((-row_ids[candidates], -scores[candidates]))
+        candidates = candidates[order]
+        return list(zip(row_ids[candidates].tolist(), scores[candidates].tolist()))
+
+    # ✅ 스냅샷: 문서별 term 만 저장 (역색인은 로드할 때 다시 구성)
+    def after_rebuild(self):
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            payload = {
+                "version": SNAPSHOT_VERSION,
+                "saved_at": time.time(),
+                "max_id": self._max_id,
+                "docs": [[activity_id, terms] for activity_id, terms in self._doc_terms.items()],
+            }
+        tmp_path = f"{self.snapshot_path}.tmp"
+        try:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning("search snapshot save failed: %s", e)
+
+    def load_snapshot(self) -> bool:
+        """스냅샷이 있으면 DB 전체 조회 없이 색인을 복원 (이후 새 활동만 동기화)"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with gzip.open(self.snapshot_path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("search snapshot load failed: %s", e)
+            return False
+
+        age = time.time() - payload.get("saved_at", 0)
+        if payload.get("version") != SNAPSHOT_VERSION or age > INDEX_REBUILD_SECONDS:
+            return False
+
+        self._load_terms((activity_id, terms) for activity_id, terms in payload["docs"])
+        with self._lock:
+            self._max_id = payload["max_id"]
+            self._built = True
+            # 스냅샷 시점을 빌드 시점으로 보고, 새 활동은 바로 다음 요청에서 동기화
+            self._built_at = time.monotonic() - age
+            self._synced_at = 0.0
+        return True
+
+    def ensure_fresh(self, db):
+        if not self._built:
+            self.load_snapshot()
+        super().ensure_fresh(db)
+
+    async def aensure_fresh(self, db):
+        if not self._built:
+            self.load_snapshot()
+        await super().aensure_fresh(db)
+
+
+activity_search_index = ActivitySearchIndex()
+
+
+# ✅ crud 에서 활동 변경 후 호출 (색인을 아직 만들지 않았으면 아무것도 하지 않음)
+def on_activity_changed(activity: Activity):
+    activity_search_index.upsert(activity)
@@ -0,0 +1,359 @@
+import heapq
+import unicodedata
+
+from sqlalchemy import select
+
+from interests import INTEREST_OPTIONS
+from memory_index import RefreshingIndex
+from models.models import Activity, Interest, CustomInterest
+
+# ✅ 자동완성 응답 개수 / 노드별로 미리 계산해 두는 상위 후보 수
+SUGGEST_DEFAULT_LIMIT = 10
+SUGGEST_MAX_LIMIT = 20
+NODE_TOP_SIZE = 40
+
+# ✅ 종류별 기본 가중치 (같은 접두어면 관심사 → 승인된 주관식 관심사 → 활동 제목 순, 제목은 활동 수만큼 가산)
+KIND_WEIGHTS = {
+    "interest": 1000.0,
+    "custom_interest": 500.0,
+    "activity": 0.0,
+}
+
+OPEN_STATUSES = ("pending", "confirmed")
+
+# ✅ 한글 초성 (유니코드 음절 순서)
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+CHOSEONG_SET = frozenset(CHOSEONG)
+
+
+# ✅ NFKC 는 호환 자모(ㄱ)를 첫가끝 자모(U+1100)로 바꾸므로 초성은 다시 호환 자모로
+CONJOINING_CHOSEONG = {0x1100 + i: char for i, char in enumerate(CHOSEONG)}
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text or "").translate(CONJOINING_CHOSEONG)
+    return " ".join(text.lower().split())
+
+
+def trie_path(key: str) -> str:
+    """띄어쓰기 없이 비교 ("요가교" → "요가 교실")"""
+    return key.replace(" ", "")
+
+
+# ✅ 음절 → 초성 ("요가" → "ㅇㄱ"), 한글 음절이 아니면 그대로
+def to_choseong(text: str) -> str:
+    chars = []
+    for char in text:
+        code = ord(char)
+        if 0xAC00 <= code <= 0xD7A3:
+            chars.append(CHOSEONG[(code - 0xAC00) // 588])
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+# ✅ 입력 글자가 초성이면 음절의 초성과, 아니면 글자 그대로 비교
+def matches_mixed_prefix(path: str, prefix: str) -> bool:
+    if len(path) < len(prefix):
+        return False
+    for char, expected in zip(path, prefix):
+        if expected in CHOSEONG_SET:
+            if to_choseong(char) != expected:
+                return False
+        elif char != expected:
+            return False
+    return True
+
+
+class TrieNode:
+    __slots__ = ("children", "keys", "count", "top")
+
+    def __init__(self):
+        self.children = {}
+        self.keys = set()   # 이 노드에서 끝나는 key
+        self.count = 0      # 하위 트리의 key 수
+        self.top = None     # 하위 트리 상위 key (가중치 내림차순), None 이면 조회할 때 계산
+
+
+# ✅ 접두어 트라이 (노드마다 상위 후보를 유지해 조회는 접두어 길이만큼만 이동)
+#    가중치는 외부 dict(weights)를 참조한다.
+class PrefixTrie:
+    def __init__(self, weights: dict):
+        self.root = TrieNode()
+        self.weights = weights
+
+    def _sort_key(self, key):
+        return (-self.weights.get(key, 0.0), key)
+
+    def _path_nodes(self, path: str, create: bool = False):
+        node = self.root
+        nodes = [node]
+        for char in path:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[char] = TrieNode()
+            node = child
+            nodes.append(node)
+        return nodes
+
+    def insert(self, path: str, key: str):
+        nodes = self._path_nodes(path, create=True)
+        if key in nodes[-1].keys:
+            return
+        nodes[-1].keys.add(key)
+        for node in nodes:
+            node.count += 1
+            if node.top is not None:
+                node.top.append(key)
+                node.top.sort(key=self._sort_key)
+                del node.top[NODE_TOP_SIZE:]
+
+    def remove(self, path: str, key: str):
+        nodes = self._path_nodes(path)
+        if nodes is None or key not in nodes[-1].keys:
+            return
+        nodes[-1].keys.discard(key)
+        for node in nodes:
+            node.count -= 1
+            if node.top is not None and key in node.top:
+                node.top.remove(key)
+                self._invalidate_if_short(node)
+
+    # ✅ key 의 가중치가 바뀐 뒤 호출 (increased: 가중치가 커졌는지)
+    def reweight(self, path: str, key: str, increased: bool):
+        nodes = self._path_nodes(path)
+        if nodes is None:
+            return
+        for node in nodes:
+            if node.top is None:
+                continue
+            if key in node.top:
+                node.top.sort(key=self._sort_key)
+                if not increased and node.top[-1] == key and node.count > len(node.top):
+                    # 하위 트리에 더 높은 후보가 있을 수 있으므로 목록에서 빼고 필요하면 다시 계산
+                    node.top.remove(key)
+                    self._invalidate_if_short(node)
+            elif increased and (len(node.top) < NODE_TOP_SIZE or self._sort_key(key) < self._sort_key(node.top[-1])):
+                node.top.append(key)
+                node.top.sort(key=self._sort_key)
+                del node.top[NODE_TOP_SIZE:]
+
+    def _invalidate_if_short(self, node: TrieNode):
+        if len(node.top) < NODE_TOP_SIZE // 2 and node.count > len(node.top):
+            node.top = None
+
+    def _collect(self, node: TrieNode):
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            yield from current.keys
+            stack.extend(current.children.values())
+
+    def top_keys(self, path: str) -> list:
+        nodes = self._path_nodes(path)
+        if nodes is None:
+            return []
+        node = nodes[-1]
+        if node.top is None:
+            node.top = heapq.nsmallest(NODE_TOP_SIZE, self._collect(node), key=self._sort_key)
+        return node.top
+
+    def matching_keys(self, path: str, predicate, limit: int) -> list:
+        """path 하위 트리에서 predicate 를 만족하는 상위 limit 개 (노드 상위 후보 캐시 없이 전부 확인)"""
+        nodes = self._path_nodes(path)
+        if nodes is None:
+            return []
+        candidates = (key for key in self._collect(nodes[-1]) if predicate(key))
+        return heapq.nsmallest(limit, candidates, key=self._sort_key)
+
+    def fill_tops(self):
+        """전체 빌드 후 모든 노드의 상위 후보를 아래에서 위로 계산"""
+        order = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(node.children.values())
+        for node in reversed(order):
+            candidates = list(node.keys)
+            for child in node.children.values():
+                candidates.extend(child.top)
+            node.top = heapq.nsmallest(NODE_TOP_SIZE, candidates, key=self._sort_key)
+            node.count = len(node.keys) + sum(child.count for child in node.children.values())
+
+
+# ✅ 자동완성 색인: 활동 제목 + 공식 관심사(분류/세부) + 승인된 주관식 관심사
+#    같은 문구는 한 key 로 합치고, 가중치 = 가장 높은 종류 가중치 + 모집 중인 같은 제목 활동 수
+class SuggestIndex(RefreshingIndex):
+    name = "suggest index"
+
+    def __init__(self):
+        super().__init__()
+        self._weights = {}          # key -> 가중치
+        self._display = {}          # key -> 화면 표시 문구
+        self._term_kinds = {}       # key -> {source: kind} (관심사 출처)
+        self._title_counts = {}     # key -> 모집 중 활동 수
+        self._activity_keys = {}    # activity_id -> key (모집 중인 활동만)
+        self._trie = PrefixTrie(self._weights)
+        self._choseong_trie = PrefixTrie(self._weights)
+        self._interest_rows = ()
+        self._custom_rows = ()
+
+    def source_query(self, min_id: int = 0):
+        return (
+            select(Activity.id, Activity.title, Activity.status)
+            .where(Activity.id > min_id)
+            .order_by(Activity.id)
+        )
+
+    # ✅ 전체 빌드 때만 관심사 테이블도 함께 읽음 (이후 변경은 훅으로 반영)
+    def rebuild(self, db):
+        self._interest_rows = db.execute(select(Interest.id, Interest.category, Interest.subcategory)).all()
+        self._custom_rows = db.execute(
+            select(CustomInterest.id, CustomInterest.value).where(CustomInterest.status == "approved")
+        ).all()
+        super().rebuild(db)
+
+    def _kind_of(self, key: str) -> str:
+        kinds = self._term_kinds.get(key, {}).values()
+        return max(kinds, key=KIND_WEIGHTS.get) if kinds else "activity"
+
+    def _refresh_key(self, key: str, display: str = None):
+        old = self._weights.get(key)
+        kinds = self._term_kinds.get(key)
+        count = self._title_counts.get(key, 0)
+        path = trie_path(key)
+
+        if not kinds and count <= 0:
+            if old is not None:
+                self._trie.remove(path, key)
+                self._choseong_trie.remove(to_choseong(path), key)
+                del self._weights[key]
+                self._display.pop(key, None)
+            return
+
+        new = max(KIND_WEIGHTS[k] for k in kinds.values()) + count if kinds else float(count)
+        self._weights[key] = new
+        if display:
+            self._display.setdefault(key, display)
+        if old is None:
+            self._trie.insert(path, key)
+            self._choseong_trie.insert(to_choseong(path), key)
+        elif new != old:
+            self._trie.reweight(path, key, new > old)
+            self._choseong_trie.reweight(to_choseong(path), key, new > old)
+
+    def _set_term(self, source, kind: str, text: str):
+        key = normalize(text)
+        if not key:
+            return
+        self._term_kinds.setdefault(key, {})[source] = kind
+        self._refresh_key(key, text.strip())
+
+    def _remove_term(self, source, text: str):
+        key = normalize(text)
+        kinds = self._term_kinds.get(key)
+        if kinds and source in kinds:
+            del kinds[source]
+            if not kinds:
+                del self._term_kinds[key]
+            self._refresh_key(key)
+
+    def _set_activity(self, activity_id: int, title: str, status: str):
+        previous = self._activity_keys.pop(activity_id, None)
+        if previous is not None:
+            self._title_counts[previous] -= 1
+            if self._title_counts[previous] <= 0:
+                del self._title_counts[previous]
+            self._refresh_key(previous)
+
+        key = normalize(title)
+        if key and status in OPEN_STATUSES:
+            self._activity_keys[activity_id] = key
+            self._title_counts[key] = self._title_counts.get(key, 0) + 1
+            self._refresh_key(key, title.strip())
+
+    # ✅ 새 트라이의 노드는 상위 후보가 비어 있으므로 삽입 비용 없이 채운 뒤 한 번에 계산
+    def load_rows(self, rows):
+        fresh = SuggestIndex()
+        for option in INTEREST_OPTIONS:
+            fresh._set_term(("taxonomy", option["category"]), "interest", option["category"])
+            for sub in option["subcategories"]:
+                fresh._set_term(("taxonomy", sub), "interest", sub)
+        for interest_id, category, subcategory in self._interest_rows:
+            fresh._set_term(("interest", interest_id, "category"), "interest", category)
+            fresh._set_term(("interest", interest_id, "subcategory"), "interest", subcategory)
+        for custom_id, value in self._custom_rows:
+            fresh._set_term(("custom", custom_id), "custom_interest", value)
+        for row in rows:
+            fresh._set_activity(*row)
+        fresh._trie.fill_tops()
+        fresh._choseong_trie.fill_tops()
+
+        with self._lock:
+            for name in ("_weights", "_display", "_term_kinds", "_title_counts", "_activity_keys",
+                         "_trie", "_choseong_trie"):
+                setattr(self, name, getattr(fresh, name))
+
+    def add_rows(self, rows):
+        for row in rows:
+            self._set_activity(*row)
+
+    # ✅ 쓰기 훅 (빌드 전이면 다음 빌드에 포함되므로 무시)
+    def upsert_activity(self, activity: Activity):
+        if not self._built:
+            return
+        with self._lock:
+            self._set_activity(activity.id, activity.title, activity.status)
+
+    def upsert_interest(self, interest: Interest):
+        if not self._built:
+            return
+        with self._lock:
+            self._set_term(("interest", interest.id, "category"), "interest", interest.category)
+            self._set_term(("interest", interest.id, "subcategory"), "interest", interest.subcategory)
+
+    def upsert_custom_interest(self, interest: CustomInterest):
+        if not self._built:
+            return
+        with self._lock:
+            if interest.status == "approved":
+                self._set_term(("custom", interest.id), "custom_interest", interest.value)
+            else:
+                self._remove_term(("custom", interest.id), interest.value)
+
+    def remove_custom_interest(self, interest: CustomInterest):
+        if not self._built:
+            return
+        with self._lock:
+            self._remove_term(("custom", interest.id), interest.value)
+
+    # ✅ 접두어 → [{"text", "kind"}, ...]
+    #    전부 초성이면 초성 트라이, 초성과 음절이 섞이면 앞쪽 음절까지는 음절 트라이로 좁히고
+    #    (초성으로 시작하면 초성 트라이) 그 하위 트리 전체를 글자 단위로 다시 확인
+    def suggest(self, prefix: str, limit: int = SUGGEST_DEFAULT_LIMIT) -> list:
+        path = trie_path(normalize(prefix))
+        if not path:
+            return []
+
+        jamo = [char in CHOSEONG_SET for char in path]
+        with self._lock:
+            if all(jamo):
+                keys = self._choseong_trie.top_keys(path)
+            elif any(jamo):
+                leading = path[:jamo.index(True)]
+                trie, start = (self._trie, leading) if leading else (self._choseong_trie, to_choseong(path))
+                keys = trie.matching_keys(start, lambda key: matches_mixed_prefix(trie_path(key), path), limit)
+            else:
+                keys = self._trie.top_keys(path)
+            return [{"text": self._display[key], "kind": self._kind_of(key)} for key in keys[:limit]]
+
+
+suggest_index = SuggestIndex()
+
+
+# ✅ crud 에서 활동 변경 후 호출
+def on_activity_changed(activity: Activity):
+    suggest_index.upsert_activity(activity)
@@ -0,0 +1,28 @@
+# /backend/tests/test_regions.py
+# ✅ 실행: backend 폴더에서 `python -m pytest tests`
+
+import os
+import sys
+
+# ✅ backend 경로를 sys.path에 추가 (regions import 용)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from regions import REGION_OPTIONS, PROVINCE_ALIASES, SIDO_CODES, REGION_CODES, parse_region, region_code
+
+
+def test_full_names_parse_to_themselves():
+    wrong = [
+        (region["province"], city, parse_region(f"{region['province']} {city}"))
+        for region in REGION_OPTIONS for city in region["cities"]
+        if parse_region(f"{region['province']} {city}") != (region["province"], city)
+    ]
+    assert wrong == []
+
+
+def test_alias_only_as_leading_word():
+    assert parse_region("부산광역시 해운대구") == ("부산광역시", "해운대구")
+    assert region_code("부산광역시 해운대구") == REGION_CODES[("부산광역시", "해운대구")]
+    for province, aliases in PROVINCE_ALIASES.items():
+        for alias in aliases:
+            assert parse_region(f"{alias} ") == (province, None)
+    assert region_code("대구") == SIDO_CODES["대구광역시"]
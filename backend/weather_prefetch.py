@@ -0,0 +1,133 @@
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import weather_service
+from regions import weather_prefetch_cities
+
+logger = logging.getLogger(__name__)
+
+# ✅ 미리 받아두기 설정
+#    INTERVAL: 실행 주기(초), WEATHER_CACHE_TTL 을 이 값 이상으로 두면 요청 경로에서는 항상 캐시 적중
+#    스케줄 Lambda/스크립트는 API 와 다른 프로세스이므로 공유 캐시(redis, 또는 CACHE_SQLITE_SHARED=true 인 sqlite)에만 받아둠
+#    CALLS_PER_MINUTE: OpenWeather 요금제 분당 호출 한도에 맞춤
+WEATHER_PREFETCH_INTERVAL = int(os.getenv("WEATHER_PREFETCH_INTERVAL", "1800"))
+WEATHER_PREFETCH_BATCH_SIZE = int(os.getenv("WEATHER_PREFETCH_BATCH_SIZE", "20"))
+WEATHER_PREFETCH_CONCURRENCY = int(os.getenv("WEATHER_PREFETCH_CONCURRENCY", "8"))
+WEATHER_PREFETCH_CALLS_PER_MINUTE = int(os.getenv("WEATHER_PREFETCH_CALLS_PER_MINUTE", "600"))
+# Lambda 한 번 호출에서 남은 실행 시간이 이 값(초)보다 적으면 새 배치를 시작하지 않고 다음 호출로 넘김
+WEATHER_PREFETCH_TIME_MARGIN = int(os.getenv("WEATHER_PREFETCH_TIME_MARGIN", "20"))
+
+# ✅ 여러 번의 호출로 나눠 받을 때 다음에 시작할 위치 (공유 캐시에 저장)
+PREFETCH_CURSOR_KEY = "weather-prefetch:cursor"
+
+# ✅ 도시 1곳 = 현재 날씨 + 예보 + 미세먼지 (+ 좌표가 캐시에 없는 "시/도 시/군/구" 지역은 지오코딩 1회)
+UPSTREAM_CALLS_PER_CITY = 3
+
+
+# ✅ 분당 호출 한도용 토큰 버킷 (여러 스레드가 공유)
+class RateLimiter:
+    def __init__(self, calls_per_minute: int):
+        self.rate = calls_per_minute / 60.0
+        self.capacity = float(calls_per_minute)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def chunked(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ✅ 전체 지원 지역 날씨를 배치 단위로 갱신
+#    배치 안에서는 최대 concurrency 개 도시를 동시에 받아오고, 호출 수는 rate limiter 로 제한
+#    실패한 도시는 기존 캐시 값을 그대로 두고 (stale 응답) 다음 주기에 다시 시도
+#    deadline(time.monotonic 기준)을 넘기면 남은 배치는 시작하지 않음 (processed 로 어디까지 했는지 반환)
+def prefetch_all(
+    cities: list = None,
+    batch_size: int = WEATHER_PREFETCH_BATCH_SIZE,
+    concurrency: int = WEATHER_PREFETCH_CONCURRENCY,
+    calls_per_minute: int = WEATHER_PREFETCH_CALLS_PER_MINUTE,
+    deadline: float = None,
+) -> dict:
+    require_shared_cache()
+
+    cities = cities if cities is not None else weather_prefetch_cities()
+    limiter = RateLimiter(calls_per_minute)
+    failed = []
+    processed = 0
+
+    def refresh(city: str):
+        limiter.acquire(UPSTREAM_CALLS_PER_CITY + (1 if weather_service.needs_geocoding(city) else 0))
+        try:
+            weather_service.refresh_full_weather(city)
+            return None
+        except Exception as e:
+            logger.warning("weather prefetch failed (%s): %s", city, e)
+            return city
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="weather-prefetch") as executor:
+        for batch in chunked(cities, batch_size):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            failed.extend(city for city in executor.map(refresh, batch) if city is not None)
+            processed += len(batch)
+
+    return {
+        "cities": len(cities),
+        "processed": processed,
+        "refreshed": processed - len(failed),
+        "failed": failed,
+        "elapsed_s": round(time.monotonic() - started, 2),
+    }
+
+
+def require_shared_cache():
+    if not weather_service.cache_backend.shared:
+        raise RuntimeError("날씨 미리 받아두기는 공유 캐시가 필요합니다. CACHE_BACKEND=redis 또는 공유 경로의 sqlite(CACHE_SQLITE_SHARED=true)로 설정하세요.")
+
+
+# ✅ Lambda 스케줄 호출용: 지난 호출이 멈춘 위치부터 time_budget 초 안에서만 받아두고 다음 위치를 저장
+#    전체 지역(약 250곳, 호출 약 1,000번)이 한 번의 타임아웃 안에 끝나지 않아도 여러 호출에 걸쳐 한 바퀴를 돎
+def prefetch_next_slice(time_budget: float) -> dict:
+    require_shared_cache()
+
+    cities = weather_prefetch_cities()
+    offset = weather_service.cache_backend.get(PREFETCH_CURSOR_KEY) or 0
+    if offset >= len(cities):
+        offset = 0
+
+    result = prefetch_all(
+        cities=cities[offset:],
+        deadline=time.monotonic() + max(0.0, time_budget - WEATHER_PREFETCH_TIME_MARGIN),
+    )
+    next_offset = offset + result["processed"]
+    if next_offset >= len(cities):
+        next_offset = 0
+    weather_service.cache_backend.set(PREFETCH_CURSOR_KEY, next_offset)
+    return {**result, "cities": len(cities), "offset": offset, "next_offset": next_offset}
+
+
+# ✅ 상주 서버용: interval 초마다 반복 실행
+def run_forever(interval: int = WEATHER_PREFETCH_INTERVAL):
+    while True:
+        started = time.monotonic()
+        result = prefetch_all()
+        logger.info("weather prefetch: %s", result)
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
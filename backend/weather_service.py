@@ -0,0 +1,350 @@
+import os
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from fastapi import HTTPException
+
+from cache_backends import CacheBackend, create_cache_backend
+from regions import PROVINCE_GEOCODE_STATES, find_weather_region
+
+OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
+
+WEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
+FORECAST_URL = "https://api.openweathermap.org/data/2.5/forecast"
+AIRPOLLUTION_URL = "https://api.openweathermap.org/data/2.5/air_pollution"
+GEOCODING_URL = "https://api.openweathermap.org/geo/1.0/direct"
+
+# ✅ 업스트림 호출 설정 (connect, read) 초
+HTTP_TIMEOUT = (3.05, float(os.getenv("WEATHER_HTTP_TIMEOUT", "5")))
+
+# ✅ 캐시 설정: TTL 안에는 그대로 응답, TTL 이후 STALE_TTL 동안은 이전 값을 응답하면서 백그라운드 갱신
+WEATHER_CACHE_TTL = int(os.getenv("WEATHER_CACHE_TTL", "1800"))
+WEATHER_CACHE_STALE_TTL = int(os.getenv("WEATHER_CACHE_STALE_TTL", "1800"))
+
+# ✅ OpenWeather 예보는 3시간 간격이므로 캐시 키를 이 구간 단위로 나눔
+FORECAST_BUCKET_SECONDS = 3 * 60 * 60
+
+logger = logging.getLogger(__name__)
+
+
+# ✅ 공용 HTTP 세션 (keep-alive 커넥션 풀 재사용 + 일시 오류 재시도)
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=32,
+                    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+                )
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
+# ✅ 현재 날씨/예보 동시 호출용 스레드풀
+_fetch_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="weather-fetch")
+
+# ✅ 여러 도시 동시 조회용 스레드풀 (도시별 작업이 _fetch_executor 를 기다리므로 별도 풀)
+_batch_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="weather-batch")
+
+# ✅ /weather/batch 한 번에 요청할 수 있는 도시 수
+WEATHER_BATCH_MAX_CITIES = int(os.getenv("WEATHER_BATCH_MAX_CITIES", "20"))
+
+
+# ✅ 도시별 TTL 캐시 (stale-while-revalidate + 동시 미스 합치기)
+#    값은 공유 백엔드(cache_backends)에 저장하므로 다른 Lambda 컨테이너가 받아온 결과도 재사용된다.
+#    동시 미스 합치기는 프로세스 안에서만 동작한다.
+class WeatherCache:
+    def __init__(self, backend: CacheBackend, ttl: int, stale_ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._inflight = {}  # key -> Future (같은 도시 동시 요청은 이 Future 하나를 기다림)
+        self._lock = threading.Lock()
+        self._refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="weather-refresh")
+
+    def get_or_load(self, key: str, loader, fallback_key: Optional[str] = None):
+        """fallback_key: key 가 비어 있을 때 오래된 값으로 대신 응답할 수 있는 키 (직전 예보 구간)"""
+        now = time.time()
+        entry = self._read(key)
+        if entry is None and fallback_key is not None:
+            entry = self._read(fallback_key)
+        if entry is not None:
+            age = now - entry["fetched_at"]
+            if age < self.ttl:
+                return entry["payload"]
+            if age < self.ttl + self.stale_ttl:
+                # 오래된 값을 바로 응답하고 갱신은 백그라운드에서 한 번만
+                with self._lock:
+                    if key not in self._inflight:
+                        future = Future()
+                        self._inflight[key] = future
+                        self._refresh_executor.submit(self._load, key, loader, future, True)
+                return entry["payload"]
+
+        return self.refresh(key, loader)
+
+    def refresh(self, key: str, loader):
+        """캐시 상태와 관계없이 다시 받아와 저장 (진행 중인 로드가 있으면 그 결과를 기다림)"""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if owner:
+            self._load(key, loader, future)
+        return future.result()
+
+    def _read(self, key: str):
+        # 공유 캐시 장애는 캐시 미스로 처리 (업스트림에서 직접 받아옴)
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            logger.warning("weather cache read failed (%s): %s", key, e)
+            return None
+
+    def _load(self, key: str, loader, future: Future, background: bool = False):
+        """background: stale 응답 뒤 갱신 (결과를 기다리는 요청이 없으므로 실패는 여기서 로그)"""
+        try:
+            payload = loader()
+        except Exception as e:
+            if background:
+                logger.warning("weather background refresh failed (%s): %s", key, e)
+            future.set_exception(e)
+        else:
+            try:
+                self.backend.set(key, {"payload": payload, "fetched_at": time.time()}, ttl=self.ttl + self.stale_ttl)
+            except Exception as e:
+                logger.warning("weather cache write failed (%s): %s", key, e)
+            future.set_result(payload)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+cache_backend = create_cache_backend()
+weather_cache = WeatherCache(cache_backend, WEATHER_CACHE_TTL, WEATHER_CACHE_STALE_TTL)
+
+
+# ✅ 캐시 키용 도시명 정규화
+def normalize_city(city: str) -> str:
+    return " ".join(city.split()).lower()
+
+
+def forecast_bucket(timestamp: Optional[float] = None) -> int:
+    return int((timestamp if timestamp is not None else time.time()) // FORECAST_BUCKET_SECONDS)
+
+
+def weather_cache_key(city_key: str, bucket: int) -> str:
+    return f"weather:{city_key}:{bucket}"
+
+
+def coord_cache_key(city_key: str) -> str:
+    return f"coord:{city_key}"
+
+
+# ✅ 도시 좌표는 바뀌지 않으므로 만료 없이 캐시
+def get_cached_coord(city_key: str) -> Optional[dict]:
+    try:
+        return cache_backend.get(coord_cache_key(city_key))
+    except Exception as e:
+        logger.warning("coord cache read failed (%s): %s", city_key, e)
+        return None
+
+
+def set_cached_coord(city_key: str, coord: dict):
+    try:
+        cache_backend.set(coord_cache_key(city_key), {"lat": coord["lat"], "lon": coord["lon"]})
+    except Exception as e:
+        logger.warning("coord cache write failed (%s): %s", city_key, e)
+
+
+def needs_geocoding(city: str) -> bool:
+    return find_weather_region(city) is not None and get_cached_coord(normalize_city(city)) is None
+
+
+def fetch_json(url: str, params: dict, what: str) -> dict:
+    try:
+        res = get_http_session().get(url, params={**params, "appid": OPENWEATHER_API_KEY}, timeout=HTTP_TIMEOUT)
+        res.raise_for_status()
+        return res.json()
+    except requests.RequestException as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch {what}: {str(e)}")
+
+
+# ✅ OpenWeather 응답 3개 → /weather/full 응답 형태로 가공
+def build_full_weather(city: str, weather_data: dict, forecast_data: dict, air_data: dict) -> dict:
+    current_weather = {
+        "weather": weather_data["weather"][0]["description"],
+        "condition": weather_data["weather"][0]["main"],  # ✅ Clear / Clouds / Rain ... (추천용)
+        "temperature": weather_data["main"]["temp"]
+    }
+
+    # 1. 6개 시간별 예보 추출 (3시간 간격)
+    hourly_forecast = []
+    for item in forecast_data.get("list", [])[:6]:  # 6개 => 18시간 커버
+        dt = datetime.utcfromtimestamp(item["dt"]) + timedelta(hours=9)
+        hourly_forecast.append({
+            "time": f"{dt.hour}시",
+            "temp": round(item["main"]["temp"]),
+            "weather": item["weather"][0]["description"]
+        })
+
+    # 2. 일별 요약 예보 가공 (오늘, 내일, 모레)
+    daily_forecast = []
+    temp_by_day = {}
+
+    for item in forecast_data.get("list", []):
+        dt = datetime.utcfromtimestamp(item["dt"]) + timedelta(hours=9)
+        day_key = dt.strftime('%Y-%m-%d')
+        if day_key not in temp_by_day:
+            temp_by_day[day_key] = {
+                "temps": [],
+                "weathers": []
+            }
+        temp_by_day[day_key]["temps"].append(item["main"]["temp"])
+        temp_by_day[day_key]["weathers"].append(item["weather"][0]["description"])
+
+    for idx, (day, info) in enumerate(temp_by_day.items()):
+        if idx >= 7:
+            break  # 7일까지만
+        daily_forecast.append({
+            "day": "오늘" if idx == 0 else (datetime.strptime(day, '%Y-%m-%d') + timedelta(hours=9)).strftime('%a'),
+            "temp_min": round(min(info["temps"])),
+            "temp_max": round(max(info["temps"])),
+            "weather": max(set(info["weathers"]), key=info["weathers"].count)  # 가장 많이 나온 날씨로 대표
+        })
+
+    # 3. 미세먼지 정보
+    air_info = air_data["list"][0]["components"]
+    air_quality = {
+        "pm10": int(air_info["pm10"]),
+        "pm2_5": int(air_info["pm2_5"])
+    }
+
+    return {
+        "city": city,
+        "current": current_weather,
+        "hourly": hourly_forecast,
+        "daily": daily_forecast,
+        "air": air_quality
+    }
+
+
+# ✅ "시/도 시/군/구" 지역 → 좌표
+#    같은 이름의 구/군이 여러 시/도에 있으므로 지오코딩 후보 중 state 가 그 시/도인 곳만 사용 (없으면 404)
+def geocode_region(province: str, city: str) -> dict:
+    candidates = fetch_json(GEOCODING_URL, {"q": f"{city},KR", "limit": 5}, "geocoding data")
+    keywords = PROVINCE_GEOCODE_STATES[province]
+    for candidate in candidates:
+        state = (candidate.get("state") or "").lower()
+        if any(keyword in state for keyword in keywords):
+            return {"lat": candidate["lat"], "lon": candidate["lon"]}
+    raise HTTPException(status_code=404, detail=f"Region not found: {province} {city}")
+
+
+# ✅ 업스트림 조회: 현재 날씨와 예보를 동시에 요청하고,
+#    좌표가 캐시에 있으면 미세먼지도 처음부터 함께 요청 (없으면 현재 날씨 응답의 좌표로 조회 후 저장)
+#    "시/도 시/군/구" 지역은 이름 대신 지오코딩한 좌표로 모두 조회
+def fetch_full_weather(city: str) -> dict:
+    city_key = normalize_city(city)
+    params = {"q": city, "units": "metric", "lang": "kr"}
+    region = find_weather_region(city)
+    if region is not None:
+        coord = get_cached_coord(city_key)
+        if coord is None:
+            coord = geocode_region(*region)
+            set_cached_coord(city_key, coord)
+        params = {"lat": coord["lat"], "lon": coord["lon"], "units": "metric", "lang": "kr"}
+    current_future = _fetch_executor.submit(fetch_json, WEATHER_URL, params, "current weather")
+    forecast_future = _fetch_executor.submit(fetch_json, FORECAST_URL, params, "forecast data")
+
+    coord = get_cached_coord(city_key)
+    if coord is not None:
+        air_future = _fetch_executor.submit(
+            fetch_json, AIRPOLLUTION_URL, {"lat": coord["lat"], "lon": coord["lon"]}, "air pollution data"
+        )
+        weather_data = current_future.result()
+        air_data = air_future.result()
+    else:
+        weather_data = current_future.result()
+        coord = weather_data["coord"]
+        set_cached_coord(city_key, coord)
+        air_data = fetch_json(AIRPOLLUTION_URL, {"lat": coord["lat"], "lon": coord["lon"]}, "air pollution data")
+    forecast_data = forecast_future.result()
+
+    return build_full_weather(city, weather_data, forecast_data, air_data)
+
+
+def full_weather_keys(city: str):
+    """(현재 예보 구간 키, 직전 예보 구간 키)"""
+    city_key = normalize_city(city)
+    bucket = forecast_bucket()
+    return weather_cache_key(city_key, bucket), weather_cache_key(city_key, bucket - 1)
+
+
+# ✅ /weather/full 진입점 (캐시 적중 시 업스트림 호출 없음)
+#    키는 (도시, 예보 구간), 새 구간의 첫 요청은 직전 구간 값으로 응답하면서 갱신
+def get_full_weather(city: str) -> dict:
+    if not OPENWEATHER_API_KEY:
+        raise HTTPException(status_code=500, detail="Weather API key is not set.")
+
+    key, fallback_key = full_weather_keys(city)
+    payload = weather_cache.get_or_load(key, lambda: fetch_full_weather(city), fallback_key=fallback_key)
+    return {**payload, "city": city}
+
+
+# ✅ 쉼표로 구분된 도시 목록 → 중복(정규화 기준)/빈 값을 제거한 목록
+def parse_cities(cities: str) -> list:
+    parsed = {}
+    for city in cities.split(","):
+        city = " ".join(city.split())
+        if city:
+            parsed.setdefault(normalize_city(city), city)
+    return list(parsed.values())
+
+
+# ✅ /weather/batch 진입점: 도시별로 동시에 캐시/업스트림 조회 후 한 응답으로 합침
+#    일부 도시가 실패해도 나머지 결과는 응답하고 실패한 도시는 errors 에 담는다.
+def get_batch_weather(cities: str) -> dict:
+    if not OPENWEATHER_API_KEY:
+        raise HTTPException(status_code=500, detail="Weather API key is not set.")
+
+    city_list = parse_cities(cities)
+    if not city_list:
+        raise HTTPException(status_code=400, detail="도시를 하나 이상 입력하세요.")
+    if len(city_list) > WEATHER_BATCH_MAX_CITIES:
+        raise HTTPException(status_code=400, detail=f"도시는 최대 {WEATHER_BATCH_MAX_CITIES}개까지 요청할 수 있습니다.")
+
+    futures = [(city, _batch_executor.submit(get_full_weather, city)) for city in city_list]
+
+    items, errors = [], []
+    for city, future in futures:
+        try:
+            items.append(future.result())
+        except HTTPException as e:
+            errors.append({"city": city, "detail": e.detail})
+        except Exception as e:
+            logger.warning("batch weather failed (%s): %s", city, e)
+            errors.append({"city": city, "detail": "Failed to fetch weather data"})
+    return {"items": items, "errors": errors}
+
+
+# ✅ 미리 받아두기용 (weather_prefetch): 요청 경로를 거치지 않고 캐시를 새 값으로 교체
+def refresh_full_weather(city: str) -> dict:
+    key, _ = full_weather_keys(city)
+    return weather_cache.refresh(key, lambda: fetch_full_weather(city))
@@ -1,10 +1,10 @@
 // 이 코드는 관리자(Admin) 관련 API 요청을 axiosInstance를 이용해 깔끔하게 정리한 파일입니다.
 import API from "./axiosInstance";
+import { fetchAllPages } from "./pagination";
 
 // 🔹 승인 대기 업체 목록 조회
 export const fetchPendingProviders = async () => {
-  const response = await API.get('/admin/pending-providers');
-  return response.data;
+  return fetchAllPages((params) => API.get('/admin/pending-providers', { params }));
 };
 
 // 🔹 업체 승인 처리
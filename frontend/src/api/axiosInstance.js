@@ -9,6 +9,31 @@ const API = axios.create({
   withCredentials: false, // ✅ 쿠키 인증 대신 JWT 토큰을 헤더로 처리
 });
 
+// ✅ 액세스 토큰 저장 키 → 짝이 되는 리프레시 토큰 저장 키 (사용자/업체, 관리자)
+export const REFRESH_TOKEN_KEYS = {
+  access_token: "refresh_token",
+  admin_token: "admin_refresh_token",
+};
+
+const currentTokenKey = () => {
+  if (localStorage.getItem("access_token")) return "access_token";
+  if (localStorage.getItem("admin_token")) return "admin_token";
+  return null;
+};
+
+// ✅ 로그인 응답의 액세스/리프레시 토큰 저장 (리프레시 토큰은 재발급 때마다 바뀌므로 항상 함께 저장)
+export const saveTokens = (tokenKey, data) => {
+  localStorage.setItem(tokenKey, data.access_token);
+  if (data.refresh_token) {
+    localStorage.setItem(REFRESH_TOKEN_KEYS[tokenKey], data.refresh_token);
+  }
+};
+
+export const clearTokens = (tokenKey) => {
+  localStorage.removeItem(tokenKey);
+  localStorage.removeItem(REFRESH_TOKEN_KEYS[tokenKey]);
+};
+
 // ✅ 요청 보내기 전 Authorization 헤더 자동 첨부
 API.interceptors.request.use(
   (config) => {
@@ -21,4 +46,64 @@ API.interceptors.request.use(
   (error) => Promise.reject(error)
 );
 
+// ✅ 액세스 토큰 재발급 (/auth/refresh)
+//    동시에 여러 요청이 401 을 받아도 재발급은 한 번만 (이전 리프레시 토큰을 다시 쓰면 서버가 로그인 전체를 폐기함)
+let refreshing = null;
+
+const refreshAccessToken = (tokenKey) => {
+  if (!refreshing) {
+    const refreshToken = localStorage.getItem(REFRESH_TOKEN_KEYS[tokenKey]);
+    refreshing = (refreshToken
+      ? axios.post(`${API.defaults.baseURL}/auth/refresh`, { refresh_token: refreshToken })
+      : Promise.reject(new Error("리프레시 토큰 없음"))
+    )
+      .then((res) => {
+        saveTokens(tokenKey, res.data);
+        return res.data.access_token;
+      })
+      .finally(() => {
+        refreshing = null;
+      });
+  }
+  return refreshing;
+};
+
+// ✅ 401 응답이면 토큰을 재발급받아 원래 요청을 한 번만 다시 보냄
+//    재발급도 거절되면(만료/폐기) 저장된 토큰을 지우고 원래 오류를 그대로 전달
+API.interceptors.response.use(
+  (response) => response,
+  async (error) => {
+    const config = error.config;
+    const tokenKey = currentTokenKey();
+    if (error.response?.status !== 401 || !config || config._retried || !tokenKey) {
+      return Promise.reject(error);
+    }
+    config._retried = true;
+
+    try {
+      await refreshAccessToken(tokenKey);
+    } catch (refreshError) {
+      // 네트워크 오류가 아니면 (리프레시 토큰이 없거나 서버가 거절) 다시 로그인해야 함
+      if (refreshError.response?.status === 401 || !refreshError.request) {
+        clearTokens(tokenKey);
+      }
+      return Promise.reject(error);
+    }
+    return API(config);
+  }
+);
+
+// ✅ 로그아웃: 서버에서 지금 액세스 토큰과 리프레시 토큰을 폐기하고 저장된 토큰 삭제 (응답은 기다리지 않음)
+export const logout = (tokenKey) => {
+  const token = localStorage.getItem(tokenKey);
+  const refreshToken = localStorage.getItem(REFRESH_TOKEN_KEYS[tokenKey]);
+  if (token) {
+    API.post("/auth/logout", refreshToken ? { refresh_token: refreshToken } : undefined, {
+      headers: { Authorization: `Bearer ${token}` },
+      _retried: true,
+    }).catch(() => {});
+  }
+  clearTokens(tokenKey);
+};
+
 export default API;
@@ -0,0 +1,17 @@
+// 이 코드는 커서 기반 목록 API 응답({ items, next_cursor })을 다루는 공통 함수입니다.
+
+// ✅ 한 번에 받을 최대 개수 (백엔드 pagination.MAX_PAGE_LIMIT 와 동일)
+export const MAX_PAGE_LIMIT = 100;
+
+// ✅ next_cursor 가 null 이 될 때까지 다음 페이지를 이어 받아 items 를 모두 합쳐 반환
+//    request: (params) => axios 요청 (API.get 또는 관리자 헤더를 붙인 axios.get)
+export const fetchAllPages = async (request, params = {}) => {
+  const items = [];
+  let cursor;
+  do {
+    const res = await request({ ...params, cursor, limit: MAX_PAGE_LIMIT });
+    items.push(...res.data.items);
+    cursor = res.data.next_cursor;
+  } while (cursor);
+  return items;
+};
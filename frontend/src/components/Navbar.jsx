@@ -1,5 +1,6 @@
 import { useLocation, useNavigate } from "react-router-dom";
 import { useEffect, useState } from "react";
+import { logout } from "../api/axiosInstance";
 
 function Navbar() {
   const location = useLocation();
@@ -20,7 +21,7 @@ function Navbar() {
   }, [location.key]);
 
   const handleLogout = () => {
-    localStorage.removeItem("access_token");
+    logout("access_token");
     localStorage.removeItem("provider");
     setIsProvider(false);
     setIsUser(false);
@@ -29,7 +30,7 @@ function Navbar() {
   };
 
   const handleAdminLogout = () => {
-    localStorage.removeItem("admin_token");
+    logout("admin_token");
     setIsAdmin(false);
     alert("관리자 로그아웃 되었습니다.");
     navigate("/admin-login");
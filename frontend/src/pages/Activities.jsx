@@ -8,6 +8,7 @@ import { motion } from 'framer-motion';
 
 const Activities = () => {
   const [activities, setActivities] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [regionCategory, setRegionCategory] = useState('');
   const [regionSub, setRegionSub] = useState('');
   const [interestCategory, setInterestCategory] = useState('');
@@ -19,15 +20,18 @@ const Activities = () => {
   const interestCategories = Array.from(interestMap.keys());
   const interestSubs = interestCategory ? interestMap.get(interestCategory) : [];
 
-  const fetchActivities = async () => {
+  // ✅ cursor 없이 부르면 처음부터, 있으면 다음 페이지를 이어 붙임 ("더 보기")
+  const fetchActivities = async (cursor) => {
     try {
       const response = await API.get('/activities', {
         params: {
           region: regionCategory && regionSub ? `${regionCategory} ${regionSub}` : undefined,
           interest: interestSubcategory || undefined,
+          cursor,
         },
       });
-      setActivities(response.data);
+      setActivities((prev) => (cursor ? [...prev, ...response.data.items] : response.data.items));
+      setNextCursor(response.data.next_cursor);
     } catch (error) {
       console.error("활동 목록 불러오기 실패:", error);
       alert("활동 목록을 불러오는 데 실패했습니다.");
@@ -125,6 +129,17 @@ const Activities = () => {
           </div>
         ))}
       </div>
+
+      {nextCursor && (
+        <div className="mt-8 text-center">
+          <button
+            onClick={() => fetchActivities(nextCursor)}
+            className="px-4 py-2 border border-gray-400 rounded hover:bg-gray-100 transition text-sm"
+          >
+            더 보기
+          </button>
+        </div>
+      )}
     </motion.div>
   );
 };
@@ -2,6 +2,7 @@
 import { useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { motion } from "framer-motion";
+import { saveTokens } from "../api/axiosInstance";
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL;
 
@@ -26,7 +27,7 @@ function AdminLogin() {
       }
 
       const data = await res.json();
-      localStorage.setItem("admin_token", data.access_token);
+      saveTokens("admin_token", data);
       alert("관리자 로그인 성공!");
       navigate("/admin");
     } catch (err) {
@@ -2,6 +2,7 @@
 import { useState } from "react";
 import { useNavigate, Link } from "react-router-dom";
 import { motion } from "framer-motion";
+import { clearTokens, saveTokens } from "../api/axiosInstance";
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL;
 
@@ -26,9 +27,9 @@ function Login() {
       const data = await response.json();
 
       if (response.ok) {
-        localStorage.removeItem("admin_token");
+        clearTokens("admin_token");
         localStorage.removeItem("provider");
-        localStorage.setItem("access_token", data.access_token);
+        saveTokens("access_token", data);
         alert("로그인 성공!");
         navigate("/");
       } else {
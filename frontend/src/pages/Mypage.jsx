@@ -1,6 +1,7 @@
 // src/pages/Mypage.jsx
 import React, { useEffect, useState } from 'react';
 import API from '../api/axiosInstance'; // ✅ axiosInstance import
+import { fetchAllPages } from '../api/pagination';
 import { motion } from 'framer-motion';
 
 const Mypage = () => {
@@ -29,10 +30,10 @@ const Mypage = () => {
 
   const fetchMyActivities = async () => {
     try {
-      const res = await API.get('/subscriptions/me');
+      const subscriptions = await fetchAllPages((params) => API.get('/subscriptions/me', { params }));
 
       const enriched = await Promise.all(
-        res.data.map(async (sub) => {
+        subscriptions.map(async (sub) => {
           const activity = await fetchActivityDetails(sub.activity_id);
           return { ...sub, activity };
         })
@@ -46,8 +47,8 @@ const Mypage = () => {
 
   const fetchNotifications = async () => {
     try {
-      const res = await API.get('/notifications/me');
-      setNotifications(res.data);
+      const items = await fetchAllPages((params) => API.get('/notifications/me', { params }));
+      setNotifications(items);
     } catch (err) {
       console.error("알림 목록 불러오기 실패:", err);
     }
@@ -7,6 +7,7 @@ import {
   confirmActivity,
   cancelActivity
 } from "../api/provider";
+import { clearTokens } from "../api/axiosInstance";
 import { motion } from "framer-motion";
 
 // ✅ 상단에 환경 변수에서 API 주소 불러오기 추가
@@ -82,7 +83,7 @@ const ProviderDashboard = () => {
         },
       });
       alert("탈퇴가 완료되었습니다.");
-      localStorage.removeItem("access_token");
+      clearTokens("access_token");
       localStorage.removeItem("provider");
       window.location.href = "/provider-login";
     } catch (err) {
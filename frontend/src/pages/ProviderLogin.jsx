@@ -3,6 +3,7 @@ import React, { useState } from "react";
 import axios from "axios";
 import { Link, useNavigate } from "react-router-dom";
 import { motion } from "framer-motion";
+import { clearTokens, saveTokens } from "../api/axiosInstance";
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL;
 
@@ -22,11 +23,10 @@ const ProviderLogin = () => {
         headers: { "Content-Type": "application/x-www-form-urlencoded" },
       });
 
-      const token = res.data.access_token;
       const providerInfo = res.data.provider;
 
-      localStorage.removeItem("admin_token");
-      localStorage.setItem("access_token", token);
+      clearTokens("admin_token");
+      saveTokens("access_token", res.data);
       localStorage.setItem("provider", JSON.stringify(providerInfo));
       alert("로그인 성공!");
       navigate("/provider/dashboard");
@@ -7,18 +7,22 @@ const API_BASE_URL = import.meta.env.VITE_API_BASE_URL;
 
 const PendingProviders = () => {
   const [pending, setPending] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [rejectingId, setRejectingId] = useState(null);
   const [rejectReason, setRejectReason] = useState("");
   
 
   const token = localStorage.getItem("admin_token");
 
-  const fetchPending = async () => {
+  // ✅ cursor 없이 부르면 처음부터, 있으면 다음 페이지를 이어 붙임 ("더 보기")
+  const fetchPending = async (cursor) => {
     try {
       const res = await axios.get(`${API_BASE_URL}/admin/pending-providers`, {
+        params: { cursor },
         headers: { Authorization: `Bearer ${token}` },
       });
-      setPending(res.data);
+      setPending((prev) => (cursor ? [...prev, ...res.data.items] : res.data.items));
+      setNextCursor(res.data.next_cursor);
     } catch (err) {
       alert("업체 목록 불러오기 실패");
     }
@@ -115,6 +119,17 @@ const PendingProviders = () => {
             ))}
           </ul>
         )}
+
+        {nextCursor && (
+          <div className="mt-6 text-center">
+            <button
+              onClick={() => fetchPending(nextCursor)}
+              className="px-4 py-2 border border-gray-400 rounded hover:bg-gray-100 text-sm"
+            >
+              더 보기
+            </button>
+          </div>
+        )}
       </div>
     </motion.div>
   );
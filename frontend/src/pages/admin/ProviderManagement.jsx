@@ -7,6 +7,7 @@ const API_BASE_URL = import.meta.env.VITE_API_BASE_URL;
 
 const ProviderManagement = () => {
   const [providers, setProviders] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [search, setSearch] = useState("");
   const [sort, setSort] = useState("created_at");
   const [order, setOrder] = useState("desc");
@@ -14,13 +15,15 @@ const ProviderManagement = () => {
 
   const token = localStorage.getItem("admin_token");
 
-  const fetchProviders = async () => {
+  // ✅ cursor 없이 부르면 처음부터, 있으면 다음 페이지를 이어 붙임 ("더 보기")
+  const fetchProviders = async (cursor) => {
     try {
       const res = await axios.get(`${API_BASE_URL}/admin/providers`, {
-        params: { search, sort, order },
+        params: { search, sort, order, cursor },
         headers: { Authorization: `Bearer ${token}` },
       });
-      setProviders(res.data);
+      setProviders((prev) => (cursor ? [...prev, ...res.data.items] : res.data.items));
+      setNextCursor(res.data.next_cursor);
     } catch (err) {
       console.error("업체 목록 조회 실패:", err);
     }
@@ -85,6 +88,17 @@ const ProviderManagement = () => {
             </tbody>
           </table>
         </div>
+
+        {nextCursor && (
+          <div className="mt-6 text-center">
+            <button
+              onClick={() => fetchProviders(nextCursor)}
+              className="px-4 py-2 border border-gray-400 rounded hover:bg-gray-100 text-sm"
+            >
+              더 보기
+            </button>
+          </div>
+        )}
       </div>
     </motion.div>
   );
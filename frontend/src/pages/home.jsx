@@ -43,7 +43,7 @@ const Home = () => {
   const [weatherData, setWeatherData] = useState(null);
   const [error, setError] = useState(null);
   const [itemsPerPage, setItemsPerPage] = useState(10);
-  const [currentPage, setCurrentPage] = useState(1);
+  const [nextCursor, setNextCursor] = useState(null);
 
   const isLoggedIn = !!localStorage.getItem("access_token");
 
@@ -54,16 +54,31 @@ const Home = () => {
     return () => clearInterval(interval);
   }, []);
 
-  useEffect(() => {
-    API.get('/activities/')
+  // ✅ 카테고리/검색어는 서버에서 거르고(interest, q) 한 페이지씩 받음
+  //    cursor 없이 부르면 처음부터, 있으면 다음 페이지를 이어 붙임 ("더 보기")
+  const fetchActivities = (cursor) => {
+    API.get('/activities/', {
+      params: {
+        interest: selectedCategory || undefined,
+        q: searchKeyword || undefined,
+        cursor,
+        limit: itemsPerPage,
+      },
+    })
       .then(res => {
-        setActivities(res.data);
+        setActivities((prev) => (cursor ? [...prev, ...res.data.items] : res.data.items));
+        setNextCursor(res.data.next_cursor);
+        setError(null);
       })
       .catch(err => {
         console.error("❌ 활동 API 호출 실패:", err);
         setError(err.message || "API 호출 실패");
       });
-  }, []);
+  };
+
+  useEffect(() => {
+    fetchActivities();
+  }, [selectedCategory, searchKeyword, itemsPerPage]);
 
   useEffect(() => {
     API.get('/weather/full?city=Seoul')
@@ -75,23 +90,6 @@ const Home = () => {
       });
   }, []);
 
-  const filteredActivities = Array.isArray(activities) ? activities.filter((a) => {
-    const matchCategory = selectedCategory && selectedCategory !== "전체"
-      ? a.interest_category === selectedCategory
-      : true;
-    const matchSearch = searchKeyword
-      ? a.title.includes(searchKeyword) || a.description.includes(searchKeyword)
-      : true;
-    return matchCategory && matchSearch;
-  }) : [];
-
-  const totalPages = Math.ceil(filteredActivities.length / itemsPerPage);
-
-  const currentActivities = filteredActivities.slice(
-    (currentPage - 1) * itemsPerPage,
-    currentPage * itemsPerPage
-  );
-
   const handleActivityClick = (activityId) => {
     if (!isLoggedIn) {
       navigate('/login');
@@ -149,7 +147,7 @@ const Home = () => {
         <section className="w-full py-6">
           <div className="flex items-center justify-between mb-4">
             <h2 className="text-lg font-semibold">{selectedCategory ? `선택한 관심사: ${selectedCategory}` : '진행 중인 활동'}</h2>
-            <select value={itemsPerPage} onChange={(e) => { setItemsPerPage(Number(e.target.value)); setCurrentPage(1); }} className="ml-4 border rounded px-2 py-1 text-sm">
+            <select value={itemsPerPage} onChange={(e) => setItemsPerPage(Number(e.target.value))} className="ml-4 border rounded px-2 py-1 text-sm">
               <option value={10}>10개 보기</option>
               <option value={20}>20개 보기</option>
               <option value={50}>50개 보기</option>
@@ -158,11 +156,11 @@ const Home = () => {
 
           {error ? (
             <p className="text-red-500 text-sm text-center">❌ 활동 목록을 불러오는 중 오류가 발생했습니다: {error}</p>
-          ) : currentActivities.length === 0 ? (
+          ) : activities.length === 0 ? (
             <p className="text-sm text-center text-gray-400">표시할 활동이 없습니다.</p>
           ) : (
             <div className="grid grid-cols-1 sm:grid-cols-2 gap-4">
-              {currentActivities.map((a) => (
+              {activities.map((a) => (
                 <div
                   key={a.id}
                   onClick={() => handleActivityClick(a.id)}
@@ -176,12 +174,12 @@ const Home = () => {
             </div>
           )}
 
-          {/* 페이지네이션 */}
-          <div className="flex justify-center items-center mt-6 gap-2">
-            <button disabled={currentPage === 1} onClick={() => setCurrentPage((p) => Math.max(1, p - 1))} className="px-3 py-1 border rounded disabled:opacity-50">ㅇ전</button>
-            <span className="text-sm">{currentPage} / {totalPages}</span>
-            <button disabled={currentPage === totalPages} onClick={() => setCurrentPage((p) => Math.min(totalPages, p + 1))} className="px-3 py-1 border rounded disabled:opacity-50">다음</button>
-          </div>
+          {/* 더 보기 */}
+          {nextCursor && !error && (
+            <div className="flex justify-center mt-6">
+              <button onClick={() => fetchActivities(nextCursor)} className="px-3 py-1 border rounded hover:bg-gray-100 text-sm">더 보기</button>
+            </div>
+          )}
 
         </section>
 